@@ -0,0 +1,81 @@
+"""Backtest the forecasting backends for accuracy, speed and memory.
+
+Runs rolling-origin backtests of CostForecaster on the timeseries CSV or on
+a synthetic panel, for every backend and Prophet worker count, and reports
+MAPE, interval coverage, fit/predict time per category and peak memory.
+Keep the JSON output of each release to spot forecasting regressions.
+
+Usage:
+    python benchmarks/forecast_benchmark.py [--data data/timeseries_budget.csv]
+        [--synthetic 200 --months 48] [--backends fast prophet]
+        [--workers 1 4] [--horizon 3] [--origins 3] [--output forecast.json]
+"""
+import argparse
+import json
+import platform
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark forecasting backends")
+    parser.add_argument("--data", default=str(REPO_ROOT / "data" / "timeseries_budget.csv"), help="Timeseries CSV to backtest")
+    parser.add_argument("--synthetic", type=int, metavar="N_CATEGORIES", default=None, help="Backtest a synthetic panel of this many categories instead of --data")
+    parser.add_argument("--months", type=int, default=48, help="Months per category of the synthetic panel")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the synthetic panel")
+    parser.add_argument("--backends", nargs='+', default=['fast', 'prophet'], choices=['fast', 'prophet'], help="Backends to benchmark")
+    parser.add_argument("--workers", nargs='+', type=int, default=[1], help="Prophet worker counts to benchmark")
+    parser.add_argument("--horizon", type=int, default=3, help="Months forecast from each origin")
+    parser.add_argument("--origins", type=int, default=3, help="Number of rolling origins")
+    parser.add_argument("--no-memory", action="store_true", help="Skip tracemalloc, which slows the runs down")
+    parser.add_argument("--output", default=None, help="Write results as JSON to this path")
+    args = parser.parse_args()
+
+    import numpy as np
+    import pandas as pd
+    from src.pipeline.backtest import ForecastBacktester, synthetic_panel
+
+    if args.synthetic:
+        data = synthetic_panel(args.synthetic, args.months, seed=args.seed)
+        source = {'synthetic': True, 'categories': args.synthetic, 'months': args.months, 'seed': args.seed}
+    else:
+        data = pd.read_csv(args.data)
+        source = {'synthetic': False, 'path': args.data}
+
+    backtester = ForecastBacktester(data, horizon=args.horizon, n_origins=args.origins)
+    runs = []
+    for backend in args.backends:
+        # Worker processes only parallelize Prophet fits
+        for workers in (args.workers if backend == 'prophet' else [1]):
+            result = backtester.run(backend=backend, max_workers=workers, trace_memory=not args.no_memory)
+            runs.append(result.dict())
+
+            mape = f"{result.mape:.2f}%" if result.mape is not None else 'n/a'
+            coverage = f"{result.coverage:.1%}" if result.coverage is not None else 'n/a'
+            memory = f", peak {result.peak_memory_bytes / 1024 / 1024:.1f} MiB" if result.peak_memory_bytes is not None else ''
+            errors = f", {result.fit_errors} failed fits" if result.fit_errors else ''
+            print(
+                f"{backend} (workers={workers}): MAPE {mape}, coverage {coverage}, "
+                f"fit {result.fit_seconds_per_category * 1000:.2f}ms/category, "
+                f"predict {result.predict_seconds_per_category * 1000:.2f}ms/category{memory}{errors}"
+            )
+
+    if args.output:
+        report = {
+            'created_at': datetime.now(timezone.utc).isoformat(),
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'pandas': pd.__version__,
+            'source': source,
+            'horizon': args.horizon,
+            'origins': [str(origin) for origin in backtester.origins],
+            'runs': runs
+        }
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+
+if __name__ == "__main__":
+    main()
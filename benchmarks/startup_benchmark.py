@@ -0,0 +1,116 @@
+"""Measure cold-start import and construction time of the pipeline entry points.
+
+Each measurement runs in a fresh interpreter so module caches do not hide
+regressions. The script exits non-zero when a target exceeds its time budget
+or eagerly imports one of the heavy dependencies.
+
+Usage:
+    python benchmarks/startup_benchmark.py [--runs 5] [--output startup.json]
+"""
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+# Modules that must only be imported once a component is actually used
+HEAVY_MODULES = ['pandas', 'prophet', 'crewai', 'langchain_openai']
+
+# name -> (statement to time, time budget in seconds)
+TARGETS = {
+    'import_orchestrator': ("import src.pipeline.orchestrator", 1.0),
+    'construct_orchestrator': (
+        "from src.pipeline.orchestrator import PipelineOrchestrator\n"
+        "PipelineOrchestrator("
+        "funding_constraints_path='data/funding_constraints.json', "
+        "scenarios_path='data/scenario_list.json', "
+        "snapshot_budget_path='data/snapshot_budget.csv', "
+        "timeseries_budget_path='data/timeseries_budget.csv', "
+        "strategic_goals_path='data/strategic_goals.json')",
+        1.0
+    ),
+    'import_api': ("import src.api.main", 2.0),
+}
+
+PROBE = """
+import json, sys, time
+start = time.perf_counter()
+try:
+    exec(compile({statement!r}, '<benchmark>', 'exec'))
+    error = None
+except Exception as e:
+    error = f"{{type(e).__name__}}: {{e}}"
+elapsed = time.perf_counter() - start
+heavy = [m for m in {heavy!r} if m in sys.modules]
+print(json.dumps({{'seconds': elapsed, 'heavy_modules': heavy, 'error': error}}))
+"""
+
+def measure(statement: str, runs: int) -> dict:
+    """Time ``statement`` in ``runs`` fresh interpreters."""
+    samples = []
+    heavy = set()
+    error = None
+    for _ in range(runs):
+        probe = PROBE.format(statement=statement, heavy=HEAVY_MODULES)
+        completed = subprocess.run(
+            [sys.executable, '-c', probe],
+            cwd=REPO_ROOT,
+            capture_output=True,
+            text=True
+        )
+        lines = completed.stdout.strip().splitlines()
+        if completed.returncode != 0 or not lines:
+            error = completed.stderr.strip() or 'probe failed'
+            break
+        result = json.loads(lines[-1])
+        if result['error']:
+            error = result['error']
+            break
+        samples.append(result['seconds'])
+        heavy.update(result['heavy_modules'])
+    return {
+        'runs': len(samples),
+        'median_seconds': statistics.median(samples) if samples else None,
+        'min_seconds': min(samples) if samples else None,
+        'max_seconds': max(samples) if samples else None,
+        'heavy_modules': sorted(heavy),
+        'error': error
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark pipeline startup time")
+    parser.add_argument("--runs", type=int, default=5, help="Fresh interpreters per target")
+    parser.add_argument("--output", default=None, help="Write results as JSON to this path")
+    args = parser.parse_args()
+
+    results = {}
+    failed = False
+    for name, (statement, budget) in TARGETS.items():
+        result = measure(statement, args.runs)
+        result['budget_seconds'] = budget
+        result['passed'] = (
+            result['error'] is None
+            and result['median_seconds'] <= budget
+            and not result['heavy_modules']
+        )
+        failed = failed or not result['passed']
+        results[name] = result
+
+        status = 'ok' if result['passed'] else 'FAIL'
+        if result['error']:
+            print(f"{name}: {status} ({result['error'].splitlines()[-1]})")
+        else:
+            heavy = f", eager imports: {', '.join(result['heavy_modules'])}" if result['heavy_modules'] else ''
+            print(f"{name}: {status} median {result['median_seconds']:.3f}s (budget {budget:.1f}s{heavy})")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+
+    sys.exit(1 if failed else 0)
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,93 @@
 from src.pipeline.orchestrator import PipelineOrchestrator
+import argparse
 import sys
 
+def parse_args():
+    parser = argparse.ArgumentParser(description="Run the VibirEdu budget analysis pipeline")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Number of scenarios to process concurrently (default: 1)"
+    )
+    parser.add_argument(
+        "--forecast-workers",
+        type=int,
+        default=1,
+        help="Number of processes used to fit forecasting models (default: 1)"
+    )
+    parser.add_argument(
+        "--result-cache",
+        default=None,
+        help="Path of a SQLite file caching narratives for unchanged scenarios"
+    )
+    parser.add_argument(
+        "--invalidate-cache",
+        action="store_true",
+        help="Drop every cached narrative before running"
+    )
+    parser.add_argument(
+        "--llm-cache",
+        default=None,
+        help="Path of a SQLite file caching LLM responses across runs"
+    )
+    parser.add_argument(
+        "--forecast-backend",
+        choices=["prophet", "fast"],
+        default="prophet",
+        help="Forecasting model: Prophet, or a fast vectorized trend plus seasonality model (default: prophet)"
+    )
+    parser.add_argument(
+        "--model-store",
+        default=None,
+        help="Path of a SQLite file keeping fitted forecasting models across runs"
+    )
+    parser.add_argument(
+        "--store-dir",
+        default=None,
+        help="Directory of a columnar store to memory-map the budget and timeseries from"
+    )
+    parser.add_argument(
+        "--verbose",
+        action="store_true",
+        help="Print the full intermediate results of every stage"
+    )
+    parser.add_argument(
+        "--metrics-output",
+        default=None,
+        help="Write stage and LLM metrics to this path (.prom for Prometheus format, JSON otherwise)"
+    )
+    parser.add_argument(
+        "--portfolio",
+        metavar="COST_CAP",
+        type=float,
+        default=None,
+        help="Print the scenario combinations that best cover the strategic goals within this net cost, instead of running all scenarios"
+    )
+    parser.add_argument(
+        "--risk",
+        metavar="SCENARIO_ID",
+        nargs="?",
+        const="",
+        default=None,
+        help="Print Monte Carlo spending bands and overrun probabilities for a scenario (or the current budget when no ID is given), instead of running all scenarios"
+    )
+    parser.add_argument(
+        "--seed",
+        type=int,
+        default=None,
+        help="Seed of the random generator used by --risk"
+    )
+    parser.add_argument(
+        "--profile",
+        metavar="SCENARIO_ID",
+        default=None,
+        help="Profile a single scenario with cProfile and tracemalloc instead of running all scenarios"
+    )
+    return parser.parse_args()
+
 def main():
+    args = parse_args()
     try:
         # Initialize the pipeline orchestrator
         orchestrator = PipelineOrchestrator(
@@ -9,14 +95,68 @@ def main():
             funding_constraints_path="data/funding_constraints.json",
             strategic_goals_path="data/strategic_goals.json",
             snapshot_budget_path="data/snapshot_budget.csv",
-            timeseries_budget_path="data/timeseries_budget.csv"
+            timeseries_budget_path="data/timeseries_budget.csv",
+            max_workers=args.workers,
+            result_cache_path=args.result_cache,
+            llm_cache_path=args.llm_cache,
+            store_dir=args.store_dir,
+            forecast_workers=args.forecast_workers,
+            model_store_path=args.model_store,
+            forecast_backend=args.forecast_backend,
+            verbose=args.verbose
         )
         
-        # Process all scenarios
-        results = orchestrator.process_all_scenarios()
+        if args.invalidate_cache and orchestrator.result_cache:
+            orchestrator.result_cache.invalidate()
+        
+        if args.portfolio is not None:
+            options = orchestrator.explore_portfolios(cost_cap=args.portfolio)
+            print(f"\nScenario portfolios within a net cost of {args.portfolio:,.2f}:")
+            for option in options:
+                print(f"\n  Net cost: {option.net_cost:,.2f}  Goal score: {option.goal_score:g}")
+                print(f"  Scenarios: {', '.join(option.scenario_ids) or '(none)'}")
+                for goal in option.goals_covered:
+                    print(f"    + {goal}")
+                for goal in option.goals_undermined:
+                    print(f"    - {goal}")
+        elif args.risk is not None:
+            simulation = orchestrator.simulate_risk(args.risk or None, seed=args.seed)
+            print(f"\nSpending over the next {simulation.periods} months ({simulation.n_paths} simulated paths):")
+            for category in simulation.categories:
+                bands = '  '.join(f"{label}: {value:,.2f}" for label, value in simulation.total_bands[category].items())
+                overrun = simulation.overrun_probability.get(category)
+                overrun_text = f"  P(overrun): {overrun:.1%}" if overrun is not None else ""
+                print(f"  {category}: {bands}{overrun_text}")
+            bands = '  '.join(f"{label}: {value:,.2f}" for label, value in simulation.district_total_bands.items())
+            print(f"  District: {bands}")
+            if simulation.district_overrun_probability is not None:
+                print(f"  P(district overrun): {simulation.district_overrun_probability:.1%}")
+        elif args.profile:
+            report = orchestrator.profile_scenario(args.profile)
+            orchestrator.print_results({args.profile: report['narrative']})
+            print(report['profile'])
+            print("Top allocations:")
+            for allocation in report['top_allocations']:
+                print(f"  {allocation['size_bytes']:>12,} B  {allocation['location']}")
+        else:
+            # Process all scenarios
+            results = orchestrator.process_all_scenarios()
+            
+            # Print results in a user-friendly format
+            orchestrator.print_results(results)
+        
+        if args.metrics_output:
+            with open(args.metrics_output, 'w') as f:
+                if args.metrics_output.endswith('.prom'):
+                    f.write(orchestrator.metrics.to_prometheus())
+                else:
+                    f.write(orchestrator.metrics.to_json(include_records=True))
         
-        # Print results in a user-friendly format
-        orchestrator.print_results(results)
+        if orchestrator.llm_cache:
+            print(f"LLM cache: {orchestrator.llm_cache.stats()}")
+        if args.model_store:
+            model_store = orchestrator.cost_forecaster.model_store
+            print(f"Model store: {model_store.stats()}")
         
     except Exception as e:
         print(f"Error running pipeline: {str(e)}")
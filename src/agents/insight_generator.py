@@ -1,20 +1,32 @@
 from crewai import Agent, Task, Crew
-from typing import List, Dict
+from typing import List, Dict, Optional
 import json
 import re
 from ..models.data_models import Insight, ForecastResult, StrategicGoal, BudgetDelta
 from langchain_openai import ChatOpenAI
+from .llm_cache import LLMResponseCache, kickoff_crew, store_response
+from ..pipeline.instrumentation import PipelineMetrics
 
 class InsightGenerator:
-    def __init__(self):
-        # Initialize the LLM
+    def __init__(self,
+                 llm_cache: Optional[LLMResponseCache] = None,
+                 metrics: Optional[PipelineMetrics] = None):
+        self.llm_cache = llm_cache
+        self.metrics = metrics
+
+    def _create_agent(self) -> Agent:
+        """Build the agent (and its LLM client) for one crew run.
+
+        Crew.kickoff mutates the agents it runs, so concurrent scenarios
+        each get their own instead of sharing one.
+        """
         llm = ChatOpenAI(
             model="gpt-3.5-turbo",
             temperature=0.7,
             max_tokens=2000
         )
-        
-        self.insight_agent = Agent(
+
+        return Agent(
             role='Budget Insight Analyst',
             goal='Generate meaningful insights from budget forecasts and changes',
             backstory="""You are an experienced budget analyst with expertise in K-12 education finance.
@@ -27,7 +39,7 @@ class InsightGenerator:
             allow_delegation=False
         )
 
-    def _parse_llm_output(self, output: str) -> List[Dict]:
+    def _parse_llm_output(self, output: str, errors: Optional[List[str]] = None) -> List[Dict]:
         """Parse the LLM output into structured insights."""
         insights = []
         
@@ -79,6 +91,8 @@ class InsightGenerator:
                     })
             except Exception as e:
                 print(f"Error parsing section: {str(e)}")
+                if errors is not None:
+                    errors.append(f"insights: {str(e)}")
                 continue
                 
         return insights
@@ -86,8 +100,9 @@ class InsightGenerator:
     def generate_insights(self, 
                          forecasts: Dict[str, ForecastResult],
                          budget_deltas: List[BudgetDelta],
-                         strategic_goals: List[Dict]) -> List[Insight]:
-        
+                         strategic_goals: List[Dict],
+                         errors: Optional[List[str]] = None) -> List[Insight]:
+        """Generate insights; parse failures are appended to ``errors`` when given."""
         # Convert ForecastResult objects to dictionaries
         forecast_dicts = {
             category: {
@@ -130,6 +145,7 @@ class InsightGenerator:
                     'priority': goal.priority
                 })
         
+        agent = self._create_agent()
         # Create task
         task = Task(
             description=f"""Analyze the following budget data and generate detailed insights:
@@ -178,26 +194,21 @@ class InsightGenerator:
             Impact: This reduction may delay technology modernization goals.
             Recommendation: Prioritize installation in high-priority classrooms first.""",
             expected_output="A detailed analysis of budget changes and forecasts, formatted as sections for each category with insights, impacts, and recommendations.",
-            agent=self.insight_agent
+            agent=agent
         )
 
         # Create and run crew
         crew = Crew(
-            agents=[self.insight_agent],
+            agents=[agent],
             tasks=[task],
             verbose=True
         )
 
-        result = crew.kickoff()
-        
-        # Handle CrewOutput object
-        if hasattr(result, 'raw_output'):
-            output_text = result.raw_output
-        else:
-            output_text = str(result)
+        output_text, cache_key = kickoff_crew(crew, task, agent, self.llm_cache, self.metrics)
         
         # Parse the LLM output into structured insights
-        parsed_insights = self._parse_llm_output(output_text)
+        parse_errors: List[str] = []
+        parsed_insights = self._parse_llm_output(output_text, parse_errors)
         
         # Convert to Insight objects
         insights = []
@@ -211,6 +222,12 @@ class InsightGenerator:
                 ))
             except Exception as e:
                 print(f"Error creating insight object: {str(e)}")
+                parse_errors.append(f"insights: {str(e)}")
                 continue
 
+        if errors is not None:
+            errors.extend(parse_errors)
+        # Only responses that parsed cleanly are worth replaying
+        if insights and not parse_errors:
+            store_response(self.llm_cache, cache_key, output_text)
         return insights 
\ No newline at end of file
@@ -0,0 +1,156 @@
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple, TYPE_CHECKING
+from ..cache.sqlite_cache import SQLiteCache
+
+if TYPE_CHECKING:
+    from ..pipeline.instrumentation import PipelineMetrics
+
+class LLMResponseCache:
+    """Prompt-hash keyed cache of LLM responses shared by all agents.
+
+    Responses live on disk (with TTL and LRU eviction) and the most recent
+    ones are also kept in memory, so repeated prompts skip both the LLM
+    round trip and the database lookup.
+    """
+
+    def __init__(self,
+                 path: str,
+                 ttl_seconds: Optional[float] = 7 * 24 * 3600,
+                 max_entries: int = 50000,
+                 memory_entries: int = 1024):
+        """Open the on-disk cache at ``path``."""
+        self.store = SQLiteCache(path, max_entries=max_entries, ttl_seconds=ttl_seconds)
+        self.memory_entries = memory_entries
+        self.hits = 0
+        self.misses = 0
+        self._memory: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(agent: Any, task: Any) -> str:
+        """Hash everything that shapes the agent's response to a task."""
+        llm = getattr(agent, 'llm', None)
+        payload = {
+            'role': getattr(agent, 'role', ''),
+            'goal': getattr(agent, 'goal', ''),
+            'backstory': getattr(agent, 'backstory', ''),
+            'model': str(getattr(llm, 'model_name', None) or getattr(llm, 'model', '')),
+            'temperature': getattr(llm, 'temperature', None),
+            'max_tokens': getattr(llm, 'max_tokens', None),
+            'description': getattr(task, 'description', ''),
+            'expected_output': getattr(task, 'expected_output', '')
+        }
+        encoded = json.dumps(payload, sort_keys=True, default=str).encode('utf-8')
+        return hashlib.sha256(encoded).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        """Get a cached response, or None on a miss."""
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                self.hits += 1
+                return self._memory[key]
+
+        value = self.store.get(key)
+        with self._lock:
+            if value is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            response = value.decode('utf-8')
+            self._remember(key, response)
+            return response
+
+    def set(self, key: str, response: str):
+        """Cache a response on disk and in memory."""
+        self.store.set(key, response.encode('utf-8'))
+        with self._lock:
+            self._remember(key, response)
+
+    def clear(self):
+        """Drop every cached response."""
+        self.store.clear()
+        with self._lock:
+            self._memory.clear()
+
+    def stats(self) -> Dict[str, float]:
+        """Get hit/miss counters and the size of the on-disk cache."""
+        store_stats = self.store.stats()
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'memory_entries': len(self._memory),
+                'entries': store_stats['entries'],
+                'bytes': store_stats['bytes']
+            }
+
+    def _remember(self, key: str, response: str):
+        """Keep a response in the in-memory LRU. Caller must hold the lock."""
+        self._memory[key] = response
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+
+def kickoff_crew(crew: Any,
+                 task: Any,
+                 agent: Any,
+                 cache: Optional[LLMResponseCache] = None,
+                 metrics: Optional['PipelineMetrics'] = None) -> Tuple[str, Optional[str]]:
+    """
+    Run a crew and return its raw text output, consulting the cache first.
+
+    A fresh response is not cached here: the caller stores it with
+    :func:`store_response` once it parsed, so an unusable response is not
+    replayed on every rerun until it expires.
+
+    Args:
+        crew: The crew to run
+        task: The crew's task, whose rendered prompt is part of the cache key
+        agent: The agent performing the task
+        cache: Optional shared response cache
+        metrics: Optional collector for call latency and token usage
+
+    Returns:
+        Tuple of the raw text produced by the agent and the key to store it
+        under, which is None without a cache or when the text came from it
+    """
+    start = time.perf_counter()
+    key = None
+    if cache is not None:
+        key = cache.make_key(agent, task)
+        cached = cache.get(key)
+        if cached is not None:
+            if metrics is not None:
+                metrics.record_llm_call(getattr(agent, 'role', 'unknown'), time.perf_counter() - start, cached=True)
+            return cached, None
+
+    result = crew.kickoff()
+
+    # Handle CrewOutput object
+    if hasattr(result, 'raw_output'):
+        output_text = result.raw_output
+    else:
+        output_text = str(result)
+
+    if metrics is not None:
+        usage = getattr(result, 'token_usage', None) or getattr(crew, 'usage_metrics', None)
+        metrics.record_llm_call(
+            getattr(agent, 'role', 'unknown'),
+            time.perf_counter() - start,
+            cached=False,
+            usage=usage
+        )
+
+    return output_text, key
+
+def store_response(cache: Optional[LLMResponseCache], key: Optional[str], output_text: str):
+    """Cache a response returned by :func:`kickoff_crew` after it parsed successfully."""
+    if cache is not None and key is not None and output_text:
+        cache.set(key, output_text)
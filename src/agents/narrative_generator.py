@@ -1,19 +1,31 @@
 from crewai import Agent, Task, Crew
-from typing import List, Dict
+from typing import List, Dict, Optional
 import json
 from ..models.data_models import NarrativeSummary, Insight, OffsetRecommendation, TradeOffAnalysis
 from langchain_openai import ChatOpenAI
+from .llm_cache import LLMResponseCache, kickoff_crew, store_response
+from ..pipeline.instrumentation import PipelineMetrics
 
 class NarrativeGenerator:
-    def __init__(self):
-        # Initialize the LLM
+    def __init__(self,
+                 llm_cache: Optional[LLMResponseCache] = None,
+                 metrics: Optional[PipelineMetrics] = None):
+        self.llm_cache = llm_cache
+        self.metrics = metrics
+
+    def _create_agent(self) -> Agent:
+        """Build the agent (and its LLM client) for one crew run.
+
+        Crew.kickoff mutates the agents it runs, so concurrent scenarios
+        each get their own instead of sharing one.
+        """
         llm = ChatOpenAI(
             model="gpt-3.5-turbo",
             temperature=0.7,
             max_tokens=2000
         )
-        
-        self.narrative_agent = Agent(
+
+        return Agent(
             role='Budget Narrative Specialist',
             goal='Generate clear and actionable narratives from budget analyses',
             backstory="""You are a skilled communicator specializing in K-12 education finance.
@@ -116,6 +128,7 @@ class NarrativeGenerator:
                             'priority': goal.priority
                         })
             
+            agent = self._create_agent()
             # Create task with reduced verbosity
             task = Task(
                 description=f"""Generate a comprehensive narrative summary for scenario {scenario_id}:
@@ -148,23 +161,17 @@ Format the output as a JSON object with fields:
 
 IMPORTANT: The output MUST be a valid JSON object with these exact fields.""",
                 expected_output="A comprehensive narrative summary in JSON format with executive summary, key findings, recommendations, strategic implications, and detailed narrative.",
-                agent=self.narrative_agent
+                agent=agent
             )
 
             # Create and run crew with reduced verbosity
             crew = Crew(
-                agents=[self.narrative_agent],
+                agents=[agent],
                 tasks=[task],
                 verbose=False  # Set to False to reduce output verbosity
             )
 
-            result = crew.kickoff()
-            
-            # Handle CrewOutput object
-            if hasattr(result, 'raw_output'):
-                output_text = result.raw_output
-            else:
-                output_text = str(result)
+            output_text, cache_key = kickoff_crew(crew, task, agent, self.llm_cache, self.metrics)
             
             # Try to parse the output as JSON
             try:
@@ -172,6 +179,7 @@ IMPORTANT: The output MUST be a valid JSON object with these exact fields.""",
             except json.JSONDecodeError:
                 # If JSON parsing fails, create a default narrative
                 narrative_data = {
+                    'degraded': True,
                     'executive_summary': f"Error generating narrative for scenario {scenario_id}",
                     'key_findings': ["Unable to parse narrative output"],
                     'recommendations': ["Please review the scenario analysis manually"],
@@ -180,14 +188,19 @@ IMPORTANT: The output MUST be a valid JSON object with these exact fields.""",
                 }
             
             # Create NarrativeSummary object
-            return NarrativeSummary(
+            narrative = NarrativeSummary(
                 scenario_id=scenario_id,
                 executive_summary=narrative_data.get('executive_summary', ''),
                 key_findings=narrative_data.get('key_findings', []),
                 recommendations=narrative_data.get('recommendations', []),
                 strategic_implications=narrative_data.get('strategic_implications', []),
-                narrative=narrative_data.get('narrative', '')
+                narrative=narrative_data.get('narrative', ''),
+                degraded=narrative_data.get('degraded', False)
             )
+            # Only responses that parsed are worth replaying
+            if not narrative.degraded:
+                store_response(self.llm_cache, cache_key, output_text)
+            return narrative
             
         except Exception as e:
             print(f"Error generating narrative: {str(e)}")
@@ -198,7 +211,8 @@ IMPORTANT: The output MUST be a valid JSON object with these exact fields.""",
                 key_findings=["Analysis could not be completed due to errors"],
                 recommendations=["Please review the scenario manually"],
                 strategic_implications=["Error in analysis pipeline"],
-                narrative=f"The analysis pipeline encountered an error: {str(e)}"
+                narrative=f"The analysis pipeline encountered an error: {str(e)}",
+                degraded=True
             )
 
     def _format_insights(self, insights: List[Insight]) -> str:
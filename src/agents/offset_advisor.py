@@ -1,20 +1,34 @@
 from crewai import Agent, Task, Crew
-from typing import List, Dict, Tuple
+from typing import List, Dict, Tuple, Optional
 import json
 import re
 from ..models.data_models import OffsetRecommendation, FundingConstraint, BudgetDelta
 from langchain_openai import ChatOpenAI
+from .llm_cache import LLMResponseCache, kickoff_crew, store_response
+from ..pipeline.instrumentation import PipelineMetrics
 
 class OffsetAdvisor:
-    def __init__(self, funding_constraints: Dict):
-        # Initialize the LLM
-        self.llm = ChatOpenAI(
+    def __init__(self,
+                 funding_constraints: Dict,
+                 llm_cache: Optional[LLMResponseCache] = None,
+                 metrics: Optional[PipelineMetrics] = None):
+        self.funding_constraints = funding_constraints
+        self.llm_cache = llm_cache
+        self.metrics = metrics
+
+    def _create_agent(self) -> Agent:
+        """Build the agent (and its LLM client) for one crew run.
+
+        Crew.kickoff mutates the agents it runs, so concurrent scenarios
+        each get their own instead of sharing one.
+        """
+        llm = ChatOpenAI(
             model="gpt-3.5-turbo",
             temperature=0.7,
             max_tokens=2000
         )
-        
-        self.offset_agent = Agent(
+
+        return Agent(
             role='Budget Offset Advisor',
             goal='Recommend appropriate budget offsets to balance changes',
             backstory="""You are a strategic budget advisor with deep experience in K-12 education finance.
@@ -22,15 +36,18 @@ class OffsetAdvisor:
             You understand the complex relationships between different budget categories and their impact on student outcomes.
             You can identify both short-term and long-term opportunities for budget optimization.""",
             verbose=True,
-            llm=self.llm,
+            llm=llm,
             allow_delegation=False
         )
-        self.funding_constraints = funding_constraints
 
     def get_offset_recommendations(self, 
                                  budget_deltas: List[BudgetDelta],
-                                 strategic_goals: List[Dict]) -> List[Dict]:
-        """Get offset recommendations for budget changes."""
+                                 strategic_goals: List[Dict],
+                                 errors: Optional[List[str]] = None) -> List[Dict]:
+        """Get offset recommendations for budget changes.
+
+        Failures that fall back to a default are appended to ``errors`` when given.
+        """
         try:
             # Calculate net delta (total increase in spending)
             net_delta = sum(delta.delta if isinstance(delta, BudgetDelta) else delta['delta'] 
@@ -61,13 +78,16 @@ class OffsetAdvisor:
             recommendations = self._generate_detailed_recommendations(
                 offset_sources,
                 budget_deltas,
-                strategic_goals
+                strategic_goals,
+                errors
             )
             
             return recommendations
             
         except Exception as e:
             print(f"Error generating offset recommendations: {str(e)}")
+            if errors is not None:
+                errors.append(f"offsets: {str(e)}")
             return []
 
     def _get_current_budget(self) -> Dict[str, float]:
@@ -164,8 +184,10 @@ class OffsetAdvisor:
     def _generate_detailed_recommendations(self,
                                         offset_sources: List[Dict],
                                         budget_deltas: List[BudgetDelta],
-                                        strategic_goals: List[Dict]) -> List[Dict]:
+                                        strategic_goals: List[Dict],
+                                        errors: Optional[List[str]] = None) -> List[Dict]:
         """Generate detailed offset recommendations using LLM."""
+        agent = self._create_agent()
         # Create task for LLM
         task = Task(
             description=f"""Generate detailed offset recommendations for the following sources:
@@ -199,26 +221,21 @@ class OffsetAdvisor:
             
             Do not include any other text or formatting. Each category should be analyzed separately with these exact headers.""",
             expected_output="A detailed analysis of offset recommendations for budget changes, formatted as sections for each category with offset amounts, rationales, impacts, and implementation steps.",
-            agent=self.offset_agent
+            agent=agent
         )
 
         # Create and run crew
         crew = Crew(
-            agents=[self.offset_agent],
+            agents=[agent],
             tasks=[task],
             verbose=True
         )
 
-        result = crew.kickoff()
-        
-        # Handle CrewOutput object
-        if hasattr(result, 'raw_output'):
-            output_text = result.raw_output
-        else:
-            output_text = str(result)
+        output_text, cache_key = kickoff_crew(crew, task, agent, self.llm_cache, self.metrics)
         
         # Parse the output into structured recommendations
         recommendations = []
+        parse_errors: List[str] = []
         sections = output_text.split('\n\n')
         
         for section in sections:
@@ -258,8 +275,14 @@ class OffsetAdvisor:
                     })
             except Exception as e:
                 print(f"Error parsing section: {str(e)}")
+                parse_errors.append(f"offsets: {str(e)}")
                 continue
                 
+        if errors is not None:
+            errors.extend(parse_errors)
+        # Only responses that parsed cleanly are worth replaying
+        if recommendations and not parse_errors:
+            store_response(self.llm_cache, cache_key, output_text)
         return recommendations
 
     def _format_budget_changes(self, budget_deltas: List[Dict]) -> str:
@@ -1,20 +1,32 @@
 from crewai import Agent, Task, Crew
-from typing import List, Dict
+from typing import List, Dict, Optional
 import json
 from ..models.data_models import TradeOff, BudgetDelta
 from langchain_openai import ChatOpenAI
+from .llm_cache import LLMResponseCache, kickoff_crew, store_response
+from ..pipeline.instrumentation import PipelineMetrics
 import re
 
 class TradeOffEvaluator:
-    def __init__(self):
-        # Initialize the LLM
-        self.llm = ChatOpenAI(
+    def __init__(self,
+                 llm_cache: Optional[LLMResponseCache] = None,
+                 metrics: Optional[PipelineMetrics] = None):
+        self.llm_cache = llm_cache
+        self.metrics = metrics
+
+    def _create_agent(self) -> Agent:
+        """Build the agent (and its LLM client) for one crew run.
+
+        Crew.kickoff mutates the agents it runs, so concurrent scenarios
+        each get their own instead of sharing one.
+        """
+        llm = ChatOpenAI(
             model="gpt-3.5-turbo",
             temperature=0.7,
             max_tokens=2000
         )
-        
-        self.tradeoff_agent = Agent(
+
+        return Agent(
             role='Budget Trade-off Analyst',
             goal='Evaluate trade-offs in budget changes',
             backstory="""You are a strategic budget analyst specializing in K-12 education finance.
@@ -22,15 +34,19 @@ class TradeOffEvaluator:
             You understand how different budget changes impact educational outcomes and can assess
             both short-term and long-term implications of budget modifications.""",
             verbose=True,
-            llm=self.llm,
+            llm=llm,
             allow_delegation=False
         )
 
     def evaluate_tradeoffs(self,
                           budget_changes: List[BudgetDelta],
                           strategic_goals: List[Dict],
-                          current_budget: Dict) -> List[Dict]:
-        """Evaluate trade-offs between budget changes and strategic goals."""
+                          current_budget: Dict,
+                          errors: Optional[List[str]] = None) -> List[Dict]:
+        """Evaluate trade-offs between budget changes and strategic goals.
+
+        Failures that fall back to a default are appended to ``errors`` when given.
+        """
         try:
             # Convert budget changes to dictionary format if they're not already
             budget_changes_dict = {}
@@ -70,6 +86,7 @@ class TradeOffEvaluator:
                 # Handle other cases by converting to dict
                 current_budget_dict = {str(k): float(v) for k, v in current_budget.items()}
             
+            agent = self._create_agent()
             # Create task
             task = Task(
                 description=f"""Analyze the following budget changes, strategic goals, and current budget to evaluate trade-offs:
@@ -109,26 +126,21 @@ class TradeOffEvaluator:
                 
                 Do not include any other text or formatting. Each category should be analyzed separately with these exact headers.""",
                 expected_output="A detailed analysis of trade-offs between budget changes and strategic goals, formatted as sections for each category with trade-offs, impacts, risk levels, and mitigation steps.",
-                agent=self.tradeoff_agent
+                agent=agent
             )
 
             # Create and run crew
             crew = Crew(
-                agents=[self.tradeoff_agent],
+                agents=[agent],
                 tasks=[task],
                 verbose=True
             )
 
-            result = crew.kickoff()
-            
-            # Handle CrewOutput object
-            if hasattr(result, 'raw_output'):
-                output_text = result.raw_output
-            else:
-                output_text = str(result)
+            output_text, cache_key = kickoff_crew(crew, task, agent, self.llm_cache, self.metrics)
             
             # Parse the output into structured trade-offs
             tradeoffs = []
+            parse_errors: List[str] = []
             sections = output_text.split('\n\n')
             
             for section in sections:
@@ -168,12 +180,20 @@ class TradeOffEvaluator:
                         })
                 except Exception as e:
                     print(f"Error parsing section: {str(e)}")
+                    parse_errors.append(f"tradeoffs: {str(e)}")
                     continue
                     
+            if errors is not None:
+                errors.extend(parse_errors)
+            # Only responses that parsed cleanly are worth replaying
+            if tradeoffs and not parse_errors:
+                store_response(self.llm_cache, cache_key, output_text)
             return tradeoffs
             
         except Exception as e:
             print(f"Error evaluating trade-offs: {str(e)}")
+            if errors is not None:
+                errors.append(f"tradeoffs: {str(e)}")
             return []
 
     def _format_budget_changes(self, budget_changes: List[BudgetDelta]) -> str:
@@ -0,0 +1,75 @@
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+from ..models.data_models import AnalysisJob
+
+class JobManager:
+    """Runs pipeline work in a bounded thread pool and tracks job status."""
+
+    def __init__(self, max_workers: int = 4, max_finished_jobs: int = 1000):
+        """Initialize with the number of workers and how many finished jobs to keep."""
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="analysis-job")
+        self.max_finished_jobs = max_finished_jobs
+        self._jobs: Dict[str, AnalysisJob] = {}
+        self._lock = threading.Lock()
+
+    def submit(self, kind: str, func: Callable, *args, scenario_id: Optional[str] = None) -> AnalysisJob:
+        """Queue ``func(*args)`` and return the pending job right away."""
+        job = AnalysisJob(
+            job_id=uuid.uuid4().hex,
+            kind=kind,
+            status='pending',
+            submitted_at=datetime.utcnow(),
+            scenario_id=scenario_id
+        )
+        with self._lock:
+            self._jobs[job.job_id] = job
+            self._prune_finished_jobs()
+        self.executor.submit(self._run, job.job_id, func, *args)
+        return job.copy()
+
+    def get(self, job_id: str) -> Optional[AnalysisJob]:
+        """Get a copy of a job's current state, or None if unknown."""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return job.copy() if job else None
+
+    def list_jobs(self) -> List[AnalysisJob]:
+        """Get all tracked jobs without their results."""
+        with self._lock:
+            return [job.copy(update={'result': None}) for job in self._jobs.values()]
+
+    def shutdown(self, wait: bool = True):
+        """Stop accepting work and optionally wait for running jobs."""
+        self.executor.shutdown(wait=wait)
+
+    def _run(self, job_id: str, func: Callable, *args):
+        """Execute a job in a worker thread and record its outcome."""
+        self._update(job_id, status='running', started_at=datetime.utcnow())
+        try:
+            result = func(*args)
+            self._update(job_id, status='completed', result=result, completed_at=datetime.utcnow())
+        except Exception as e:
+            print(f"Error running job {job_id}: {str(e)}")
+            self._update(job_id, status='failed', error=str(e), completed_at=datetime.utcnow())
+
+    def _update(self, job_id: str, **changes):
+        """Replace a job with an updated copy so readers never see partial state."""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job:
+                self._jobs[job_id] = job.copy(update=changes)
+
+    def _prune_finished_jobs(self):
+        """Drop the oldest finished jobs once more than the limit are kept."""
+        finished = [
+            job for job in self._jobs.values()
+            if job.status in ('completed', 'failed')
+        ]
+        excess = len(finished) - self.max_finished_jobs
+        if excess > 0:
+            finished.sort(key=lambda job: job.completed_at or job.submitted_at)
+            for job in finished[:excess]:
+                del self._jobs[job.job_id]
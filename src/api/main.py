@@ -1,28 +1,77 @@
 from fastapi import FastAPI, HTTPException
-from typing import Dict, List
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import PlainTextResponse
+from typing import Dict, List, Optional
+import asyncio
+import functools
 import os
+import threading
 from ..pipeline.orchestrator import PipelineOrchestrator
-from ..models.data_models import Scenario, NarrativeSummary
+from ..models.data_models import Scenario, NarrativeSummary, AnalysisJob, PortfolioOption, RiskSimulation
+from .jobs import JobManager
 
 app = FastAPI(title="VibirEdu Budget Analysis Pipeline")
 
-# Initialize the pipeline orchestrator
-orchestrator = PipelineOrchestrator(
-    funding_constraints_path="data/funding_constraints.json",
-    scenarios_path="data/scenario_list.json",
-    snapshot_budget_path="data/snapshot_budget.csv",
-    timeseries_budget_path="data/timeseries_budget.csv",
-    strategic_goals_path="data/strategic_goals.json"
-)
+# The pipeline orchestrator is created on first use so the app starts fast
+_orchestrator = None
+_orchestrator_lock = threading.Lock()
+
+def get_orchestrator() -> PipelineOrchestrator:
+    global _orchestrator
+    if _orchestrator is None:
+        with _orchestrator_lock:
+            if _orchestrator is None:
+                _orchestrator = PipelineOrchestrator(
+                    funding_constraints_path="data/funding_constraints.json",
+                    scenarios_path="data/scenario_list.json",
+                    snapshot_budget_path="data/snapshot_budget.csv",
+                    timeseries_budget_path="data/timeseries_budget.csv",
+                    strategic_goals_path="data/strategic_goals.json",
+                    store_dir=os.getenv("VIBIR_STORE_DIR"),
+                    model_store_path=os.getenv("VIBIR_MODEL_STORE"),
+                    forecast_backend=os.getenv("VIBIR_FORECAST_BACKEND", "prophet")
+                )
+    return _orchestrator
+
+def _call_orchestrator(method: str, *args, **kwargs):
+    """Call an orchestrator method, creating the orchestrator first if needed.
+
+    Handlers run this off the event loop, so the cold start of the
+    orchestrator never blocks other requests.
+    """
+    return getattr(get_orchestrator(), method)(*args, **kwargs)
+
+def _scenario_ids() -> List[str]:
+    return get_orchestrator().scenario_loader.get_scenario_ids()
+
+# Pipeline work runs in a bounded pool so the event loop stays responsive
+job_manager = JobManager(max_workers=int(os.getenv("VIBIR_API_WORKERS", "4")))
+
+async def _run_pipeline(method: str, *args, **kwargs):
+    """Run an orchestrator method in the pipeline pool and await its result."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        job_manager.executor,
+        functools.partial(_call_orchestrator, method, *args, **kwargs)
+    )
+
+@app.on_event("shutdown")
+def shutdown_job_manager():
+    job_manager.shutdown(wait=False)
 
 @app.get("/")
 async def root():
     return {"message": "Welcome to VibirEdu Budget Analysis Pipeline"}
 
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics() -> str:
+    orchestrator = await run_in_threadpool(get_orchestrator)
+    return orchestrator.metrics.to_prometheus()
+
 @app.post("/analyze-scenario/{scenario_id}")
 async def analyze_scenario(scenario_id: str) -> NarrativeSummary:
     try:
-        return orchestrator.process_scenario(scenario_id)
+        return await _run_pipeline('process_scenario', scenario_id)
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
@@ -31,10 +80,58 @@ async def analyze_scenario(scenario_id: str) -> NarrativeSummary:
 @app.post("/analyze-all-scenarios")
 async def analyze_all_scenarios() -> Dict[str, NarrativeSummary]:
     try:
-        return orchestrator.process_all_scenarios()
+        return await _run_pipeline('process_all_scenarios')
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.get("/portfolios")
+async def explore_portfolios(cost_cap: Optional[float] = None) -> List[PortfolioOption]:
+    try:
+        return await _run_pipeline('explore_portfolios', cost_cap)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.get("/risk")
+async def simulate_risk(scenario_id: Optional[str] = None,
+                        n_paths: int = 10000,
+                        periods: int = 12,
+                        seed: Optional[int] = None) -> RiskSimulation:
+    try:
+        return await _run_pipeline('simulate_risk', scenario_id, n_paths=n_paths, periods=periods, seed=seed)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.post("/jobs/analyze-scenario/{scenario_id}", status_code=202)
+async def submit_scenario_job(scenario_id: str) -> AnalysisJob:
+    if scenario_id not in await run_in_threadpool(_scenario_ids):
+        raise HTTPException(status_code=404, detail=f"Scenario {scenario_id} not found")
+    return job_manager.submit(
+        'scenario',
+        _call_orchestrator,
+        'process_scenario',
+        scenario_id,
+        scenario_id=scenario_id
+    )
+
+@app.post("/jobs/analyze-all-scenarios", status_code=202)
+async def submit_all_scenarios_job() -> AnalysisJob:
+    return job_manager.submit('all_scenarios', _call_orchestrator, 'process_all_scenarios')
+
+@app.get("/jobs")
+async def list_jobs() -> List[AnalysisJob]:
+    return job_manager.list_jobs()
+
+@app.get("/jobs/{job_id}")
+async def get_job(job_id: str) -> AnalysisJob:
+    job = job_manager.get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
+    return job
+
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000) 
\ No newline at end of file
+    uvicorn.run(app, host="0.0.0.0", port=8000)
\ No newline at end of file
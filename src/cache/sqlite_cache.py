@@ -0,0 +1,142 @@
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Optional
+
+class SQLiteCache:
+    """Persistent key/value cache stored in a single SQLite file.
+
+    Entries are evicted least-recently-used first once ``max_entries`` or
+    ``max_bytes`` is exceeded, and expire after ``ttl_seconds`` when set.
+    """
+
+    def __init__(self,
+                 path: str,
+                 max_entries: Optional[int] = None,
+                 max_bytes: Optional[int] = None,
+                 ttl_seconds: Optional[float] = None):
+        """Open (or create) the cache file at ``path``."""
+        self.path = path
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                """CREATE TABLE IF NOT EXISTS entries (
+                    key TEXT PRIMARY KEY,
+                    tag TEXT,
+                    value BLOB NOT NULL,
+                    size INTEGER NOT NULL,
+                    created_at REAL NOT NULL,
+                    accessed_at REAL NOT NULL
+                )"""
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS entries_accessed ON entries (accessed_at)")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS entries_created ON entries (created_at)")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS entries_tag ON entries (tag)")
+
+    def get(self, key: str) -> Optional[bytes]:
+        """Get a cached value, or None on a miss or an expired entry."""
+        now = time.time()
+        with self._lock, self._conn:
+            row = self._conn.execute(
+                "SELECT value, created_at FROM entries WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            value, created_at = row
+            if self.ttl_seconds is not None and now - created_at > self.ttl_seconds:
+                self._conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+                self.misses += 1
+                return None
+            self._conn.execute("UPDATE entries SET accessed_at = ? WHERE key = ?", (now, key))
+            self.hits += 1
+            return value
+
+    def set(self, key: str, value: bytes, tag: Optional[str] = None):
+        """Store a value, evicting the least recently used entries if needed."""
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute(
+                """INSERT OR REPLACE INTO entries (key, tag, value, size, created_at, accessed_at)
+                   VALUES (?, ?, ?, ?, ?, ?)""",
+                (key, tag, value, len(value), now, now)
+            )
+            self._evict()
+
+    def delete(self, key: str) -> bool:
+        """Remove a single entry. Returns True if it existed."""
+        with self._lock, self._conn:
+            return self._conn.execute("DELETE FROM entries WHERE key = ?", (key,)).rowcount > 0
+
+    def invalidate_tag(self, tag: str) -> int:
+        """Remove every entry stored under ``tag``. Returns the number removed."""
+        with self._lock, self._conn:
+            return self._conn.execute("DELETE FROM entries WHERE tag = ?", (tag,)).rowcount
+
+    def clear(self) -> int:
+        """Remove every entry. Returns the number removed."""
+        with self._lock, self._conn:
+            return self._conn.execute("DELETE FROM entries").rowcount
+
+    def stats(self) -> Dict[str, float]:
+        """Get hit/miss counters and the current size of the cache."""
+        with self._lock:
+            entries, total_bytes = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries"
+            ).fetchone()
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'entries': entries,
+                'bytes': total_bytes
+            }
+
+    def close(self):
+        """Close the underlying database connection."""
+        with self._lock:
+            self._conn.close()
+
+    def _evict(self):
+        """Drop least recently used entries until the size limits hold."""
+        if self.ttl_seconds is not None:
+            self._conn.execute(
+                "DELETE FROM entries WHERE created_at < ?", (time.time() - self.ttl_seconds,)
+            )
+
+        if self.max_entries is not None:
+            self._conn.execute(
+                """DELETE FROM entries WHERE key IN (
+                       SELECT key FROM entries ORDER BY accessed_at DESC LIMIT -1 OFFSET ?
+                   )""",
+                (self.max_entries,)
+            )
+
+        if self.max_bytes is not None:
+            (total_bytes,) = self._conn.execute(
+                "SELECT COALESCE(SUM(size), 0) FROM entries"
+            ).fetchone()
+            if total_bytes <= self.max_bytes:
+                return
+            rows = self._conn.execute(
+                "SELECT key, size FROM entries ORDER BY accessed_at ASC"
+            ).fetchall()
+            evicted = []
+            for key, size in rows:
+                if total_bytes <= self.max_bytes:
+                    break
+                evicted.append((key,))
+                total_bytes -= size
+            self._conn.executemany("DELETE FROM entries WHERE key = ?", evicted)
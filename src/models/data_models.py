@@ -7,6 +7,14 @@ class FundingConstraint(BaseModel):
     locked_categories: List[str]
     note: str
 
+class FundRule(BaseModel):
+    """Spending rules of a single fund."""
+    fund: str
+    categories: List[str]
+    locked: bool = False
+    editable: bool = True
+    note: str = ""
+
 class Scenario(BaseModel):
     id: str
     target_category: str
@@ -115,6 +123,8 @@ class NarrativeSummary(BaseModel):
     recommendations: List[str]
     strategic_implications: List[str]
     narrative: str
+    # Set when any stage fell back to a default, so the result is not cached
+    degraded: bool = False
 
 class ValidationResult(BaseModel):
     is_valid: bool
@@ -185,4 +195,96 @@ class TimeSeriesEntry(BaseModel):
                 return datetime.strptime(v, '%Y-%m-%d')
             except ValueError:
                 raise ValueError('Date must be in YYYY-MM-DD format')
-        return v 
\ No newline at end of file
+        return v 
+
+class AnalysisJob(BaseModel):
+    """Status of a background analysis job submitted through the API."""
+    job_id: str
+    kind: str
+    status: str
+    submitted_at: datetime
+    started_at: Optional[datetime] = None
+    completed_at: Optional[datetime] = None
+    scenario_id: Optional[str] = None
+    result: Optional[Union[NarrativeSummary, Dict[str, NarrativeSummary]]] = None
+    error: Optional[str] = None
+
+    @validator('status')
+    def validate_status(cls, v):
+        valid_statuses = ['pending', 'running', 'completed', 'failed']
+        if v not in valid_statuses:
+            raise ValueError(f'Status must be one of {valid_statuses}')
+        return v
+
+class StageTiming(BaseModel):
+    """Resource usage of one pipeline stage for one scenario."""
+    scenario_id: str
+    stage: str
+    started_at: datetime
+    wall_seconds: float
+    cpu_seconds: float
+    # None unless tracemalloc was tracing and no other stage overlapped this one
+    allocated_bytes: Optional[int] = None
+    peak_bytes: Optional[int] = None
+
+class LLMCallRecord(BaseModel):
+    """Latency and token usage of one agent call."""
+    agent: str
+    latency_seconds: float
+    cached: bool
+    prompt_tokens: Optional[int] = None
+    completion_tokens: Optional[int] = None
+    total_tokens: Optional[int] = None
+
+class PortfolioOption(BaseModel):
+    """A combination of scenarios on the cost/goal-coverage Pareto frontier."""
+    scenario_ids: List[str]
+    net_cost: float
+    # Priority weight of the covered goals; undermined goals are not subtracted
+    goal_score: float
+    goals_covered: List[str]
+    goals_undermined: List[str]
+
+class DeferralImpact(BaseModel):
+    """Cash-flow effect of deferring spending, by month and by fiscal year."""
+    deferrals: Dict[str, int]
+    months: List[str]
+    baseline_by_month: List[float]
+    deferred_by_month: List[float]
+    delta_by_month: List[float]
+    delta_by_category_month: Dict[str, List[float]]
+    fiscal_years: List[str]
+    delta_by_fiscal_year: List[float]
+    delta_by_category_fiscal_year: Dict[str, List[float]]
+
+class RiskSimulation(BaseModel):
+    """Monte Carlo distribution of spending over a forecast horizon."""
+    n_paths: int
+    periods: int
+    seed: Optional[int] = None
+    percentiles: List[float]
+    categories: List[str]
+    expected_totals: Dict[str, float]
+    total_bands: Dict[str, Dict[str, float]]
+    overrun_probability: Dict[str, float]
+    district_monthly_bands: Dict[str, List[float]]
+    district_total_bands: Dict[str, float]
+    district_overrun_probability: Optional[float] = None
+
+class BacktestResult(BaseModel):
+    """Accuracy and cost of one forecasting configuration over rolling origins."""
+    backend: str
+    max_workers: int
+    horizon: int
+    origins: List[str]
+    categories: int
+    forecasts: int
+    mape: Optional[float] = None
+    coverage: Optional[float] = None
+    mape_by_step: List[Optional[float]]
+    fit_seconds: float
+    predict_seconds: float
+    fit_seconds_per_category: float
+    predict_seconds_per_category: float
+    peak_memory_bytes: Optional[int] = None
+    fit_errors: int
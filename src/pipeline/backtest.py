@@ -0,0 +1,191 @@
+import time
+import tracemalloc
+import numpy as np
+import pandas as pd
+from typing import Any, Dict, List, Optional
+from ..models.data_models import BacktestResult
+from .cost_forecaster import CostForecaster
+
+def synthetic_panel(n_categories: int = 50,
+                    n_months: int = 48,
+                    start: str = '2020-01-01',
+                    seed: Optional[int] = 0) -> pd.DataFrame:
+    """
+    Generate a timeseries panel shaped like timeseries_budget.csv.
+
+    Each category has its own level, trend and yearly seasonality, plus a
+    district-wide shock shared by all categories and its own noise.
+
+    Args:
+        n_categories: Number of subcategories
+        n_months: Number of months per subcategory
+        start: First month, as YYYY-MM-DD
+        seed: Seed of the random generator
+
+    Returns:
+        Frame with StartDate, Subcategory and Amount columns
+    """
+    rng = np.random.default_rng(seed)
+    months = pd.date_range(start, periods=n_months, freq='MS')
+    t = np.arange(n_months)
+
+    levels = rng.lognormal(mean=9, sigma=1, size=n_categories)
+    trends = levels * rng.normal(0.002, 0.004, size=n_categories)
+    amplitudes = levels * rng.uniform(0, 0.1, size=n_categories)
+    phases = rng.uniform(0, 2 * np.pi, size=n_categories)
+    shared = rng.normal(0, 0.01, size=n_months)
+    noise = rng.normal(0, 0.02, size=(n_categories, n_months))
+
+    amounts = (
+        levels[:, None]
+        + trends[:, None] * t[None, :]
+        + amplitudes[:, None] * np.sin(2 * np.pi * t[None, :] / 12 + phases[:, None])
+    ) * (1 + shared[None, :] + noise)
+
+    return pd.DataFrame({
+        'StartDate': np.tile(months.strftime('%Y-%m-%d'), n_categories),
+        'Subcategory': np.repeat([f"Category {i:04d}" for i in range(n_categories)], n_months),
+        'Amount': np.round(np.maximum(amounts, 0), 2).ravel()
+    })
+
+class ForecastBacktester:
+    """Rolling-origin backtests of CostForecaster.
+
+    For each origin month, a forecaster is built on the history before it
+    and its forecasts of the next ``horizon`` months are compared with the
+    actual amounts. Origins step back from the end of the data by
+    ``horizon`` months, so their test windows do not overlap.
+    """
+
+    def __init__(self,
+                 timeseries_data: pd.DataFrame,
+                 horizon: int = 3,
+                 n_origins: int = 3,
+                 min_train_months: int = 12):
+        """
+        Initialize with the full history.
+
+        Args:
+            timeseries_data: Frame with StartDate, Subcategory and Amount columns
+            horizon: Months forecast from each origin
+            n_origins: Number of origins; fewer are used if the history is too short
+            min_train_months: Months of history required before the first origin
+        """
+        self.timeseries_data = timeseries_data
+        self.horizon = max(1, int(horizon))
+        self.months = pd.to_datetime(timeseries_data['StartDate']).to_numpy().astype('datetime64[M]')
+
+        last = self.months.max()
+        first = self.months.min()
+        origins = [last - self.horizon + 1 - step * self.horizon for step in range(n_origins)]
+        self.origins = sorted(origin for origin in origins if origin - first >= np.timedelta64(min_train_months, 'M'))
+
+    def run(self,
+            backend: str = 'fast',
+            max_workers: int = 1,
+            prophet_params: Optional[Dict[str, Any]] = None,
+            trace_memory: bool = True) -> BacktestResult:
+        """
+        Backtest one forecasting configuration.
+
+        Args:
+            backend: CostForecaster backend
+            max_workers: Processes used to fit Prophet models
+            prophet_params: Prophet constructor arguments
+            trace_memory: Record the peak Python heap of this process with
+                tracemalloc, which also slows the run down somewhat
+
+        Returns:
+            Accuracy, timings and memory of the configuration
+        """
+        was_tracing = tracemalloc.is_tracing()
+        if trace_memory and not was_tracing:
+            tracemalloc.start()
+        if trace_memory:
+            tracemalloc.reset_peak()
+
+        errors: List[np.ndarray] = []
+        covered: List[np.ndarray] = []
+        fit_seconds = 0.0
+        predict_seconds = 0.0
+        fit_errors = 0
+        categories = set()
+        try:
+            for origin in self.origins:
+                history = self.timeseries_data[self.months < origin]
+                future = self.timeseries_data[(self.months >= origin) & (self.months < origin + self.horizon)]
+                forecaster = CostForecaster(
+                    '<backtest>',
+                    max_workers=max_workers,
+                    prophet_params=prophet_params,
+                    backend=backend,
+                    max_horizon=self.horizon,
+                    timeseries_data=history.reset_index(drop=True)
+                )
+
+                start = time.perf_counter()
+                if backend == 'fast':
+                    # Building the fast forecaster fits every category
+                    _ = forecaster.fast_forecaster
+                else:
+                    forecaster.train_models()
+                fit_seconds += time.perf_counter() - start
+
+                start = time.perf_counter()
+                paths = forecaster.forecast_paths(self.horizon)
+                predict_seconds += time.perf_counter() - start
+                fit_errors += len(forecaster.fit_errors)
+                categories.update(history['Subcategory'].unique())
+
+                actuals = self._actuals(future, origin)
+                for category, path in paths.items():
+                    actual = actuals.get(category)
+                    if actual is None:
+                        continue
+                    with np.errstate(invalid='ignore', divide='ignore'):
+                        errors.append(np.where(actual != 0, np.abs(actual - path[0]) / np.abs(actual), np.nan))
+                    covered.append(np.where(np.isnan(actual), np.nan, (actual >= path[1]) & (actual <= path[2])))
+        finally:
+            peak = tracemalloc.get_traced_memory()[1] if trace_memory else None
+            if trace_memory and not was_tracing:
+                tracemalloc.stop()
+
+        errors = np.array(errors).reshape(-1, self.horizon)
+        covered = np.array(covered).reshape(-1, self.horizon)
+        runs = max(len(categories) * len(self.origins), 1)
+        return BacktestResult(
+            backend=backend,
+            max_workers=max_workers,
+            horizon=self.horizon,
+            origins=[str(origin) for origin in self.origins],
+            categories=len(categories),
+            forecasts=int((~np.isnan(errors)).sum()),
+            mape=self._mean_percent(errors),
+            coverage=self._mean(covered),
+            mape_by_step=[self._mean_percent(errors[:, step]) for step in range(self.horizon)],
+            fit_seconds=fit_seconds,
+            predict_seconds=predict_seconds,
+            fit_seconds_per_category=fit_seconds / runs,
+            predict_seconds_per_category=predict_seconds / runs,
+            peak_memory_bytes=peak,
+            fit_errors=fit_errors
+        )
+
+    def _actuals(self, future: pd.DataFrame, origin: np.datetime64) -> Dict[str, np.ndarray]:
+        """Actual amounts per category for each month of the test window (NaN where missing)."""
+        steps = (pd.to_datetime(future['StartDate']).to_numpy().astype('datetime64[M]') - origin).astype(np.int64)
+        actuals: Dict[str, np.ndarray] = {}
+        for category, step, amount in zip(future['Subcategory'].tolist(), steps.tolist(), future['Amount'].tolist()):
+            actual = actuals.setdefault(category, np.full(self.horizon, np.nan))
+            actual[step] = amount if np.isnan(actual[step]) else actual[step] + amount
+        return actuals
+
+    @staticmethod
+    def _mean(values: np.ndarray) -> Optional[float]:
+        values = values[~np.isnan(values)]
+        return float(values.mean()) if len(values) else None
+
+    @classmethod
+    def _mean_percent(cls, values: np.ndarray) -> Optional[float]:
+        mean = cls._mean(values)
+        return mean * 100 if mean is not None else None
@@ -0,0 +1,214 @@
+import numpy as np
+from typing import List, Optional, TYPE_CHECKING
+from ..models.data_models import Scenario, BudgetDelta
+from .budget_index import CategoryRowIndex
+
+if TYPE_CHECKING:
+    from .deferral_engine import DeferralEngine
+
+# Percentages are interpreted differently by the two single-scenario paths
+# of BudgetScenarioApplier; the batch engine supports both.
+#   'scenario': apply_scenario  - percentage is a percent
+#   'changes':  apply_changes   - percentage is a fraction
+# Deferrals are always months, scaled by the share of spending that stays
+# in the year (see DeferralEngine.retained_fractions).
+CONVENTIONS = ('scenario', 'changes')
+
+TYPE_CODES = {'percentage': 0, 'fixed': 1, 'deferral': 2}
+
+class CompiledScenarioBatch:
+    """Scenarios compiled into affine per-operation vectors.
+
+    Operation ``i`` maps each row of its target category from ``x`` to
+    ``x * factors[i] + addends[i]``.
+    """
+
+    def __init__(self,
+                 scenario_ids: List[str],
+                 categories: List[str],
+                 type_codes: np.ndarray,
+                 values: np.ndarray,
+                 factors: np.ndarray,
+                 addends: np.ndarray):
+        self.scenario_ids = scenario_ids
+        self.categories = categories
+        self.type_codes = type_codes
+        self.values = values
+        self.factors = factors
+        self.addends = addends
+
+    def __len__(self) -> int:
+        return len(self.scenario_ids)
+
+class BatchApplyResult:
+    """Outcome of applying a compiled batch, with per-operation delta vectors.
+
+    ``rows`` lists the budget rows touched by at least one operation.
+    """
+
+    def __init__(self,
+                 batch: CompiledScenarioBatch,
+                 amounts: np.ndarray,
+                 rows: np.ndarray,
+                 applied: np.ndarray,
+                 old_amounts: np.ndarray,
+                 new_amounts: np.ndarray):
+        self.batch = batch
+        self.amounts = amounts
+        self.rows = rows
+        self.applied = applied
+        self.old_amounts = old_amounts
+        self.new_amounts = new_amounts
+
+    @property
+    def deltas(self) -> np.ndarray:
+        return self.new_amounts - self.old_amounts
+
+    @property
+    def skipped_categories(self) -> List[str]:
+        """Target categories of operations that matched no budget rows."""
+        return sorted({self.batch.categories[i] for i in np.flatnonzero(~self.applied)})
+
+    def to_deltas(self) -> List[BudgetDelta]:
+        """Build BudgetDelta objects for every applied operation."""
+        categories = self.batch.categories
+        old_amounts = self.old_amounts.tolist()
+        new_amounts = self.new_amounts.tolist()
+        return [
+            BudgetDelta(
+                category=categories[i],
+                old_amount=old_amounts[i],
+                new_amount=new_amounts[i],
+                delta=new_amounts[i] - old_amounts[i]
+            )
+            for i in np.flatnonzero(self.applied).tolist()
+        ]
+
+class BatchScenarioEngine:
+    """Applies many scenarios to an array-backed budget in one vectorized pass."""
+
+    @staticmethod
+    def compile(scenarios: List[Scenario],
+                convention: str = 'scenario',
+                deferral_engine: Optional['DeferralEngine'] = None) -> CompiledScenarioBatch:
+        """
+        Compile scenarios into factor and addend vectors.
+
+        Args:
+            scenarios: Scenarios in application order
+            convention: 'scenario' (apply_scenario semantics) or 'changes'
+                (apply_changes semantics)
+            deferral_engine: Engine providing each category's monthly spending
+                profile; without one, spending is assumed to be even
+
+        Returns:
+            The compiled batch
+        """
+        if convention not in CONVENTIONS:
+            raise ValueError(f"Convention must be one of {CONVENTIONS}")
+
+        count = len(scenarios)
+        # None becomes NaN, so each change field is read in a single pass
+        percentage_values = np.array([scenario.percentage for scenario in scenarios], dtype=float)
+        fixed_values = np.array([scenario.fixed_delta for scenario in scenarios], dtype=float)
+        deferral_values = np.array([scenario.defer_months for scenario in scenarios], dtype=float)
+
+        # Same precedence as Scenario.type
+        percentage = ~np.isnan(percentage_values)
+        fixed = ~percentage & ~np.isnan(fixed_values)
+        deferral = ~percentage & ~fixed & ~np.isnan(deferral_values)
+        if not (percentage | fixed | deferral).all():
+            raise ValueError("No change type specified")
+
+        type_codes = np.select(
+            [percentage, fixed],
+            [TYPE_CODES['percentage'], TYPE_CODES['fixed']],
+            TYPE_CODES['deferral']
+        ).astype(np.int8)
+        values = np.select([percentage, fixed], [percentage_values, fixed_values], deferral_values)
+
+        factors = np.ones(count)
+        addends = np.zeros(count)
+        if convention == 'scenario':
+            factors[percentage] = 1 + values[percentage] / 100
+        else:
+            factors[percentage] = 1 + values[percentage]
+        addends[fixed] = values[fixed]
+
+        categories = [scenario.target_category for scenario in scenarios]
+        if deferral.any():
+            deferred = np.flatnonzero(deferral)
+            if deferral_engine is not None:
+                factors[deferred] = deferral_engine.retained_fractions(
+                    [categories[position] for position in deferred],
+                    values[deferred]
+                )
+            else:
+                factors[deferred] = 1 - np.clip(values[deferred], 0, 12) / 12
+
+        return CompiledScenarioBatch(
+            scenario_ids=[scenario.id for scenario in scenarios],
+            categories=categories,
+            type_codes=type_codes,
+            values=values,
+            factors=factors,
+            addends=addends
+        )
+
+    @staticmethod
+    def apply(amounts: np.ndarray,
+              index: CategoryRowIndex,
+              batch: CompiledScenarioBatch) -> BatchApplyResult:
+        """
+        Apply a compiled batch to a copy of ``amounts``.
+
+        Operations hitting the same row are applied in batch order. Rows are
+        processed in rounds, where round ``k`` applies the ``k``-th operation
+        on every row at once, so the number of array passes is the largest
+        number of operations sharing a row rather than the batch size.
+
+        Args:
+            amounts: Budget amounts, one per row
+            index: Category to row index of the budget
+            batch: The compiled scenarios
+
+        Returns:
+            The new amounts and per-operation old/new totals
+        """
+        new_amounts = np.array(amounts, dtype=float, copy=True)
+        codes = index.encode(batch.categories)
+        op_index, rows = index.expand(codes)
+
+        # Rank of each (operation, row) pair among the pairs hitting that row
+        order = np.argsort(rows, kind='stable')
+        sorted_rows = rows[order]
+        group_start = np.ones(len(sorted_rows), dtype=bool)
+        group_start[1:] = sorted_rows[1:] != sorted_rows[:-1]
+        positions = np.arange(len(sorted_rows))
+        rank_sorted = positions - np.maximum.accumulate(np.where(group_start, positions, 0))
+        ranks = np.empty_like(rank_sorted)
+        ranks[order] = rank_sorted
+
+        pair_old = np.empty(len(rows))
+        pair_new = np.empty(len(rows))
+        by_rank = np.argsort(ranks, kind='stable')
+        boundaries = np.searchsorted(ranks[by_rank], np.arange(ranks.max() + 2 if len(ranks) else 1))
+        for start, end in zip(boundaries[:-1], boundaries[1:]):
+            pairs = by_rank[start:end]
+            pair_rows = rows[pairs]
+            ops = op_index[pairs]
+            old = new_amounts[pair_rows]
+            new = old * batch.factors[ops] + batch.addends[ops]
+            new_amounts[pair_rows] = new
+            pair_old[pairs] = old
+            pair_new[pairs] = new
+
+        count = len(batch)
+        return BatchApplyResult(
+            batch=batch,
+            amounts=new_amounts,
+            rows=np.unique(rows),
+            applied=codes >= 0,
+            old_amounts=np.bincount(op_index, weights=pair_old, minlength=count),
+            new_amounts=np.bincount(op_index, weights=pair_new, minlength=count)
+        )
@@ -0,0 +1,161 @@
+import numpy as np
+import pandas as pd
+from typing import Dict, Iterable, List, Optional, Union
+from ..models.data_models import Scenario, ScenarioValidationResult
+from .constraint_index import FundingConstraintIndex
+
+CHANGE_COLUMNS = ['percentage', 'fixed_delta', 'defer_months']
+
+class BatchScenarioValidator:
+    """Validates whole scenario sets column-wise against the funding constraints.
+
+    Every rule is evaluated as one vectorized mask over all scenarios; only
+    the rows that fail a rule are visited to attach messages.
+    """
+
+    def __init__(self, constraint_index: FundingConstraintIndex):
+        """Initialize with the compiled funding constraint index."""
+        self.constraint_index = constraint_index
+        self._categories = np.array(sorted(constraint_index.categories), dtype=object)
+        self._locked = np.array(sorted(constraint_index.locked_categories), dtype=object)
+        self._funds = np.array(sorted(constraint_index.funds), dtype=object)
+        self._owned_pairs = np.array(sorted(
+            self._pair_key(fund, category)
+            for fund, categories in constraint_index.fund_categories.items()
+            for category in categories
+        ), dtype=object)
+        self._editable_pairs = np.array(sorted(
+            self._pair_key(fund, category)
+            for fund, categories in constraint_index.fund_categories.items()
+            if constraint_index.funds[fund].editable
+            for category in categories
+        ), dtype=object)
+
+    @staticmethod
+    def _pair_key(fund: str, category: str) -> str:
+        return f"{fund}\x1f{category}"
+
+    def validate(self,
+                 scenarios: Iterable[Union[Scenario, Dict]],
+                 budget_categories: Optional[Iterable[str]] = None) -> Dict[str, ScenarioValidationResult]:
+        """
+        Validate many scenarios in one pass.
+
+        Args:
+            scenarios: Scenario objects or raw scenario dictionaries. Raw
+                dictionaries can carry conflicting change types, which the
+                Scenario model itself would reject.
+            budget_categories: Optional budget subcategories; targets missing
+                from the budget produce a warning
+
+        Returns:
+            Validation result per scenario ID
+        """
+        records = [
+            scenario.dict() if isinstance(scenario, Scenario) else dict(scenario)
+            for scenario in scenarios
+        ]
+        if not records:
+            return {}
+
+        frame = pd.DataFrame.from_records(records)
+        for column in ['id', 'target_category', 'source_fund'] + CHANGE_COLUMNS:
+            if column not in frame.columns:
+                frame[column] = None
+
+        count = len(frame)
+        errors: List[List[str]] = [[] for _ in range(count)]
+        warnings: List[List[str]] = [[] for _ in range(count)]
+
+        ids = frame['id'].astype(object)
+        missing_id = ids.isna().to_numpy() | (ids.astype(str).str.len() == 0).to_numpy()
+        frame['id'] = np.where(missing_id, [f"<row {row}>" for row in range(count)], ids)
+        columns = {
+            column: frame[column].tolist()
+            for column in ['id', 'target_category', 'source_fund'] + CHANGE_COLUMNS
+        }
+
+        def flag(mask: np.ndarray, messages: List[List[str]], template: str):
+            for row in np.flatnonzero(mask):
+                messages[row].append(template.format(**{
+                    column: column_values[row] for column, column_values in columns.items()
+                }))
+
+        category = frame['target_category'].astype(object)
+        fund = frame['source_fund'].astype(object)
+        missing_category = category.isna().to_numpy()
+        missing_fund = fund.isna().to_numpy()
+        flag(missing_id, errors, "Scenario is missing an id")
+        flag(missing_category, errors, "Scenario {id} is missing a target category")
+        flag(missing_fund, errors, "Scenario {id} is missing a source fund")
+
+        # Category existence, locked status and fund ownership
+        known_category = np.isin(category.to_numpy(), self._categories)
+        flag(~missing_category & ~known_category, errors,
+             "Target category '{target_category}' not found in funding constraints")
+        locked = np.isin(category.to_numpy(), self._locked)
+        flag(locked, errors, "Category '{target_category}' is locked")
+
+        known_fund = np.isin(fund.to_numpy(), self._funds)
+        flag(~missing_fund & ~known_fund, errors,
+             "Source fund '{source_fund}' not found in funding constraints")
+        pairs = np.array([
+            self._pair_key(fund_name, category_name)
+            for fund_name, category_name in zip(columns['source_fund'], columns['target_category'])
+        ], dtype=object)
+        owned = np.isin(pairs, self._owned_pairs)
+        checkable = known_fund & known_category
+        flag(checkable & ~owned, errors,
+             "Fund '{source_fund}' cannot be spent on '{target_category}'")
+        editable = np.isin(pairs, self._editable_pairs)
+        flag(checkable & owned & ~editable & ~locked, errors,
+             "Fund '{source_fund}' does not allow changes to '{target_category}'")
+
+        # Change types: exactly one must be set and all must be numeric
+        values = {}
+        for column in CHANGE_COLUMNS:
+            raw = frame[column]
+            numeric = pd.to_numeric(raw, errors='coerce')
+            flag((raw.notna() & numeric.isna()).to_numpy(), errors,
+                 f"{column} must be numeric in scenario {{id}}")
+            values[column] = numeric.to_numpy(dtype=float)
+        set_counts = sum((~np.isnan(values[column])).astype(int) for column in CHANGE_COLUMNS)
+        flag(set_counts == 0, errors, "Scenario {id} does not specify a change")
+        flag(set_counts > 1, errors,
+             "Scenario {id} sets more than one of percentage, fixed_delta, or defer_months")
+
+        with np.errstate(invalid='ignore'):
+            percentage = values['percentage']
+            flag((percentage < 0) | (percentage > 1), errors, "Invalid percentage value: {percentage}")
+            flag(percentage == 0, warnings, "Scenario {id} has a zero percentage change")
+            fixed_delta = values['fixed_delta']
+            flag(fixed_delta == 0, warnings, "Scenario {id} has a zero fixed delta")
+            defer_months = values['defer_months']
+            flag(~np.isnan(defer_months) & ((defer_months < 0) | (defer_months != np.floor(defer_months))), errors,
+                 "defer_months must be a non-negative whole number in scenario {id}")
+            flag(defer_months > 12, warnings,
+                 "Scenario {id} defers spending beyond the next twelve months")
+
+        flag(frame['id'].duplicated(keep=False).to_numpy() & ~missing_id, warnings,
+             "Scenario id {id} appears more than once")
+
+        if budget_categories is not None:
+            in_budget = np.isin(category.to_numpy(), np.array(list(budget_categories), dtype=object))
+            flag(~missing_category & known_category & ~in_budget, warnings,
+                 "Target category '{target_category}' is not in the budget snapshot")
+
+        results: Dict[str, ScenarioValidationResult] = {}
+        for row, scenario_id in enumerate(columns['id']):
+            result = results.get(scenario_id)
+            if result is None:
+                results[scenario_id] = ScenarioValidationResult(
+                    is_valid=not errors[row],
+                    errors=errors[row],
+                    warnings=warnings[row]
+                )
+            else:
+                # Duplicate IDs share one result holding every occurrence's messages
+                result.errors.extend(message for message in errors[row] if message not in result.errors)
+                result.warnings.extend(message for message in warnings[row] if message not in result.warnings)
+                result.is_valid = not result.errors
+        return results
@@ -1,15 +1,83 @@
+import numpy as np
 import pandas as pd
 import logging
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Union, TYPE_CHECKING
 from pathlib import Path
-from ..models.data_models import Scenario, BudgetSnapshot, BudgetDelta, BudgetEntry
+from ..models.data_models import Scenario, BudgetSnapshot, BudgetDelta
+from .batch_engine import BatchScenarioEngine, BatchApplyResult
+from .budget_state import BudgetState
+from .columnar_store import ColumnarStore
+from .delta_journal import DeltaJournal
+
+if TYPE_CHECKING:
+    from .deferral_engine import DeferralEngine
 
 class BudgetScenarioApplier:
-    def __init__(self, snapshot_budget_path: str):
-        """Initialize with path to snapshot budget CSV."""
+    def __init__(self,
+                 snapshot_budget_path: str,
+                 store_dir: Optional[str] = None,
+                 deferral_engine: Optional['DeferralEngine'] = None):
+        """Initialize with path to snapshot budget CSV.
+
+        With ``store_dir`` set, the budget is loaded memory-mapped from the
+        columnar store (ingesting the CSV there first if it changed). The
+        optional deferral engine supplies monthly spending profiles, so a
+        deferral removes the spending actually pushed out of the year.
+        """
         self.snapshot_budget_path = snapshot_budget_path
-        self.current_budget = self._load_budget()
+        self.store_dir = store_dir
+        self.deferral_engine = deferral_engine
+        self.state = self._load_state()
         self.snapshot = None
+        # History of every change, for undo/redo and replaying earlier steps
+        self.journal = DeltaJournal(self.state)
+
+    def _load_state(self) -> BudgetState:
+        """Load the budget from the columnar store if configured, else from CSV."""
+        if self.store_dir:
+            try:
+                return self._load_budget_from_store()
+            except Exception as e:
+                print(f"Error loading budget from columnar store: {str(e)}")
+        return BudgetState.from_frame(self._load_budget())
+
+    def _load_budget_from_store(self) -> BudgetState:
+        """Load the budget memory-mapped from the columnar store."""
+        table = ColumnarStore(self.store_dir).load_csv(
+            Path(self.snapshot_budget_path).stem,
+            self.snapshot_budget_path,
+            float_columns=['Amount']
+        )
+        state = BudgetState.from_columns(
+            table.column('Subcategory'),
+            table.column('Year'),
+            table.column('AmountType'),
+            table.column('Amount'),
+            copy=False
+        )
+        print(f"Successfully loaded budget with {len(state)} categories")
+        return state
+
+    @property
+    def current_budget(self) -> pd.DataFrame:
+        """The current budget as a DataFrame view of the immutable state.
+
+        Each access builds a new frame over the state's read-only arrays, so
+        changes must go through the applier (or the setter), never the frame.
+        """
+        return self.state.to_frame()
+
+    @current_budget.setter
+    def current_budget(self, df: pd.DataFrame):
+        self.state = BudgetState.from_frame(df)
+        self.journal = DeltaJournal(self.state)
+
+    def _set_amounts(self, rows: np.ndarray, values, label: str = ''):
+        """Replace the amounts of some rows and record the change in the journal."""
+        rows = np.asarray(rows, dtype=np.int64)
+        old_amounts = self.state.amounts_at(rows)
+        self.state = self.state.with_amounts(rows, values)
+        self.journal.record(rows, old_amounts, self.state.amounts_at(rows), self.state, label)
 
     def _load_budget(self) -> pd.DataFrame:
         """Load budget from CSV file."""
@@ -36,53 +104,37 @@ class BudgetScenarioApplier:
             print(f"Error loading budget: {str(e)}")
             return pd.DataFrame()
 
-    def take_snapshot(self) -> BudgetSnapshot:
-        """Take a snapshot of the current budget state."""
-        try:
-            if self.current_budget.empty:
-                raise ValueError("No budget data available")
-            
-            snapshot_data = []
-            for _, row in self.current_budget.iterrows():
-                try:
-                    entry = BudgetEntry(
-                        subcategory=str(row['subcategory']),
-                        amount=float(row['amount']),
-                        year=int(row['year']),
-                        amount_type=str(row['amount_type'])
-                    )
-                    snapshot_data.append(entry)
-                except Exception as e:
-                    print(f"Error creating budget entry: {str(e)}")
-                    print(f"Row data: {row.to_dict()}")
-                    raise
-            
-            if not snapshot_data:
-                raise ValueError("No valid budget entries found")
-            
-            self.snapshot = BudgetSnapshot(subcategory=snapshot_data)
-            return self.snapshot
-        except Exception as e:
-            print(f"Error taking budget snapshot: {str(e)}")
-            raise  # Re-raise the exception to be handled by the caller
+    def take_snapshot(self) -> BudgetState:
+        """Take a snapshot of the current budget state.
+
+        States are immutable, so the snapshot is the current state itself.
+        """
+        if self.state.empty:
+            print("Error taking budget snapshot: No budget data available")
+            raise ValueError("No budget data available")
+        self.snapshot = self.state
+        return self.snapshot
 
-    def reset_to_snapshot(self, snapshot: BudgetSnapshot):
+    def reset_to_snapshot(self, snapshot: Union[BudgetState, BudgetSnapshot]):
         """Reset budget to a previous snapshot state."""
         try:
-            if not snapshot or not snapshot.subcategory:
+            if isinstance(snapshot, BudgetSnapshot):
+                if not snapshot.subcategory:
+                    print("No valid snapshot to reset to")
+                    return
+                snapshot = BudgetState.from_snapshot(snapshot)
+            elif snapshot is None or snapshot.empty:
                 print("No valid snapshot to reset to")
                 return
-            
-            # Convert snapshot data back to DataFrame
-            snapshot_data = []
-            for entry in snapshot.subcategory:
-                snapshot_data.append({
-                    'subcategory': entry.subcategory,
-                    'amount': entry.amount,
-                    'year': entry.year,
-                    'amount_type': entry.amount_type
-                })
-            self.current_budget = pd.DataFrame(snapshot_data)
+
+            if snapshot.subcategories is self.state.subcategories:
+                # Same budget layout: record the reset so it can be undone
+                changed = np.flatnonzero(snapshot.amounts != self.state.amounts)
+                if len(changed):
+                    self._set_amounts(changed, snapshot.amounts[changed], label='reset_to_snapshot')
+            else:
+                self.state = snapshot
+                self.journal = DeltaJournal(self.state)
             print("Budget reset to snapshot state")
         except Exception as e:
             print(f"Error resetting budget: {str(e)}")
@@ -91,17 +143,17 @@ class BudgetScenarioApplier:
     def apply_changes(self, scenario: Scenario) -> List[BudgetDelta]:
         """Apply budget changes based on scenario."""
         try:
-            if self.current_budget.empty:
+            state = self.state
+            if state.empty:
                 raise ValueError("No budget data loaded")
 
             # Find the target category in the budget
-            target_rows = self.current_budget[self.current_budget['subcategory'] == scenario.target_category]
-            if target_rows.empty:
+            target_rows = state.find_rows(scenario.target_category)
+            if len(target_rows) == 0:
                 raise ValueError(f"Target category '{scenario.target_category}' not found in budget")
 
             deltas = []
-            for _, row in target_rows.iterrows():
-                old_amount = float(row['amount'])
+            for old_amount in state.amounts_at(target_rows).tolist():
                 
                 # Calculate new amount based on scenario type
                 if scenario.type == 'percentage':
@@ -109,14 +161,11 @@ class BudgetScenarioApplier:
                 elif scenario.type == 'fixed':
                     new_amount = old_amount + scenario.value
                 elif scenario.type == 'deferral':
-                    # For deferral, we'll reduce the current amount and add it back later
-                    new_amount = old_amount * (1 - (scenario.value / 12))  # Monthly reduction
+                    # For deferral, we'll reduce the current amount by the spending pushed out of the year
+                    new_amount = old_amount * self._retained_fraction(scenario)
                 else:
                     raise ValueError(f"Invalid scenario type: {scenario.type}")
 
-                # Update the budget
-                self.current_budget.loc[self.current_budget['subcategory'] == scenario.target_category, 'amount'] = new_amount
-
                 # Create delta record
                 delta = BudgetDelta(
                     category=scenario.target_category,
@@ -126,32 +175,47 @@ class BudgetScenarioApplier:
                 )
                 deltas.append(delta)
 
+            # Update the budget
+            self._set_amounts(target_rows, new_amount, label=scenario.id)
             return deltas
 
         except Exception as e:
             print(f"Error applying budget changes: {str(e)}")
             return []
 
+    def fork(self) -> 'BudgetScenarioApplier':
+        """Create an isolated applier over the current budget.
+
+        The fork starts from the same immutable state, so forking is O(1) and
+        changes made through the fork never leak back into this applier (or
+        into sibling forks).
+        """
+        forked = object.__new__(BudgetScenarioApplier)
+        forked.snapshot_budget_path = self.snapshot_budget_path
+        forked.store_dir = self.store_dir
+        forked.deferral_engine = self.deferral_engine
+        forked.state = self.state
+        forked.snapshot = None
+        forked.journal = DeltaJournal(forked.state, self.journal.checkpoint_interval)
+        return forked
+
     def get_current_budget(self) -> pd.DataFrame:
         """Get the current state of the budget."""
         return self.current_budget.copy()
 
     def apply_scenario(self, scenario: Scenario) -> List[BudgetDelta]:
         """Apply a single scenario and return the budget changes."""
-        if not self.current_budget.empty:
+        state = self.state
+        if not state.empty:
             # Validate scenario
-            if scenario.target_category not in self.current_budget['subcategory'].values:
+            if scenario.target_category not in state.row_index:
                 print(f"Target category '{scenario.target_category}' not found in budget")
-                print(f"Available categories: {self.current_budget['subcategory'].tolist()}")
+                print(f"Available categories: {state.subcategories.tolist()}")
                 return []
 
             # Calculate new amount based on scenario type
-            target_rows = self.current_budget[self.current_budget['subcategory'] == scenario.target_category]
-            if target_rows.empty:
-                print(f"Target category '{scenario.target_category}' not found in budget")
-                return []
-            
-            old_amount = float(target_rows['amount'].values[0])
+            target_rows = state.find_rows(scenario.target_category)
+            old_amount = float(state.amounts_at(target_rows[:1])[0])
             
             try:
                 if scenario.type == 'percentage':
@@ -159,14 +223,14 @@ class BudgetScenarioApplier:
                 elif scenario.type == 'fixed':
                     new_amount = old_amount + scenario.value
                 elif scenario.type == 'deferral':
-                    new_amount = old_amount * (1 - scenario.value / 100)
+                    new_amount = old_amount * self._retained_fraction(scenario)
                 else:
                     print(f"Unknown scenario type: {scenario.type}")
                     return []
 
                 # Apply the change
-                self.current_budget.loc[self.current_budget['subcategory'] == scenario.target_category, 'amount'] = new_amount
-                print(f"Applied {scenario.value}{'%' if scenario.type == 'percentage' or scenario.type == 'deferral' else ''} change to {scenario.target_category}")
+                self._set_amounts(target_rows, new_amount, label=scenario.id)
+                print(f"Applied {scenario.value}{'%' if scenario.type == 'percentage' else ' month' if scenario.type == 'deferral' else ''} change to {scenario.target_category}")
 
                 # Create and return budget delta
                 return [BudgetDelta(
@@ -184,18 +248,75 @@ class BudgetScenarioApplier:
 
     def apply_multiple_scenarios(self, scenarios: List[Scenario]) -> List[BudgetDelta]:
         """Apply multiple scenarios and return all budget changes."""
-        all_deltas = []
-        for scenario in scenarios:
-            deltas = self.apply_scenario(scenario)
-            all_deltas.extend(deltas)
-        return all_deltas
+        result = self.apply_scenarios_batch(scenarios)
+        if result is None:
+            return []
+        return result.to_deltas()
+
+    def apply_scenarios_batch(self,
+                              scenarios: List[Scenario],
+                              convention: str = 'scenario') -> Optional[BatchApplyResult]:
+        """
+        Apply many scenarios in one vectorized pass.
+
+        Args:
+            scenarios: Scenarios in application order
+            convention: 'scenario' to read values like apply_scenario, or
+                'changes' to read them like apply_changes
+
+        Returns:
+            The batch result with per-scenario old/new amounts, or None if no
+            budget is loaded
+        """
+        state = self.state
+        if state.empty:
+            print("No budget data available")
+            return None
+
+        batch = BatchScenarioEngine.compile(scenarios, convention, self.deferral_engine)
+        result = BatchScenarioEngine.apply(state.amounts, state.row_index, batch)
+        self._set_amounts(result.rows, result.amounts[result.rows], label=f"batch of {len(batch)} scenarios")
+
+        skipped = result.skipped_categories
+        if skipped:
+            print(f"Target categories not found in budget: {skipped}")
+        print(f"Applied {int(result.applied.sum())} of {len(batch)} scenario changes")
+        return result
+
+    def _retained_fraction(self, scenario: Scenario) -> float:
+        """Share of a category's yearly spending left after deferring it."""
+        if self.deferral_engine is not None:
+            return float(self.deferral_engine.retained_fractions([scenario.target_category], [scenario.value])[0])
+        return 1 - min(max(scenario.value, 0), 12) / 12
+
+    def undo(self) -> bool:
+        """Revert the most recent change. Returns False if there is nothing to undo."""
+        state = self.journal.undo(self.state)
+        if state is None:
+            return False
+        self.state = state
+        return True
+
+    def redo(self) -> bool:
+        """Re-apply the most recently undone change. Returns False if there is nothing to redo."""
+        state = self.journal.redo(self.state)
+        if state is None:
+            return False
+        self.state = state
+        return True
+
+    def state_at(self, step: int) -> BudgetState:
+        """Get the budget as it was after the first ``step`` journaled changes."""
+        return self.journal.state_at(step, self.state)
+
+    def find_rows(self, category: str, year: Optional[int] = None) -> np.ndarray:
+        """Get the row positions of a category, optionally restricted to one year."""
+        return self.state.find_rows(category, year)
 
     def get_budget_delta(self) -> Dict[str, float]:
         """Get the difference between original and current budget."""
-        return {
-            category: self.current_budget[self.current_budget['subcategory'] == category]['amount'].values[0]
-            for category in self.current_budget['subcategory'].tolist()
-        }
+        index = self.state.row_index
+        return dict(zip(index.categories, self.state.amounts[index.first_rows()].tolist()))
 
     def verify_changes(self) -> bool:
         """Verify that the current budget differs from the original."""
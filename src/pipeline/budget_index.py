@@ -0,0 +1,64 @@
+import numpy as np
+from typing import Dict, Hashable, Iterable
+
+class CategoryRowIndex:
+    """Maps each key of a budget column to the positions of its rows.
+
+    Keys are usually subcategory names, but any hashable works, e.g.
+    ``(subcategory, year)`` tuples for the multi-key variant. Rows are stored
+    CSR-style: the rows of key code ``c`` are ``rows[offsets[c]:offsets[c + 1]]``,
+    in budget order, so a lookup is one dict probe plus a slice.
+    """
+
+    def __init__(self, keys: Iterable[Hashable]):
+        """Build the index from the key of every row."""
+        self.codes: Dict[Hashable, int] = {}
+        codes = self.codes
+        row_codes = np.fromiter((codes.setdefault(key, len(codes)) for key in keys), dtype=np.int64)
+        self.categories = list(codes)
+        self.rows = np.argsort(row_codes, kind='stable')
+        counts = np.bincount(row_codes, minlength=len(self.categories))
+        self.offsets = np.concatenate(([0], np.cumsum(counts)))
+
+    def __contains__(self, category: Hashable) -> bool:
+        return category in self.codes
+
+    def __len__(self) -> int:
+        return len(self.categories)
+
+    def rows_for(self, category: Hashable) -> np.ndarray:
+        """Get the row positions of a key (empty if unknown)."""
+        code = self.codes.get(category)
+        if code is None:
+            return self.rows[:0]
+        return self.rows[self.offsets[code]:self.offsets[code + 1]]
+
+    def first_rows(self) -> np.ndarray:
+        """Get the first row position of every key, in code order."""
+        return self.rows[self.offsets[:-1]]
+
+    def encode(self, categories: Iterable[Hashable]) -> np.ndarray:
+        """Translate keys to codes, using -1 for unknown keys."""
+        codes = self.codes
+        return np.fromiter((codes.get(category, -1) for category in categories), dtype=np.int64)
+
+    def expand(self, codes: np.ndarray):
+        """
+        Expand key codes into (item, row) pairs.
+
+        Args:
+            codes: Key code per item; negative codes are skipped
+
+        Returns:
+            Tuple of the item index and the row position of every pair
+        """
+        items = np.flatnonzero(codes >= 0)
+        valid = codes[items]
+        starts = self.offsets[valid]
+        lengths = self.offsets[valid + 1] - starts
+        total = int(lengths.sum())
+        item_index = np.repeat(items, lengths)
+        # Position of each pair inside its item's run of rows
+        run_starts = np.repeat(np.cumsum(lengths) - lengths, lengths)
+        positions = np.repeat(starts, lengths) + (np.arange(total) - run_starts)
+        return item_index, self.rows[positions]
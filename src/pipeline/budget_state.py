@@ -0,0 +1,200 @@
+import numpy as np
+import pandas as pd
+from typing import Dict, Optional, Tuple, Union
+from ..models.data_models import BudgetSnapshot, BudgetEntry
+from .budget_index import CategoryRowIndex
+
+DEFAULT_CHUNK_SIZE = 4096
+
+def _read_only(array: np.ndarray) -> np.ndarray:
+    array.setflags(write=False)
+    return array
+
+class BudgetState:
+    """Immutable, array-backed version of a budget.
+
+    Amounts are held in fixed-size read-only chunks. Updating amounts returns
+    a new state that copies only the chunks containing changed rows and
+    shares everything else, so versions are cheap to keep around and a
+    reader holding a state never observes a later change.
+    """
+
+    def __init__(self,
+                 subcategories: np.ndarray,
+                 years: np.ndarray,
+                 amount_types: np.ndarray,
+                 chunks: Tuple[np.ndarray, ...],
+                 chunk_size: int = DEFAULT_CHUNK_SIZE,
+                 indexes: Optional[Dict[str, CategoryRowIndex]] = None):
+        """Wrap existing column arrays; use :meth:`from_frame` to build a state from data."""
+        self.subcategories = subcategories
+        self.years = years
+        self.amount_types = amount_types
+        self.chunks = chunks
+        self.chunk_size = chunk_size
+        self._amounts: Optional[np.ndarray] = None
+        # Row indexes only depend on the key columns, which every version
+        # derived from this one shares, so the dict itself is shared too
+        self._indexes = indexes if indexes is not None else {}
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame, chunk_size: int = DEFAULT_CHUNK_SIZE) -> 'BudgetState':
+        """Build a state from a budget DataFrame with the standard column names."""
+        if df.empty or 'subcategory' not in df.columns:
+            return cls.from_columns([], [], [], [], chunk_size)
+        return cls.from_columns(
+            df['subcategory'].astype(str).to_numpy(dtype=object),
+            df['year'].to_numpy(),
+            df['amount_type'].astype(str).to_numpy(dtype=object),
+            df['amount'].to_numpy(dtype=float),
+            chunk_size
+        )
+
+    @classmethod
+    def from_columns(cls,
+                     subcategories,
+                     years,
+                     amount_types,
+                     amounts,
+                     chunk_size: int = DEFAULT_CHUNK_SIZE,
+                     copy: bool = True) -> 'BudgetState':
+        """Build a state from column values.
+
+        With ``copy`` unset, the amount chunks are read-only views of
+        ``amounts`` (e.g. a memory-mapped column), which are only copied once
+        their rows are updated.
+        """
+        amounts = np.asarray(amounts, dtype=float)
+        chunks = tuple(
+            _read_only(amounts[start:start + chunk_size].copy() if copy else amounts[start:start + chunk_size])
+            for start in range(0, len(amounts), chunk_size)
+        )
+        return cls(
+            subcategories=_read_only(np.array(subcategories, dtype=object)),
+            years=_read_only(np.array(years)),
+            amount_types=_read_only(np.array(amount_types, dtype=object)),
+            chunks=chunks,
+            chunk_size=chunk_size
+        )
+
+    @classmethod
+    def from_snapshot(cls, snapshot: BudgetSnapshot, chunk_size: int = DEFAULT_CHUNK_SIZE) -> 'BudgetState':
+        """Build a state from a legacy pydantic snapshot."""
+        entries = snapshot.subcategory
+        return cls.from_columns(
+            [entry.subcategory for entry in entries],
+            [entry.year for entry in entries],
+            [entry.amount_type for entry in entries],
+            [entry.amount for entry in entries],
+            chunk_size
+        )
+
+    def __len__(self) -> int:
+        return len(self.subcategories)
+
+    @property
+    def empty(self) -> bool:
+        return len(self.subcategories) == 0
+
+    @property
+    def row_index(self) -> CategoryRowIndex:
+        """Index from subcategory to row positions, built on first use."""
+        index = self._indexes.get('subcategory')
+        if index is None:
+            index = CategoryRowIndex(self.subcategories.tolist())
+            self._indexes['subcategory'] = index
+        return index
+
+    @property
+    def year_index(self) -> CategoryRowIndex:
+        """Index from (subcategory, year) to row positions, built on first use."""
+        index = self._indexes.get('subcategory_year')
+        if index is None:
+            index = CategoryRowIndex(zip(self.subcategories.tolist(), self.years.tolist()))
+            self._indexes['subcategory_year'] = index
+        return index
+
+    def find_rows(self, subcategory: str, year: Optional[int] = None) -> np.ndarray:
+        """Get the row positions of a subcategory, optionally restricted to one year."""
+        if year is None:
+            return self.row_index.rows_for(subcategory)
+        return self.year_index.rows_for((subcategory, year))
+
+    @property
+    def amounts(self) -> np.ndarray:
+        """All amounts as one read-only array (built once per state)."""
+        if self._amounts is None:
+            if self.chunks:
+                amounts = np.concatenate(self.chunks)
+            else:
+                amounts = np.empty(0)
+            self._amounts = _read_only(amounts)
+        return self._amounts
+
+    def amounts_at(self, rows: np.ndarray) -> np.ndarray:
+        """Get the amounts of some rows without assembling the whole column."""
+        if self._amounts is not None:
+            return self._amounts[rows]
+        rows = np.asarray(rows, dtype=np.int64)
+        values = np.empty(rows.shape)
+        chunk_ids = rows // self.chunk_size
+        for chunk_id in np.unique(chunk_ids):
+            in_chunk = chunk_ids == chunk_id
+            values[in_chunk] = self.chunks[chunk_id][rows[in_chunk] - chunk_id * self.chunk_size]
+        return values
+
+    def with_amounts(self, rows: np.ndarray, values: Union[float, np.ndarray]) -> 'BudgetState':
+        """
+        Get a new state with the amounts of some rows replaced.
+
+        Args:
+            rows: Row positions to update
+            values: New amount per row, or one amount for all of them
+
+        Returns:
+            The new state; this state is left untouched
+        """
+        rows = np.asarray(rows, dtype=np.int64)
+        values = np.broadcast_to(np.asarray(values, dtype=float), rows.shape)
+        chunks = list(self.chunks)
+        chunk_ids = rows // self.chunk_size
+        for chunk_id in np.unique(chunk_ids):
+            in_chunk = chunk_ids == chunk_id
+            chunk = chunks[chunk_id].copy()
+            chunk[rows[in_chunk] - chunk_id * self.chunk_size] = values[in_chunk]
+            chunks[chunk_id] = _read_only(chunk)
+        return self._derive(tuple(chunks))
+
+    def _derive(self, chunks: Tuple[np.ndarray, ...]) -> 'BudgetState':
+        """Create a sibling version that shares every column except the given chunks."""
+        return BudgetState(
+            subcategories=self.subcategories,
+            years=self.years,
+            amount_types=self.amount_types,
+            chunks=chunks,
+            chunk_size=self.chunk_size,
+            indexes=self._indexes
+        )
+
+    def to_frame(self) -> pd.DataFrame:
+        """View the state as a budget DataFrame."""
+        return pd.DataFrame({
+            'subcategory': self.subcategories,
+            'amount': self.amounts,
+            'year': self.years,
+            'amount_type': self.amount_types
+        }, copy=False)
+
+    def to_snapshot(self) -> BudgetSnapshot:
+        """Export the state as a legacy pydantic snapshot."""
+        return BudgetSnapshot(subcategory=[
+            BudgetEntry(
+                subcategory=str(subcategory),
+                amount=float(amount),
+                year=int(year),
+                amount_type=str(amount_type)
+            )
+            for subcategory, amount, year, amount_type in zip(
+                self.subcategories, self.amounts.tolist(), self.years.tolist(), self.amount_types
+            )
+        ])
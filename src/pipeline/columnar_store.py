@@ -0,0 +1,256 @@
+import argparse
+import json
+import os
+import shutil
+import tempfile
+import numpy as np
+import pandas as pd
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+STORE_VERSION = 1
+MANIFEST_NAME = 'manifest.json'
+
+class ColumnarTable:
+    """A table loaded from the columnar store.
+
+    Numeric and date columns are (memory-mapped) NumPy arrays; text columns
+    are int32 codes into a per-column category list, with -1 for missing.
+    """
+
+    def __init__(self, columns: Dict[str, np.ndarray], categories: Dict[str, np.ndarray], rows: int):
+        self.columns = columns
+        self.categories = categories
+        self.rows = rows
+
+    def __len__(self) -> int:
+        return self.rows
+
+    def column(self, name: str) -> np.ndarray:
+        """Get a column, decoding text columns to an object array."""
+        values = self.columns[name]
+        if name not in self.categories:
+            return values
+        categories = np.append(self.categories[name], None)
+        return categories[values]
+
+    def to_frame(self) -> pd.DataFrame:
+        """View the table as a DataFrame with categorical text columns."""
+        data = {}
+        for name, values in self.columns.items():
+            if name in self.categories:
+                data[name] = pd.Categorical.from_codes(values, categories=self.categories[name])
+            else:
+                data[name] = values
+        return pd.DataFrame(data, copy=False)
+
+class ColumnarStore:
+    """Directory of typed, memory-mappable copies of the pipeline's CSV inputs.
+
+    Each table lives in ``<store_dir>/<name>/`` as one ``.npy`` file per
+    column plus a manifest recording the source file's size and mtime, so a
+    table is rebuilt automatically when its CSV changes. Loading maps the
+    files read-only, which makes startup cheap and lets worker processes
+    share the same pages.
+    """
+
+    def __init__(self, store_dir: str):
+        """Initialize with the store directory, creating it if needed."""
+        self.store_dir = Path(store_dir)
+        self.store_dir.mkdir(parents=True, exist_ok=True)
+
+    def table_dir(self, name: str) -> Path:
+        return self.store_dir / name
+
+    def read_manifest(self, name: str) -> Optional[Dict]:
+        """Get a table's manifest, or None if the table has not been ingested."""
+        try:
+            with open(self.table_dir(name) / MANIFEST_NAME, 'r') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def is_fresh(self,
+                 name: str,
+                 source_path: str,
+                 date_columns: Iterable[str] = (),
+                 float_columns: Iterable[str] = ()) -> bool:
+        """Check whether a table matches its source CSV and ingestion options."""
+        manifest = self.read_manifest(name)
+        if manifest is None:
+            return False
+        try:
+            stat = os.stat(source_path)
+        except OSError:
+            # Without the source the stored copy is the best data available
+            return True
+        return (
+            manifest.get('version') == STORE_VERSION
+            and manifest.get('source_mtime_ns') == stat.st_mtime_ns
+            and manifest.get('source_size') == stat.st_size
+            and manifest.get('date_columns') == sorted(date_columns)
+            and manifest.get('float_columns') == sorted(float_columns)
+        )
+
+    def ingest_csv(self,
+                   name: str,
+                   source_path: str,
+                   date_columns: Iterable[str] = (),
+                   float_columns: Iterable[str] = ()) -> Dict:
+        """
+        Convert a CSV file into a columnar table.
+
+        Args:
+            name: Table name
+            source_path: Path of the CSV file
+            date_columns: Columns to parse as dates
+            float_columns: Numeric columns to store as float64, so consumers
+                that compute in floats can map them without converting
+
+        Returns:
+            The manifest of the new table
+        """
+        date_columns = sorted(date_columns)
+        float_columns = sorted(float_columns)
+        stat = os.stat(source_path)
+        df = pd.read_csv(source_path, parse_dates=date_columns or False)
+
+        staging = Path(tempfile.mkdtemp(prefix=f'.{name}-', dir=self.store_dir))
+        try:
+            columns: List[Dict] = []
+            for position, column in enumerate(df.columns):
+                series = df[column]
+                filename = f'{position:03d}.npy'
+                entry = {'name': column, 'file': filename}
+                if column in date_columns:
+                    values = pd.to_datetime(series).to_numpy(dtype='datetime64[ns]')
+                    entry['kind'] = 'datetime'
+                elif pd.api.types.is_numeric_dtype(series) or pd.api.types.is_bool_dtype(series):
+                    values = series.to_numpy(dtype=float if column in float_columns else None)
+                    entry['kind'] = 'numeric'
+                else:
+                    codes, categories = pd.factorize(series.astype(object), sort=False)
+                    values = codes.astype(np.int32)
+                    entry['kind'] = 'categorical'
+                    entry['categories'] = [str(category) for category in categories]
+                entry['dtype'] = str(values.dtype)
+                np.save(staging / filename, values, allow_pickle=False)
+                columns.append(entry)
+
+            manifest = {
+                'version': STORE_VERSION,
+                'source': os.path.abspath(source_path),
+                'source_mtime_ns': stat.st_mtime_ns,
+                'source_size': stat.st_size,
+                'date_columns': date_columns,
+                'float_columns': float_columns,
+                'rows': len(df),
+                'columns': columns
+            }
+            # The manifest is written last, so a table with a manifest is complete
+            with open(staging / MANIFEST_NAME, 'w') as f:
+                json.dump(manifest, f, indent=2)
+
+            self._publish(name, staging)
+        finally:
+            if staging.exists():
+                shutil.rmtree(staging, ignore_errors=True)
+        return manifest
+
+    def _publish(self, name: str, staging: Path):
+        """Swap a fully written staging directory in as the table."""
+        target = self.table_dir(name)
+        retired = None
+        if target.exists():
+            retired = Path(tempfile.mkdtemp(prefix=f'.{name}-old-', dir=self.store_dir))
+            os.rename(target, retired / name)
+        try:
+            os.rename(staging, target)
+        except OSError:
+            # Another process published the table first; keep theirs
+            pass
+        if retired is not None:
+            # Open memory maps keep the old files alive until they are closed
+            shutil.rmtree(retired, ignore_errors=True)
+
+    def ensure_csv(self,
+                   name: str,
+                   source_path: str,
+                   date_columns: Iterable[str] = (),
+                   float_columns: Iterable[str] = ()) -> Dict:
+        """Ingest a CSV file unless the stored table is already up to date."""
+        if not self.is_fresh(name, source_path, date_columns, float_columns):
+            print(f"Ingesting {source_path} into columnar table '{name}'")
+            return self.ingest_csv(name, source_path, date_columns, float_columns)
+        return self.read_manifest(name)
+
+    def load(self, name: str, mmap: bool = True) -> ColumnarTable:
+        """
+        Load a table.
+
+        Args:
+            name: Table name
+            mmap: Memory-map the column files read-only instead of reading them
+
+        Returns:
+            The loaded table
+        """
+        manifest = self.read_manifest(name)
+        if manifest is None:
+            raise FileNotFoundError(f"Columnar table '{name}' not found in {self.store_dir}")
+        table_dir = self.table_dir(name)
+        columns = {}
+        categories = {}
+        for entry in manifest['columns']:
+            columns[entry['name']] = np.load(
+                table_dir / entry['file'],
+                mmap_mode='r' if mmap else None,
+                allow_pickle=False
+            )
+            if entry['kind'] == 'categorical':
+                categories[entry['name']] = np.array(entry['categories'], dtype=object)
+        return ColumnarTable(columns, categories, manifest['rows'])
+
+    def load_csv(self,
+                 name: str,
+                 source_path: str,
+                 date_columns: Iterable[str] = (),
+                 float_columns: Iterable[str] = (),
+                 mmap: bool = True) -> ColumnarTable:
+        """Load a table, ingesting (or refreshing) it from its CSV first if needed."""
+        self.ensure_csv(name, source_path, date_columns, float_columns)
+        return self.load(name, mmap=mmap)
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Convert pipeline CSV inputs into the columnar store")
+    parser.add_argument("store_dir", help="Directory of the columnar store")
+    parser.add_argument("csv_paths", nargs='+', help="CSV files to ingest; each becomes a table named after the file")
+    parser.add_argument(
+        "--date-column",
+        action="append",
+        default=[],
+        help="Column to parse as dates, where present (repeatable; default: StartDate)"
+    )
+    parser.add_argument(
+        "--float-column",
+        action="append",
+        default=[],
+        help="Numeric column to store as float64, where present (repeatable; default: Amount)"
+    )
+    parser.add_argument("--force", action="store_true", help="Re-ingest even if the stored tables are up to date")
+    args = parser.parse_args(argv)
+
+    store = ColumnarStore(args.store_dir)
+    for csv_path in args.csv_paths:
+        name = Path(csv_path).stem
+        header = pd.read_csv(csv_path, nrows=0).columns
+        date_columns = [column for column in args.date_column or ['StartDate'] if column in header]
+        float_columns = [column for column in args.float_column or ['Amount'] if column in header]
+        if args.force:
+            manifest = store.ingest_csv(name, csv_path, date_columns, float_columns)
+        else:
+            manifest = store.ensure_csv(name, csv_path, date_columns, float_columns)
+        print(f"{name}: {manifest['rows']} rows, {len(manifest['columns'])} columns")
+
+if __name__ == "__main__":
+    main()
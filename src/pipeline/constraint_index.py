@@ -0,0 +1,81 @@
+from typing import Dict, FrozenSet, List, Optional
+from ..models.data_models import FundRule, FundingConstraint
+
+class FundingConstraintIndex:
+    """Hashed view of the funding constraints for O(1) validation lookups.
+
+    Keeps which fund owns each category, so a scenario's ``source_fund`` can
+    be checked, alongside the flattened category and locked-category sets.
+    """
+
+    def __init__(self, funds: Dict[str, FundRule]):
+        """Compile the index from per-fund rules."""
+        self.funds = funds
+        self.fund_categories: Dict[str, FrozenSet[str]] = {
+            name: frozenset(rule.categories) for name, rule in funds.items()
+        }
+
+        category_funds: Dict[str, set] = {}
+        locked = set()
+        editable = set()
+        for name, rule in funds.items():
+            for category in rule.categories:
+                category_funds.setdefault(category, set()).add(name)
+            # If the fund is locked, all its categories are locked
+            if rule.locked:
+                locked.update(rule.categories)
+            elif rule.editable:
+                editable.update(rule.categories)
+
+        self.category_funds: Dict[str, FrozenSet[str]] = {
+            category: frozenset(names) for category, names in category_funds.items()
+        }
+        self.categories: FrozenSet[str] = frozenset(category_funds)
+        self.locked_categories: FrozenSet[str] = frozenset(locked)
+        self.editable_categories: FrozenSet[str] = frozenset(editable - locked)
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'FundingConstraintIndex':
+        """Build the index from the raw ``funding_constraints.json`` structure."""
+        funds = {}
+        for fund, details in data.items():
+            locked = bool(details.get('locked', False))
+            funds[fund] = FundRule(
+                fund=fund,
+                categories=details.get('categories', []),
+                locked=locked,
+                # Funds are editable unless locked or explicitly marked otherwise
+                editable=bool(details.get('editable', not locked)) and not locked,
+                note=details.get('note', '')
+            )
+        return cls(funds)
+
+    def funds_for(self, category: str) -> FrozenSet[str]:
+        """Get the funds that own a category."""
+        return self.category_funds.get(category, frozenset())
+
+    def fund_owns(self, fund: str, category: str) -> bool:
+        """Check whether ``fund`` may be spent on ``category``."""
+        return category in self.fund_categories.get(fund, ())
+
+    def is_locked(self, category: str, fund: Optional[str] = None) -> bool:
+        """Check whether a category is locked, optionally under a specific fund."""
+        if fund is not None and fund in self.funds:
+            return self.funds[fund].locked and self.fund_owns(fund, category)
+        return category in self.locked_categories
+
+    def is_editable(self, category: str, fund: str) -> bool:
+        """Check whether ``fund`` allows changes to ``category``."""
+        rule = self.funds.get(fund)
+        return rule is not None and rule.editable and category in self.fund_categories[fund]
+
+    def to_funding_constraint(self) -> FundingConstraint:
+        """Flatten the index into the legacy FundingConstraint model."""
+        notes: List[str] = [
+            f"{name}: {rule.note}" for name, rule in self.funds.items() if rule.note
+        ]
+        return FundingConstraint(
+            categories=sorted(self.categories),
+            locked_categories=sorted(self.locked_categories),
+            note="; ".join(notes)
+        )
@@ -1,105 +1,552 @@
+import io
+import os
 import pandas as pd
 import numpy as np
-from prophet import Prophet
-from typing import Dict, List
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 from ..models.data_models import ForecastResult, TimeSeriesEntry, BudgetDelta
+from .columnar_store import ColumnarStore
+from .deferral_engine import DeferralEngine
+from .fast_forecaster import FastForecaster
+from .model_store import ProphetModelStore
+
+BACKENDS = ('prophet', 'fast')
+
+DEFAULT_PROPHET_PARAMS = {
+    'yearly_seasonality': True,
+    'weekly_seasonality': False,
+    'daily_seasonality': False
+}
+
+def _fit_prophet(df: pd.DataFrame, params: Dict[str, Any], init: Optional[Dict[str, Any]] = None):
+    """Fit a Prophet model on a frame with ds and y columns, optionally warm-started."""
+    # Imported here because loading prophet (and Stan) is slow
+    from prophet import Prophet
+    if init is not None:
+        try:
+            return Prophet(**params).fit(df, init=init)
+        except Exception:
+            # The previous parameters no longer fit the model's shape (e.g.
+            # the number of changepoints grew with the history); fit cold
+            pass
+    model = Prophet(**params)
+    model.fit(df)
+    return model
+
+def _fit_prophet_serialized(category: str,
+                            df: pd.DataFrame,
+                            params: Dict[str, Any],
+                            init: Optional[Dict[str, Any]] = None) -> Tuple[str, str]:
+    """Fit a model in a worker process and return it as Prophet's JSON.
+
+    Fitted models are returned as JSON rather than pickled, which is the
+    serialization Prophet supports across processes and versions.
+    """
+    from prophet.serialize import model_to_json
+    return category, model_to_json(_fit_prophet(df, params, init))
+
+def _stan_init(model) -> Dict[str, Any]:
+    """Get a fitted model's parameters in the form Prophet.fit accepts as ``init``."""
+    init = {name: model.params[name][0][0] for name in ['k', 'm', 'sigma_obs']}
+    init.update({name: model.params[name][0] for name in ['delta', 'beta']})
+    return init
 
 class CostForecaster:
-    def __init__(self, timeseries_budget_path: str):
-        """Initialize with path to timeseries budget data."""
+    def __init__(self,
+                 timeseries_budget_path: str,
+                 store_dir: Optional[str] = None,
+                 max_workers: int = 1,
+                 prophet_params: Optional[Dict[str, Any]] = None,
+                 model_store_path: Optional[str] = None,
+                 backend: str = 'prophet',
+                 max_horizon: int = 24,
+                 timeseries_data: Optional[pd.DataFrame] = None):
+        """Initialize with path to timeseries budget data.
+
+        With ``store_dir`` set, the data is loaded memory-mapped from the
+        columnar store (ingesting the CSV there first if it changed).
+        ``max_workers`` above 1 fits Prophet models in that many worker
+        processes; ``prophet_params`` overrides the Prophet constructor
+        arguments. With ``model_store_path`` set, fitted models are kept in
+        that SQLite file and reused while a category's history is unchanged.
+        ``backend`` selects Prophet, or 'fast' for the vectorized
+        trend-plus-seasonality model of every category at once.
+        Forecasts are predicted once per model up to ``max_horizon`` months
+        (or further if asked) and later horizons are sliced from that path.
+        Passing ``timeseries_data`` uses that frame instead of loading the
+        path, e.g. for backtests on a truncated history.
+        """
+        if backend not in BACKENDS:
+            raise ValueError(f"Backend must be one of {BACKENDS}")
+        self.backend = backend
         self.timeseries_budget_path = timeseries_budget_path
-        self.timeseries_data = self._load_timeseries_data()
+        self.store_dir = store_dir
+        self.max_workers = max(1, int(max_workers))
+        self.prophet_params = dict(DEFAULT_PROPHET_PARAMS, **(prophet_params or {}))
+        self._in_memory = timeseries_data is not None
+        if self._in_memory:
+            self._source_offset = 0
+            self.timeseries_data = timeseries_data
+        else:
+            self.timeseries_data = self._load_timeseries_data()
+        self.category_stats = self._compute_category_stats(self.timeseries_data)
         self.models = {}
+        # Categories whose model failed to fit, with the error, so one bad
+        # series never blocks the others and is not refit on every call
+        self.fit_errors: Dict[str, str] = {}
+        self._deferral_engine = None
+        self._fast_forecaster = None
+        self.max_horizon = max(1, int(max_horizon))
+        # Predicted forecast, lower and upper paths per category, with the
+        # model they came from so replacing a model invalidates its paths
+        self._paths: Dict[str, Tuple[Any, np.ndarray]] = {}
+        # Parameters of replaced models, used to warm-start their refits
+        self._warm_starts: Dict[str, Dict[str, Any]] = {}
+        self.model_store = ProphetModelStore(model_store_path) if model_store_path else None
 
     def _load_timeseries_data(self) -> pd.DataFrame:
-        """Load timeseries budget data from CSV."""
+        """Load timeseries budget data from the columnar store or CSV.
+
+        Also records how many bytes of the CSV were read, so rows appended
+        to the file later can be ingested with :meth:`ingest_appended_rows`.
+        """
+        self._source_offset = 0
+        if self.store_dir:
+            try:
+                store = ColumnarStore(self.store_dir)
+                name = Path(self.timeseries_budget_path).stem
+                df = store.load_csv(
+                    name,
+                    self.timeseries_budget_path,
+                    date_columns=['StartDate'],
+                    float_columns=['Amount']
+                ).to_frame()
+                self._source_offset = store.read_manifest(name).get('source_size', 0)
+                return df
+            except Exception as e:
+                print(f"Error loading timeseries data from columnar store: {str(e)}")
         try:
-            return pd.read_csv(self.timeseries_budget_path)
+            with open(self.timeseries_budget_path, 'rb') as f:
+                content = f.read()
+            self._source_offset = len(content)
+            return pd.read_csv(io.BytesIO(content))
         except Exception as e:
             print(f"Error loading timeseries data: {str(e)}")
             return pd.DataFrame()
 
+    def ingest_appended_rows(self, refit: bool = True) -> List[str]:
+        """
+        Read the rows appended to the timeseries CSV since it was last read.
+
+        Only the new tail of the file is parsed; an incomplete last line is
+        left for the next call. If the file shrank it was rewritten, and it
+        is reloaded in full with every model refit.
+
+        Args:
+            refit: Refit the changed categories' Prophet models right away
+
+        Returns:
+            Categories that got new rows
+        """
+        if self._in_memory:
+            print("Timeseries data was passed in memory; use append_observations instead")
+            return []
+        try:
+            size = os.path.getsize(self.timeseries_budget_path)
+        except OSError as e:
+            print(f"Error reading timeseries data: {str(e)}")
+            return []
+
+        if size < self._source_offset or self.timeseries_data.empty:
+            previous = set(self.timeseries_data['Subcategory'].astype(str)) if not self.timeseries_data.empty else set()
+            self.timeseries_data = self._load_timeseries_data()
+            categories = set(self.timeseries_data['Subcategory'].astype(str)) if not self.timeseries_data.empty else set()
+            changed = sorted(previous | categories)
+            self._reset_categories(changed)
+            self.category_stats = self._compute_category_stats(self.timeseries_data)
+            if refit:
+                self._refit(categories)
+            return changed
+
+        with open(self.timeseries_budget_path, 'rb') as f:
+            f.seek(self._source_offset)
+            tail = f.read(size - self._source_offset)
+        complete = tail.rfind(b'\n') + 1
+        if not tail[:complete].strip():
+            return []
+
+        rows = pd.read_csv(io.BytesIO(tail[:complete]), header=None, names=list(self.timeseries_data.columns))
+        self._source_offset += complete
+        return self.append_observations(rows, refit=refit)
+
+    def append_observations(self, rows: pd.DataFrame, refit: bool = True) -> List[str]:
+        """
+        Add new timeseries rows and update only the categories they touch.
+
+        Statistics, memoized forecasts and models of the touched categories
+        are refreshed; their models are refit warm-started from the previous
+        parameters. Everything cached for other categories stays valid.
+
+        Args:
+            rows: Frame with StartDate, Subcategory and Amount columns
+            refit: Refit the changed categories' Prophet models right away
+
+        Returns:
+            Categories that got new rows
+        """
+        if rows.empty:
+            return []
+        rows = rows.copy()
+        rows['Subcategory'] = rows['Subcategory'].astype(str)
+        if not self.timeseries_data.empty and pd.api.types.is_datetime64_any_dtype(self.timeseries_data['StartDate']):
+            rows['StartDate'] = pd.to_datetime(rows['StartDate'])
+        self.timeseries_data = pd.concat([self.timeseries_data, rows], ignore_index=True)
+
+        changed = list(pd.unique(rows['Subcategory']))
+        updated = self._compute_category_stats(self.timeseries_data[self.timeseries_data['Subcategory'].isin(changed)])
+        self.category_stats = pd.concat([self.category_stats.drop(index=changed, errors='ignore'), updated])
+        self._reset_categories(changed)
+        if refit:
+            self._refit(changed)
+        return changed
+
+    def _refit(self, categories: Iterable[str]):
+        """Refit changed categories with Prophet; the fast backend rebuilds on next use."""
+        # _reset_categories already dropped the fast forecaster and the
+        # memoized paths, and the fast backend never needs Prophet models
+        if self.backend == 'prophet':
+            self.train_models(categories)
+
+    def _reset_categories(self, categories: Iterable[str]):
+        """Drop the models and memoized forecasts of categories whose data changed."""
+        for category in categories:
+            model = self.models.pop(category, None)
+            if model is not None:
+                try:
+                    self._warm_starts[category] = _stan_init(model)
+                except Exception:
+                    self._warm_starts.pop(category, None)
+            self.fit_errors.pop(category, None)
+            self._paths.pop(category, None)
+        # The monthly matrices cover every category and are rebuilt on next use
+        self._deferral_engine = None
+        self._fast_forecaster = None
+
+    @staticmethod
+    def _compute_category_stats(timeseries_data: pd.DataFrame) -> pd.DataFrame:
+        """
+        Aggregate the timeseries once into per-subcategory statistics.
+
+        Returns:
+            Frame indexed by subcategory with count, mean, std, last (the
+            latest amount) and trend (least-squares slope per month) columns
+        """
+        columns = ['count', 'mean', 'std', 'last', 'trend']
+        if timeseries_data.empty:
+            return pd.DataFrame(columns=columns, index=pd.Index([], name='Subcategory'), dtype=float)
+
+        dates = pd.to_datetime(timeseries_data['StartDate'])
+        x = (dates.dt.year * 12 + dates.dt.month).astype(float)
+        y = timeseries_data['Amount'].astype(float)
+        frame = pd.DataFrame({
+            'Subcategory': timeseries_data['Subcategory'],
+            'date': dates,
+            'x': x,
+            'y': y,
+            'xx': x * x,
+            'xy': x * y
+        })
+        grouped = frame.groupby('Subcategory', sort=False)
+        stats = grouped['y'].agg(['count', 'mean', 'std'])
+        stats['last'] = frame.sort_values('date', kind='stable').groupby('Subcategory', sort=False)['y'].last()
+
+        sums = grouped[['x', 'y', 'xx', 'xy']].sum()
+        n = stats['count']
+        denominator = n * sums['xx'] - sums['x'] ** 2
+        stats['trend'] = (n * sums['xy'] - sums['x'] * sums['y']) / denominator.where(denominator != 0)
+        stats['trend'] = stats['trend'].fillna(0.0)
+        return stats[columns]
+
     def prepare_data(self, category: str) -> pd.DataFrame:
         category_data = self.timeseries_data[self.timeseries_data['Subcategory'] == category].copy()
         category_data = category_data.rename(columns={'StartDate': 'ds', 'Amount': 'y'})
         return category_data
 
     def train_model(self, category: str) -> None:
-        if category not in self.models:
+        if category not in self.models and category not in self.fit_errors:
             df = self.prepare_data(category)
             if not df.empty:
-                model = Prophet(
-                    yearly_seasonality=True,
-                    weekly_seasonality=False,
-                    daily_seasonality=False
-                )
-                model.fit(df)
-                self.models[category] = model
+                df = df[['ds', 'y']]
+                key = self._load_stored_model(category, df)
+                if category in self.models:
+                    return
+                try:
+                    self.models[category] = _fit_prophet(df, self.prophet_params, self._warm_starts.pop(category, None))
+                except Exception as e:
+                    print(f"Error fitting model for {category}: {str(e)}")
+                    self.fit_errors[category] = str(e)
+                    return
+                if key is not None:
+                    self._store_model(key, self.models[category], category)
+
+    def _load_stored_model(self, category: str, df: pd.DataFrame) -> Optional[str]:
+        """
+        Load a category's model from the model store if it was fitted on the same data.
+
+        Returns:
+            The store key to save a newly fitted model under, or None without a store
+        """
+        if self.model_store is None:
+            return None
+        key = self.model_store.make_key(df, self.prophet_params)
+        model = self.model_store.get(key)
+        if model is not None:
+            self.models[category] = model
+        return key
+
+    def _store_model(self, key: str, model: Any, category: str):
+        """Save a fitted model; a failed write only costs the reuse, not the fit."""
+        try:
+            self.model_store.set(key, model, category)
+        except Exception as e:
+            print(f"Error storing model for {category}: {str(e)}")
+
+    def train_models(self,
+                     categories: Optional[Iterable[str]] = None,
+                     max_workers: Optional[int] = None) -> Dict[str, str]:
+        """
+        Fit the models of many categories, in parallel worker processes if configured.
+
+        Args:
+            categories: Categories to fit; defaults to every category in the data.
+                Categories that already have a model are skipped.
+            max_workers: Number of worker processes; defaults to the value
+                given to the constructor. 1 fits in the calling thread.
+
+        Returns:
+            Errors of the categories that failed to fit
+        """
+        if categories is None:
+            categories = self.timeseries_data['Subcategory'].unique() if not self.timeseries_data.empty else []
+        pending = [
+            category for category in categories
+            if category not in self.models and category not in self.fit_errors
+        ]
+        workers = max(1, int(max_workers if max_workers is not None else self.max_workers))
+
+        try:
+            from prophet.serialize import model_from_json
+        except ImportError:
+            # Fitting sequentially records the import error per category
+            workers = 1
+
+        if workers == 1 or len(pending) <= 1:
+            for category in pending:
+                self.train_model(category)
+            return {category: self.fit_errors[category] for category in pending if category in self.fit_errors}
+
+        errors = {}
+        frames = {}
+        keys = {}
+        for category in pending:
+            df = self.prepare_data(category)[['ds', 'y']]
+            if df.empty:
+                continue
+            # Only categories whose data changed since their stored fit go to the pool
+            keys[category] = self._load_stored_model(category, df)
+            if category not in self.models:
+                frames[category] = df
+        if not frames:
+            return errors
+
+        with ProcessPoolExecutor(max_workers=min(workers, len(frames))) as executor:
+            futures = {
+                executor.submit(
+                    _fit_prophet_serialized, category, df, self.prophet_params, self._warm_starts.pop(category, None)
+                ): category
+                for category, df in frames.items()
+            }
+            for future in as_completed(futures):
+                category = futures[future]
+                try:
+                    _, model_json = future.result()
+                    self.models[category] = model_from_json(model_json)
+                except Exception as e:
+                    # A failed fit (or a crashed worker) only affects its category
+                    print(f"Error fitting model for {category}: {str(e)}")
+                    errors[category] = str(e)
+                    continue
+                if keys[category] is not None:
+                    self._store_model(keys[category], model_json, category)
+        self.fit_errors.update(errors)
+        return errors
+
+    @property
+    def fast_forecaster(self) -> FastForecaster:
+        """Vectorized forecaster over this forecaster's timeseries, fitted on first use."""
+        if self._fast_forecaster is None:
+            self._fast_forecaster = FastForecaster(self.timeseries_data)
+        return self._fast_forecaster
 
     def forecast(self, category: str, periods: int = 12) -> Dict:
-        if category not in self.models:
-            self.train_model(category)
+        if self.backend == 'fast':
+            return self.fast_forecaster.forecast(category, periods)
 
-        if category not in self.models:  # If still not in models, no data available
+        paths = self._forecast_paths(category, max(periods, 1))
+        if paths is None:  # No data available
             return {
                 'subcategory': category,
                 'forecasted_amount': 0.0,
                 'confidence_interval': {'lower': 0.0, 'upper': 0.0}
             }
 
-        model = self.models[category]
-        future = model.make_future_dataframe(periods=periods, freq='M')
-        forecast = model.predict(future)
-
         # Get the last forecasted value and its confidence interval
-        last_forecast = forecast.iloc[-1]
-        
+        yhat, lower, upper = paths[:, -1].tolist()
         return {
             'subcategory': category,
-            'forecasted_amount': float(last_forecast['yhat']),
+            'forecasted_amount': yhat,
             'confidence_interval': {
-                'lower': float(last_forecast['yhat_lower']),
-                'upper': float(last_forecast['yhat_upper'])
+                'lower': lower,
+                'upper': upper
             }
         }
 
-    def forecast_all_categories(self, periods: int = 12) -> Dict[str, Dict]:
+    def forecast_all_categories(self, periods: int = 12, max_workers: Optional[int] = None) -> Dict[str, Dict]:
+        if self.backend == 'fast':
+            return self.fast_forecaster.forecast_all(periods)
+
         categories = self.timeseries_data['Subcategory'].unique()
         forecasts = {}
         
+        # Fit every missing model up front so the fits can run in parallel
+        self.train_models(categories, max_workers=max_workers)
         for category in categories:
             forecasts[category] = self.forecast(category, periods)
         
         return forecasts
 
-    def apply_deferral(self, category: str, defer_months: int) -> Dict:
-        """Apply a deferral to a category's forecast"""
-        if category not in self.models:
-            self.train_model(category)
+    @property
+    def deferral_engine(self) -> DeferralEngine:
+        """Deferral engine over this forecaster's timeseries, built on first use."""
+        if self._deferral_engine is None:
+            self._deferral_engine = DeferralEngine(self.timeseries_data)
+        return self._deferral_engine
 
-        if category not in self.models:  # If still not in models, no data available
+    def apply_deferral(self, category: str, defer_months: int, periods: int = 12) -> Dict:
+        """
+        Apply a deferral to a category's forecast.
+
+        ``forecasted_amount`` and ``confidence_interval`` keep their monthly
+        unit: the forecast for the month the deferral period ends. The
+        monthly forecast for the next ``periods`` months is also shifted by
+        ``defer_months``; spending shifted past the horizon leaves the window.
+
+        Returns:
+            Monthly forecast after the deferral, plus the spending left in the
+            window (``window_total`` and ``window_confidence_interval``) and
+            the deferred amount
+        """
+        month = max(int(defer_months), 1) - 1
+        paths = self._forecast_paths(category, max(periods, month + 1))
+        if paths is None:  # No data available
             return {
                 'subcategory': category,
                 'forecasted_amount': 0.0,
-                'confidence_interval': {'lower': 0.0, 'upper': 0.0}
+                'confidence_interval': {'lower': 0.0, 'upper': 0.0},
+                'window_total': 0.0,
+                'window_confidence_interval': {'lower': 0.0, 'upper': 0.0},
+                'deferred_amount': 0.0
             }
 
-        model = self.models[category]
-        future = model.make_future_dataframe(periods=defer_months, freq='M')
-        forecast = model.predict(future)
+        # Shift the forecast, lower and upper bound paths in one operation
+        window = paths[:, :periods]
+        shifted = self.deferral_engine.shift(window, np.full(len(window), defer_months))
+        in_window = shifted[:, :periods].sum(axis=1)
 
-        # Get the forecasted value after the deferral period
-        deferred_forecast = forecast.iloc[-1]
-        
         return {
             'subcategory': category,
-            'forecasted_amount': float(deferred_forecast['yhat']),
+            'forecasted_amount': float(paths[0, month]),
             'confidence_interval': {
-                'lower': float(deferred_forecast['yhat_lower']),
-                'upper': float(deferred_forecast['yhat_upper'])
-            }
+                'lower': float(paths[1, month]),
+                'upper': float(paths[2, month])
+            },
+            'window_total': float(in_window[0]),
+            'window_confidence_interval': {
+                'lower': float(in_window[1]),
+                'upper': float(in_window[2])
+            },
+            'deferred_amount': float(window[0].sum() - in_window[0])
         }
 
+    def forecast_paths(self, periods: int = 12, categories: Optional[Iterable[str]] = None) -> Dict[str, np.ndarray]:
+        """
+        Get the monthly forecast paths of several categories.
+
+        Args:
+            periods: Number of months after the history
+            categories: Categories to forecast; defaults to every category in the data
+
+        Returns:
+            Forecast, lower and upper paths (a 3 x periods matrix) per
+            category; categories without a model are left out
+        """
+        if categories is None:
+            categories = self.timeseries_data['Subcategory'].unique() if not self.timeseries_data.empty else []
+        categories = list(categories)
+        if self.backend == 'fast':
+            known = [category for category in categories if category in self.fast_forecaster.codes]
+            if not known:
+                return {}
+            yhat, lower, upper = self.fast_forecaster.forecast_paths(periods, known)
+            return {
+                category: np.vstack((yhat[position], lower[position], upper[position]))
+                for position, category in enumerate(known)
+            }
+
+        self.train_models(categories)
+        paths = {}
+        for category in categories:
+            path = self._forecast_paths(category, periods)
+            if path is not None:
+                paths[category] = path
+        return paths
+
+    def _forecast_paths(self, category: str, periods: int) -> Optional[np.ndarray]:
+        """Get a category's monthly forecast, lower and upper paths as a 3 x periods matrix, or None."""
+        if self.backend == 'fast':
+            if category not in self.fast_forecaster.codes:
+                return None
+            return np.vstack([path[0] for path in self.fast_forecaster.forecast_paths(periods, [category])])
+
+        if category not in self.models:
+            self.train_model(category)
+        if category not in self.models:
+            return None
+
+        model = self.models[category]
+        cached = self._paths.get(category)
+        if cached is None or cached[0] is not model or cached[1].shape[1] < periods:
+            # One predict call (including uncertainty sampling) serves every
+            # horizon up to max_horizon. The history is dated by month start,
+            # so month-start steps make step i the i-th month after it
+            future = model.make_future_dataframe(
+                periods=max(periods, self.max_horizon), freq='MS', include_history=False
+            )
+            forecast = model.predict(future)
+            paths = forecast[['yhat', 'yhat_lower', 'yhat_upper']].to_numpy(dtype=float).T
+            paths.setflags(write=False)
+            cached = (model, paths)
+            self._paths[category] = cached
+        return cached[1][:, :periods]
+
+    def invalidate_forecasts(self, category: Optional[str] = None):
+        """Drop the memoized forecast paths of one category, or of all categories."""
+        if category is None:
+            self._paths.clear()
+        else:
+            self._paths.pop(category, None)
+
     def generate_forecasts(self, budget_deltas: List[BudgetDelta]) -> Dict[str, Dict]:
         """
         Generate cost forecasts based on budget changes.
@@ -132,31 +579,30 @@ class CostForecaster:
         """Generate forecasts using timeseries data."""
         forecasts = {}
         
-        for delta in budget_deltas:
-            # Get historical data for the category
-            category_data = self.timeseries_data[
-                self.timeseries_data['Subcategory'] == delta.category
-            ]
-            
-            if category_data.empty:
+        # Look up every delta's category statistics at once
+        categories = [delta.category for delta in budget_deltas]
+        stats = self.category_stats.reindex(categories)
+        has_history = stats['count'].to_numpy() > 0
+        
+        # Apply the delta to the mean
+        forecasted = stats['mean'].to_numpy() + np.array([delta.delta for delta in budget_deltas], dtype=float)
+        margins = 2 * stats['std'].to_numpy()
+        lower = (forecasted - margins).tolist()
+        upper = (forecasted + margins).tolist()
+        forecasted = forecasted.tolist()
+        
+        for position, delta in enumerate(budget_deltas):
+            if not has_history[position]:
                 # Fall back to simple forecast if no historical data
                 forecasts[delta.category] = self._create_simple_forecast(delta)
                 continue
-                
-            # Calculate forecast using historical data
-            mean_amount = category_data['Amount'].mean()
-            std_amount = category_data['Amount'].std()
-            
-            # Apply the delta to the mean
-            forecasted_amount = mean_amount + delta.delta
             
-            # Create forecast result
             forecasts[delta.category] = {
                 'subcategory': delta.category,
-                'forecasted_amount': float(forecasted_amount),
+                'forecasted_amount': forecasted[position],
                 'confidence_interval': {
-                    'lower': float(forecasted_amount - 2 * std_amount),
-                    'upper': float(forecasted_amount + 2 * std_amount)
+                    'lower': lower[position],
+                    'upper': upper[position]
                 }
             }
             
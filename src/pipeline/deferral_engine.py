@@ -0,0 +1,172 @@
+import numpy as np
+import pandas as pd
+from typing import Dict, Iterable, List, Optional, Tuple
+from ..models.data_models import DeferralImpact
+
+# Districts run July-June fiscal years, named after the calendar year they end in
+FISCAL_YEAR_START_MONTH = 7
+
+def monthly_matrix(timeseries_data: pd.DataFrame) -> Tuple[List[str], np.ndarray, np.ndarray]:
+    """
+    Pivot a timeseries into a categories x months matrix of summed amounts.
+
+    Args:
+        timeseries_data: Frame with StartDate, Subcategory and Amount columns
+
+    Returns:
+        Categories in order of first appearance, the contiguous range of
+        months (datetime64[M]) and the matrix, with 0 for months without rows
+    """
+    if timeseries_data.empty:
+        return [], np.array([], dtype='datetime64[M]'), np.zeros((0, 0))
+
+    months = pd.to_datetime(timeseries_data['StartDate']).to_numpy().astype('datetime64[M]')
+    category_codes, categories = pd.factorize(timeseries_data['Subcategory'].astype(str), sort=False)
+    first_month = months.min()
+    month_positions = (months - first_month).astype(np.int64)
+
+    matrix = np.zeros((len(categories), month_positions.max() + 1))
+    np.add.at(matrix, (category_codes, month_positions), timeseries_data['Amount'].to_numpy(dtype=float))
+    return [str(category) for category in categories], first_month + np.arange(matrix.shape[1]), matrix
+
+class DeferralEngine:
+    """Shifts monthly cash flows later in time to model spending deferrals.
+
+    The timeseries is pivoted once into a categories x months matrix; a
+    deferral of every category at once is then a single scatter of that
+    matrix into a wider one.
+    """
+
+    def __init__(self, timeseries_data: pd.DataFrame, fiscal_year_start_month: int = FISCAL_YEAR_START_MONTH):
+        """
+        Initialize from timeseries data.
+
+        Args:
+            timeseries_data: Frame with StartDate, Subcategory and Amount columns
+            fiscal_year_start_month: First calendar month of the fiscal year
+        """
+        self.fiscal_year_start_month = fiscal_year_start_month
+        self.categories, self.months, self.matrix = monthly_matrix(timeseries_data)
+        self.codes: Dict[str, int] = {category: code for code, category in enumerate(self.categories)}
+
+    def shift(self,
+              matrix: np.ndarray,
+              defer_months: np.ndarray,
+              start_position: int = 0) -> np.ndarray:
+        """
+        Move each row's cash flows later by its own number of months.
+
+        Args:
+            matrix: Rows of monthly amounts
+            defer_months: Months to defer, one per row
+            start_position: Only flows at or after this column are deferred
+
+        Returns:
+            Matrix widened by the largest deferral, so nothing falls off the end
+        """
+        defer_months = np.asarray(defer_months, dtype=np.int64)
+        if np.any(defer_months < 0):
+            raise ValueError("Deferrals must be non-negative")
+        rows, columns = matrix.shape
+        width = columns + (int(defer_months.max()) if rows else 0)
+        shifted = np.zeros((rows, width))
+        offsets = np.where(np.arange(columns)[None, :] >= start_position, defer_months[:, None], 0)
+        # Deferred flows land at or after start + N, past every kept flow, so
+        # the targets within a row never collide
+        shifted[np.arange(rows)[:, None], np.arange(columns)[None, :] + offsets] = matrix
+        return shifted
+
+    def profile(self, category: str, months: int = 12) -> Optional[np.ndarray]:
+        """Get a category's most recent ``months`` of monthly amounts, or None if unknown."""
+        code = self.codes.get(category)
+        if code is None or len(self.months) < months:
+            return None
+        return self.matrix[code, -months:]
+
+    def retained_fractions(self, categories: Iterable[str], defer_months: Iterable[float]) -> np.ndarray:
+        """
+        Share of a year of spending that stays within the year after a deferral.
+
+        The last twelve months of each category's cash flows are used as its
+        spending profile; categories without history are assumed to spend
+        evenly, which gives ``1 - months / 12``.
+
+        Args:
+            categories: Category per deferral
+            defer_months: Months deferred per deferral
+
+        Returns:
+            Fraction between 0 and 1 per deferral
+        """
+        categories = list(categories)
+        defer_months = np.clip(np.asarray(list(defer_months), dtype=np.int64), 0, 12)
+        fractions = 1 - defer_months / 12
+        if len(self.months) < 12 or not categories:
+            return fractions
+
+        codes = np.array([self.codes.get(category, -1) for category in categories], dtype=np.int64)
+        known = codes >= 0
+        profiles = self.matrix[codes[known], -12:]
+        totals = profiles.sum(axis=1)
+        # Spending still inside the year is everything but the last N months
+        kept = np.concatenate((np.zeros((len(profiles), 1)), np.cumsum(profiles, axis=1)), axis=1)
+        kept_amounts = kept[np.arange(len(profiles)), 12 - defer_months[known]]
+        with np.errstate(invalid='ignore', divide='ignore'):
+            fractions[known] = np.where(totals > 0, kept_amounts / totals, fractions[known])
+        return fractions
+
+    def fiscal_year_labels(self, months: np.ndarray) -> np.ndarray:
+        """Fiscal year (named by the year it ends in) of each month."""
+        years = months.astype('datetime64[Y]').astype(np.int64) + 1970
+        month_numbers = (months - months.astype('datetime64[Y]')).astype(np.int64) + 1
+        return years + (month_numbers >= self.fiscal_year_start_month)
+
+    def defer(self, deferrals: Dict[str, int], start: Optional[str] = None) -> DeferralImpact:
+        """
+        Defer the cash flows of several categories and report the impact.
+
+        Args:
+            deferrals: Months to defer per category; unknown categories are skipped
+            start: Optional YYYY-MM-DD date; only flows from that month on are deferred
+
+        Returns:
+            Monthly and fiscal-year deltas, overall and per category
+        """
+        known = {category: int(months) for category, months in deferrals.items() if category in self.codes}
+        for category in deferrals:
+            if category not in known:
+                print(f"No timeseries data for category '{category}', skipping deferral")
+
+        defer_months = np.zeros(len(self.categories), dtype=np.int64)
+        for category, months in known.items():
+            defer_months[self.codes[category]] = months
+
+        start_position = 0
+        if start is not None:
+            start_position = int((np.datetime64(start, 'M') - self.months[0]).astype(np.int64)) if len(self.months) else 0
+
+        deferred = self.shift(self.matrix, defer_months, max(start_position, 0))
+        width = deferred.shape[1]
+        baseline = np.zeros_like(deferred)
+        baseline[:, :self.matrix.shape[1]] = self.matrix
+        delta = deferred - baseline
+
+        months = (self.months[0] + np.arange(width)) if len(self.months) else self.months
+        fiscal_years = self.fiscal_year_labels(months)
+        fiscal_year_values, fiscal_year_codes = np.unique(fiscal_years, return_inverse=True)
+        delta_by_fiscal_year = delta @ (fiscal_year_codes[:, None] == np.arange(len(fiscal_year_values))[None, :])
+
+        affected = [self.codes[category] for category in known]
+        return DeferralImpact(
+            deferrals=known,
+            months=[str(month) for month in months],
+            baseline_by_month=baseline.sum(axis=0).tolist(),
+            deferred_by_month=deferred.sum(axis=0).tolist(),
+            delta_by_month=delta.sum(axis=0).tolist(),
+            delta_by_category_month={self.categories[code]: delta[code].tolist() for code in affected},
+            fiscal_years=[f"FY{year}" for year in fiscal_year_values],
+            delta_by_fiscal_year=delta_by_fiscal_year.sum(axis=0).tolist(),
+            delta_by_category_fiscal_year={
+                self.categories[code]: delta_by_fiscal_year[code].tolist() for code in affected
+            }
+        )
@@ -0,0 +1,126 @@
+import numpy as np
+from typing import Dict, List, Optional
+from .budget_state import BudgetState
+
+class JournalEntry:
+    """One recorded change: the rows it touched with their old and new amounts."""
+
+    def __init__(self, rows: np.ndarray, old_amounts: np.ndarray, new_amounts: np.ndarray, label: str = ''):
+        self.rows = rows
+        self.old_amounts = old_amounts
+        self.new_amounts = new_amounts
+        self.label = label
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+class DeltaJournal:
+    """Append-only history of amount changes made to a budget.
+
+    Step ``k`` is the budget after the first ``k`` entries. The state at
+    every ``checkpoint_interval``-th step is kept (states are immutable, so
+    this only retains the chunks that changed), which bounds how many
+    entries have to be replayed to reach any step. Moving between steps
+    touches only the rows changed in between.
+    """
+
+    def __init__(self, base: BudgetState, checkpoint_interval: int = 64):
+        """Start a journal whose step 0 is ``base``."""
+        self.checkpoint_interval = max(1, int(checkpoint_interval))
+        self.entries: List[JournalEntry] = []
+        self.position = 0
+        self.checkpoints: Dict[int, BudgetState] = {0: base}
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    @property
+    def can_undo(self) -> bool:
+        return self.position > 0
+
+    @property
+    def can_redo(self) -> bool:
+        return self.position < len(self.entries)
+
+    @property
+    def labels(self) -> List[str]:
+        return [entry.label for entry in self.entries]
+
+    def record(self,
+               rows: np.ndarray,
+               old_amounts: np.ndarray,
+               new_amounts: np.ndarray,
+               state: BudgetState,
+               label: str = ''):
+        """
+        Append a change made at the current step, discarding any redo history.
+
+        Args:
+            rows: Row positions that changed
+            old_amounts: Amounts of those rows before the change
+            new_amounts: Amounts of those rows after the change
+            state: The budget state after the change
+            label: Optional description, e.g. the scenario ID
+        """
+        if self.position < len(self.entries):
+            del self.entries[self.position:]
+            for step in [step for step in self.checkpoints if step > self.position]:
+                del self.checkpoints[step]
+        self.entries.append(JournalEntry(rows, old_amounts, new_amounts, label))
+        self.position += 1
+        if self.position % self.checkpoint_interval == 0:
+            self.checkpoints[self.position] = state
+
+    def undo(self, state: BudgetState) -> Optional[BudgetState]:
+        """Get the state one step back from ``state`` (the current step), or None."""
+        if not self.can_undo:
+            return None
+        entry = self.entries[self.position - 1]
+        self.position -= 1
+        return state.with_amounts(entry.rows, entry.old_amounts)
+
+    def redo(self, state: BudgetState) -> Optional[BudgetState]:
+        """Get the state one step forward from ``state`` (the current step), or None."""
+        if not self.can_redo:
+            return None
+        entry = self.entries[self.position]
+        self.position += 1
+        return state.with_amounts(entry.rows, entry.new_amounts)
+
+    def state_at(self, step: int, current: BudgetState) -> BudgetState:
+        """
+        Reconstruct the budget after ``step`` entries.
+
+        Args:
+            step: Step to reconstruct, from 0 to ``len(self)``
+            current: The state at the current step
+
+        Returns:
+            The reconstructed state; the journal position is unchanged
+        """
+        if step < 0 or step > len(self.entries):
+            raise IndexError(f"Step {step} is outside the journal (0-{len(self.entries)})")
+
+        # Replay from whichever known state is closest to the target step
+        known = dict(self.checkpoints)
+        known[self.position] = current
+        start = min(known, key=lambda known_step: abs(known_step - step))
+        state = known[start]
+        if start == step:
+            return state
+
+        if start < step:
+            entries = self.entries[start:step]
+            rows = [entry.rows for entry in entries]
+            values = [entry.new_amounts for entry in entries]
+        else:
+            entries = self.entries[step:start][::-1]
+            rows = [entry.rows for entry in entries]
+            values = [entry.old_amounts for entry in entries]
+
+        # Collapse the replayed entries so each row is written once, keeping
+        # the value of the entry applied last
+        rows = np.concatenate(rows)[::-1]
+        values = np.concatenate(values)[::-1]
+        rows, last = np.unique(rows, return_index=True)
+        return state.with_amounts(rows, values[last])
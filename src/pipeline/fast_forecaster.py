@@ -0,0 +1,121 @@
+import numpy as np
+import pandas as pd
+from statistics import NormalDist
+from typing import Dict, List, Optional, Tuple
+from .deferral_engine import monthly_matrix
+
+# Matches Prophet's default uncertainty interval width
+DEFAULT_INTERVAL_WIDTH = 0.8
+
+class FastForecaster:
+    """Linear trend plus month-of-year seasonality, fitted for every category at once.
+
+    The timeseries is pivoted into a categories x months matrix and each row
+    is fitted by least squares against the same design matrix (intercept,
+    trend and eleven month dummies), so fitting and forecasting all
+    categories is a handful of batched array operations. Months before a
+    category's first observation are left out of its fit.
+    """
+
+    def __init__(self, timeseries_data: pd.DataFrame, interval_width: float = DEFAULT_INTERVAL_WIDTH):
+        """
+        Fit the models of every category in the timeseries.
+
+        Args:
+            timeseries_data: Frame with StartDate, Subcategory and Amount columns
+            interval_width: Probability mass covered by the forecast intervals
+        """
+        self.interval_width = interval_width
+        self.categories, self.months, self.matrix = monthly_matrix(timeseries_data)
+        self.codes: Dict[str, int] = {category: code for code, category in enumerate(self.categories)}
+        self.coefficients, self.sigma, self.residuals = self._fit()
+
+    def _design(self, positions: np.ndarray) -> np.ndarray:
+        """Design matrix rows for month positions counted from the first month."""
+        month_numbers = (self.months[0] + positions).astype('datetime64[M]').astype(np.int64) % 12
+        # January is the baseline month, absorbed by the intercept
+        dummies = month_numbers[:, None] == np.arange(1, 12)[None, :]
+        return np.column_stack((np.ones(len(positions)), positions.astype(float), dummies.astype(float)))
+
+    def _fit(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Fit every row by weighted least squares.
+
+        Returns:
+            Coefficients, residual std per row, and the residual matrix
+            (0 for the months left out of a row's fit)
+        """
+        rows, columns = self.matrix.shape
+        design = self._design(np.arange(columns))
+        if rows == 0:
+            return np.zeros((0, design.shape[1])), np.zeros(0), np.zeros((0, columns))
+
+        # Weight 0 for the months before each category's first nonzero month
+        started = np.cumsum(self.matrix != 0, axis=1) > 0
+        weights = started.astype(float)
+
+        gram = np.einsum('rt,tk,tl->rkl', weights, design, design)
+        moments = np.einsum('rt,tk,rt->rk', weights, design, self.matrix)
+        # Pseudo-inverse, so short histories (fewer months than parameters)
+        # still get the minimum-norm fit instead of failing
+        coefficients = np.einsum('rkl,rl->rk', np.linalg.pinv(gram), moments)
+
+        residuals = (self.matrix - coefficients @ design.T) * weights
+        observed = weights.sum(axis=1)
+        degrees = np.maximum(observed - design.shape[1], 1)
+        sigma = np.sqrt((residuals ** 2).sum(axis=1) / degrees)
+        return coefficients, sigma, residuals
+
+    def forecast_paths(self, periods: int = 12, categories: Optional[List[str]] = None) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Forecast the months after the history.
+
+        Args:
+            periods: Number of months to forecast
+            categories: Categories to forecast; defaults to all, in fit order.
+                Every category must be known.
+
+        Returns:
+            Forecast, lower and upper bound matrices of shape categories x periods
+        """
+        codes = np.arange(len(self.categories)) if categories is None else np.array(
+            [self.codes[category] for category in categories], dtype=np.int64
+        )
+        positions = len(self.months) + np.arange(periods)
+        yhat = self.coefficients[codes] @ self._design(positions).T
+        margin = NormalDist().inv_cdf(0.5 + self.interval_width / 2) * self.sigma[codes]
+        return yhat, yhat - margin[:, None], yhat + margin[:, None]
+
+    def forecast(self, category: str, periods: int = 12) -> Dict:
+        """Forecast one category ``periods`` months ahead, like CostForecaster.forecast."""
+        return self.forecast_all(periods, [category])[category]
+
+    def forecast_all(self, periods: int = 12, categories: Optional[List[str]] = None) -> Dict[str, Dict]:
+        """
+        Forecast several categories ``periods`` months ahead in one batch.
+
+        Returns:
+            Forecast per category; categories without history forecast 0
+        """
+        categories = self.categories if categories is None else categories
+        forecasts = {
+            category: {
+                'subcategory': category,
+                'forecasted_amount': 0.0,
+                'confidence_interval': {'lower': 0.0, 'upper': 0.0}
+            }
+            for category in categories
+        }
+        known = [category for category in categories if category in self.codes]
+        if not known or periods < 1:
+            return forecasts
+
+        yhat, lower, upper = self.forecast_paths(periods, known)
+        for category, forecast, low, high in zip(
+            known, yhat[:, -1].tolist(), lower[:, -1].tolist(), upper[:, -1].tolist()
+        ):
+            forecasts[category] = {
+                'subcategory': category,
+                'forecasted_amount': forecast,
+                'confidence_interval': {'lower': low, 'upper': high}
+            }
+        return forecasts
@@ -0,0 +1,244 @@
+import cProfile
+import io
+import json
+import pstats
+import threading
+import time
+import tracemalloc
+from collections import deque
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+from ..models.data_models import StageTiming, LLMCallRecord
+
+class PipelineMetrics:
+    """Collects per-stage resource usage and per-call LLM metrics.
+
+    Wall time uses ``time.perf_counter`` and CPU time uses ``time.thread_time``
+    of the thread running the stage, so stages that run concurrently are
+    still attributed correctly. Allocations are only recorded while
+    ``tracemalloc`` is tracing, because tracing slows the pipeline down, and
+    only for stages that did not overlap another stage: tracemalloc's
+    counters are process-wide, so concurrent stages would see (and reset)
+    each other's allocations.
+    """
+
+    def __init__(self, max_records: int = 10000):
+        """Keep at most ``max_records`` raw records of each kind; totals cover everything."""
+        self.max_records = max_records
+        self.stage_timings: Deque[StageTiming] = deque(maxlen=max_records)
+        self.llm_calls: Deque[LLMCallRecord] = deque(maxlen=max_records)
+        self._stage_totals: Dict[str, Dict] = {}
+        self._agent_totals: Dict[str, Dict] = {}
+        self._lock = threading.Lock()
+        # Overlap flags of the stages currently running, keyed by id()
+        self._active_stages: Dict[int, List[bool]] = {}
+
+    @contextmanager
+    def stage(self, scenario_id: str, stage: str):
+        """Record wall time, CPU time and allocations of the enclosed block."""
+        tracing = tracemalloc.is_tracing()
+        overlapped = [False]
+        with self._lock:
+            if self._active_stages:
+                overlapped[0] = True
+                for flag in self._active_stages.values():
+                    flag[0] = True
+            self._active_stages[id(overlapped)] = overlapped
+            if tracing and not overlapped[0]:
+                start_memory, _ = tracemalloc.get_traced_memory()
+                tracemalloc.reset_peak()
+        started_at = datetime.utcnow()
+        start_cpu = time.thread_time()
+        start_wall = time.perf_counter()
+        try:
+            yield
+        finally:
+            timing = StageTiming(
+                scenario_id=scenario_id,
+                stage=stage,
+                started_at=started_at,
+                wall_seconds=time.perf_counter() - start_wall,
+                cpu_seconds=time.thread_time() - start_cpu
+            )
+            with self._lock:
+                if tracing and not overlapped[0]:
+                    end_memory, peak_memory = tracemalloc.get_traced_memory()
+                    timing.allocated_bytes = end_memory - start_memory
+                    timing.peak_bytes = peak_memory - start_memory
+                del self._active_stages[id(overlapped)]
+                self.stage_timings.append(timing)
+                self._add_stage_timing(timing)
+
+    def timed(self, scenario_id: str, stage: str, func: Callable, *args, **kwargs) -> Any:
+        """Call ``func`` inside :meth:`stage`; handy for executor submissions."""
+        with self.stage(scenario_id, stage):
+            return func(*args, **kwargs)
+
+    def record_llm_call(self,
+                        agent: str,
+                        latency_seconds: float,
+                        cached: bool,
+                        usage: Any = None):
+        """Record one agent call, reading token counts from crewAI usage data if present."""
+        record = LLMCallRecord(agent=agent, latency_seconds=latency_seconds, cached=cached)
+        if usage is not None:
+            for field in ('prompt_tokens', 'completion_tokens', 'total_tokens'):
+                value = usage.get(field) if isinstance(usage, dict) else getattr(usage, field, None)
+                if value is not None:
+                    setattr(record, field, int(value))
+        with self._lock:
+            self.llm_calls.append(record)
+            self._add_llm_call(record)
+
+    def reset(self):
+        """Forget everything recorded so far."""
+        with self._lock:
+            self.stage_timings.clear()
+            self.llm_calls.clear()
+            self._stage_totals = {}
+            self._agent_totals = {}
+
+    def summary(self) -> Dict[str, Dict]:
+        """Aggregate the recorded metrics per stage and per agent."""
+        with self._lock:
+            stages = {name: dict(entry) for name, entry in self._stage_totals.items()}
+            agents = {name: dict(entry) for name, entry in self._agent_totals.items()}
+        for entry in stages.values():
+            entry['wall_seconds_mean'] = entry['wall_seconds_total'] / entry['count']
+        return {'stages': stages, 'llm': agents}
+
+    def _add_stage_timing(self, timing: StageTiming):
+        """Fold a stage timing into the running totals. Caller must hold the lock."""
+        entry = self._stage_totals.setdefault(timing.stage, {
+            'count': 0,
+            'wall_seconds_total': 0.0,
+            'wall_seconds_max': 0.0,
+            'cpu_seconds_total': 0.0,
+            'allocated_bytes_total': 0,
+            'peak_bytes_max': 0
+        })
+        entry['count'] += 1
+        entry['wall_seconds_total'] += timing.wall_seconds
+        entry['wall_seconds_max'] = max(entry['wall_seconds_max'], timing.wall_seconds)
+        entry['cpu_seconds_total'] += timing.cpu_seconds
+        entry['allocated_bytes_total'] += timing.allocated_bytes or 0
+        entry['peak_bytes_max'] = max(entry['peak_bytes_max'], timing.peak_bytes or 0)
+
+    def _add_llm_call(self, call: LLMCallRecord):
+        """Fold an LLM call into the running totals. Caller must hold the lock."""
+        entry = self._agent_totals.setdefault(call.agent, {
+            'calls': 0,
+            'cached_calls': 0,
+            'latency_seconds_total': 0.0,
+            'latency_seconds_max': 0.0,
+            'prompt_tokens': 0,
+            'completion_tokens': 0,
+            'total_tokens': 0
+        })
+        entry['calls'] += 1
+        entry['cached_calls'] += int(call.cached)
+        entry['latency_seconds_total'] += call.latency_seconds
+        entry['latency_seconds_max'] = max(entry['latency_seconds_max'], call.latency_seconds)
+        entry['prompt_tokens'] += call.prompt_tokens or 0
+        entry['completion_tokens'] += call.completion_tokens or 0
+        entry['total_tokens'] += call.total_tokens or 0
+
+    def to_json(self, include_records: bool = False) -> str:
+        """Export the summary (and optionally the retained raw records) as JSON."""
+        data = self.summary()
+        if include_records:
+            with self._lock:
+                data['stage_timings'] = [timing.dict() for timing in self.stage_timings]
+                data['llm_calls'] = [call.dict() for call in self.llm_calls]
+        return json.dumps(data, indent=2, default=str)
+
+    def to_prometheus(self, prefix: str = 'vibir_pipeline') -> str:
+        """Export the summary in the Prometheus text exposition format."""
+        summary = self.summary()
+        lines = []
+
+        def metric(name: str, kind: str, help_text: str, samples: List[Tuple[Dict[str, str], float]]):
+            lines.append(f"# HELP {prefix}_{name} {help_text}")
+            lines.append(f"# TYPE {prefix}_{name} {kind}")
+            for labels, value in samples:
+                label_text = ','.join(f'{key}="{val}"' for key, val in labels.items())
+                lines.append(f"{prefix}_{name}{{{label_text}}} {value}")
+
+        stages = summary['stages'].items()
+        metric('stage_runs_total', 'counter', 'Number of times each stage ran',
+               [({'stage': name}, entry['count']) for name, entry in stages])
+        metric('stage_wall_seconds_total', 'counter', 'Wall time spent in each stage',
+               [({'stage': name}, entry['wall_seconds_total']) for name, entry in stages])
+        metric('stage_cpu_seconds_total', 'counter', 'CPU time spent in each stage',
+               [({'stage': name}, entry['cpu_seconds_total']) for name, entry in stages])
+        metric('stage_allocated_bytes_total', 'counter', 'Net bytes allocated by each stage while tracing',
+               [({'stage': name}, entry['allocated_bytes_total']) for name, entry in stages])
+
+        agents = summary['llm'].items()
+        metric('llm_calls_total', 'counter', 'Number of calls per agent',
+               [({'agent': name}, entry['calls']) for name, entry in agents])
+        metric('llm_cached_calls_total', 'counter', 'Calls answered from the response cache',
+               [({'agent': name}, entry['cached_calls']) for name, entry in agents])
+        metric('llm_latency_seconds_total', 'counter', 'Time spent waiting on each agent',
+               [({'agent': name}, entry['latency_seconds_total']) for name, entry in agents])
+        metric('llm_tokens_total', 'counter', 'Tokens used per agent',
+               [({'agent': name, 'kind': kind}, entry[f'{kind}_tokens'])
+                for name, entry in agents
+                for kind in ('prompt', 'completion', 'total')])
+
+        return "\n".join(lines) + "\n"
+
+def profile_call(func: Callable,
+                 *args,
+                 top_n: int = 25,
+                 profile_path: Optional[str] = None,
+                 **kwargs) -> Tuple[Any, Dict[str, Any]]:
+    """
+    Run ``func`` under cProfile and tracemalloc.
+
+    Args:
+        func: The callable to profile
+        top_n: Number of functions and allocation sites to report
+        profile_path: Optional path to dump the raw cProfile stats to
+
+    Returns:
+        Tuple of the function's result and a report with the top functions by
+        cumulative time and the top allocation sites
+    """
+    was_tracing = tracemalloc.is_tracing()
+    if not was_tracing:
+        tracemalloc.start()
+    profiler = cProfile.Profile()
+    start_wall = time.perf_counter()
+    profiler.enable()
+    try:
+        result = func(*args, **kwargs)
+    finally:
+        profiler.disable()
+        wall_seconds = time.perf_counter() - start_wall
+        snapshot = tracemalloc.take_snapshot()
+        _, peak_bytes = tracemalloc.get_traced_memory()
+        if not was_tracing:
+            tracemalloc.stop()
+
+    if profile_path:
+        profiler.dump_stats(profile_path)
+
+    stream = io.StringIO()
+    pstats.Stats(profiler, stream=stream).sort_stats('cumulative').print_stats(top_n)
+    allocations = [
+        {
+            'location': str(stat.traceback),
+            'size_bytes': stat.size,
+            'count': stat.count
+        }
+        for stat in snapshot.statistics('lineno')[:top_n]
+    ]
+
+    return result, {
+        'wall_seconds': wall_seconds,
+        'peak_bytes': peak_bytes,
+        'profile': stream.getvalue(),
+        'top_allocations': allocations
+    }
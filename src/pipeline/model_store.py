@@ -0,0 +1,83 @@
+import hashlib
+import json
+from typing import Any, Dict, Optional, Union
+import numpy as np
+import pandas as pd
+from ..cache.sqlite_cache import SQLiteCache
+
+# Bump whenever a forecaster change makes previously fitted models stale
+MODEL_STORE_VERSION = 1
+
+def _prophet_version() -> str:
+    try:
+        from prophet import __version__
+        return __version__
+    except Exception:
+        return 'unknown'
+
+class ProphetModelStore:
+    """Persistent store of fitted Prophet models keyed on their training data.
+
+    Models are kept as Prophet's JSON serialization. The key hashes the
+    training rows, the model parameters and the Prophet version, so a
+    category whose history is unchanged loads its model instead of refitting
+    it, and any change to the inputs simply misses.
+    """
+
+    def __init__(self, path: str, max_bytes: int = 512 * 1024 * 1024):
+        """Open the store at ``path``, keeping at most ``max_bytes`` of models."""
+        self.store = SQLiteCache(path, max_bytes=max_bytes)
+        self.prophet_version = _prophet_version()
+
+    def make_key(self, df: pd.DataFrame, params: Dict[str, Any]) -> str:
+        """
+        Build a content hash of a model's training inputs.
+
+        Args:
+            df: Training frame with ds and y columns
+            params: Prophet constructor arguments
+
+        Returns:
+            Hex digest identifying the inputs
+        """
+        header = {
+            'version': MODEL_STORE_VERSION,
+            'prophet_version': self.prophet_version,
+            'params': params
+        }
+        digest = hashlib.sha256(json.dumps(header, sort_keys=True, default=str).encode('utf-8'))
+        # Hash the raw column bytes rather than serializing every row
+        dates = pd.to_datetime(df['ds']).to_numpy().astype('datetime64[ns]').astype(np.int64)
+        digest.update(np.ascontiguousarray(dates).tobytes())
+        digest.update(np.ascontiguousarray(df['y'].to_numpy(dtype=float)).tobytes())
+        return digest.hexdigest()
+
+    def get(self, key: str):
+        """Get a stored model, or None if these inputs have not been fitted."""
+        value = self.store.get(key)
+        if value is None:
+            return None
+        try:
+            from prophet.serialize import model_from_json
+            return model_from_json(value.decode('utf-8'))
+        except Exception as e:
+            print(f"Error reading stored model {key}: {str(e)}")
+            self.store.delete(key)
+            return None
+
+    def set(self, key: str, model: Union[str, Any], category: Optional[str] = None):
+        """Store a model, or its JSON serialization, under ``key``."""
+        if not isinstance(model, str):
+            from prophet.serialize import model_to_json
+            model = model_to_json(model)
+        self.store.set(key, model.encode('utf-8'), tag=category)
+
+    def invalidate(self, category: Optional[str] = None) -> int:
+        """Drop stored models for one category, or for all categories when none is given."""
+        if category is None:
+            return self.store.clear()
+        return self.store.invalidate_tag(category)
+
+    def stats(self) -> Dict[str, float]:
+        """Get hit/miss counters and the current size of the store."""
+        return self.store.stats()
@@ -1,13 +1,21 @@
-from typing import List, Dict
+from typing import List, Dict, Optional, Callable, Any, TYPE_CHECKING
 import json
+import threading
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from ..pipeline.scenario_loader import ScenarioLoader
-from ..pipeline.budget_applier import BudgetScenarioApplier
-from ..pipeline.cost_forecaster import CostForecaster
-from ..agents.insight_generator import InsightGenerator
-from ..agents.offset_advisor import OffsetAdvisor
-from ..agents.tradeoff_evaluator import TradeOffEvaluator
-from ..agents.narrative_generator import NarrativeGenerator
-from ..models.data_models import Scenario, NarrativeSummary, ForecastResult, StrategicGoal, BudgetDelta
+from ..pipeline.result_cache import ScenarioResultCache
+from ..pipeline.instrumentation import PipelineMetrics, profile_call
+from ..agents.llm_cache import LLMResponseCache
+from ..models.data_models import Scenario, NarrativeSummary, ForecastResult, StrategicGoal, BudgetDelta, PortfolioOption, DeferralImpact, RiskSimulation
+
+if TYPE_CHECKING:
+    from ..pipeline.budget_applier import BudgetScenarioApplier
+    from ..pipeline.cost_forecaster import CostForecaster
+    from ..agents.insight_generator import InsightGenerator
+    from ..agents.offset_advisor import OffsetAdvisor
+    from ..agents.tradeoff_evaluator import TradeOffEvaluator
+    from ..agents.narrative_generator import NarrativeGenerator
 
 class PipelineOrchestrator:
     def __init__(self,
@@ -15,181 +23,597 @@ class PipelineOrchestrator:
                  scenarios_path: str,
                  snapshot_budget_path: str,
                  timeseries_budget_path: str,
-                 strategic_goals_path: str):
+                 strategic_goals_path: str,
+                 max_workers: int = 1,
+                 concurrent_stages: bool = True,
+                 result_cache_path: Optional[str] = None,
+                 result_cache_max_bytes: int = 256 * 1024 * 1024,
+                 llm_cache_path: Optional[str] = None,
+                 store_dir: Optional[str] = None,
+                 forecast_workers: int = 1,
+                 model_store_path: Optional[str] = None,
+                 forecast_backend: str = 'prophet',
+                 verbose: bool = False):
         
-        # Initialize components
+        # Initialize components. Everything that pulls in pandas, prophet or
+        # crewAI is built on first use (see the properties below) so that
+        # importing and constructing the orchestrator stays fast.
         self.scenario_loader = ScenarioLoader(
             funding_constraints_path=funding_constraints_path,
             scenarios_path=scenarios_path
         )
-        self.budget_applier = BudgetScenarioApplier(snapshot_budget_path)
-        self.cost_forecaster = CostForecaster(timeseries_budget_path)
-        self.insight_generator = InsightGenerator()
-        self.offset_advisor = OffsetAdvisor(self.scenario_loader.funding_constraints)
-        self.tradeoff_evaluator = TradeOffEvaluator()
-        self.narrative_generator = NarrativeGenerator()
+        self._components: Dict[str, Any] = {}
+        self._components_lock = threading.RLock()
+        
+        # One response cache shared by every agent, so a prompt answered for
+        # one scenario is reused by any other scenario that renders it again
+        self.llm_cache = LLMResponseCache(llm_cache_path) if llm_cache_path else None
+        
+        # Per-stage and per-LLM-call timings; full intermediate dumps are only
+        # printed when verbose is set
+        self.metrics = PipelineMetrics()
+        self.verbose = verbose
         
         # Store paths for later use
         self.scenarios_path = scenarios_path
+        self.funding_constraints_path = funding_constraints_path
         self.snapshot_budget_path = snapshot_budget_path
         self.timeseries_budget_path = timeseries_budget_path
         self.strategic_goals_path = strategic_goals_path
+        # Optional columnar store the budget and timeseries are memory-mapped from
+        self.store_dir = store_dir
+        # Worker processes used to fit forecasting models
+        self.forecast_workers = forecast_workers
+        # Optional SQLite file fitted forecasting models are reused from
+        self.model_store_path = model_store_path
+        # 'prophet', or 'fast' for the vectorized model used in bulk what-if runs
+        self.forecast_backend = forecast_backend
+        
+        # Number of scenarios processed concurrently by process_all_scenarios
+        self.max_workers = max(1, int(max_workers))
+        # Run the independent agent stages of a scenario concurrently
+        self.concurrent_stages = concurrent_stages
         
         # Load strategic goals and convert to objects
         with open(strategic_goals_path, 'r') as f:
             goals_data = json.load(f)['goals']
             self.strategic_goals = [StrategicGoal(**goal) for goal in goals_data]
+        
+        # Optional persistent cache of finished narratives
+        self.result_cache = None
+        if result_cache_path:
+            self.result_cache = ScenarioResultCache(result_cache_path, max_bytes=result_cache_max_bytes)
+            with open(funding_constraints_path, 'r') as f:
+                self._funding_constraints_data = json.load(f)
+
+    def _component(self, name: str, factory: Callable[[], Any]) -> Any:
+        """Build a component on first use and reuse it afterwards."""
+        component = self._components.get(name)
+        if component is None:
+            with self._components_lock:
+                component = self._components.get(name)
+                if component is None:
+                    component = factory()
+                    self._components[name] = component
+        return component
+
+    @property
+    def budget_applier(self) -> 'BudgetScenarioApplier':
+        def build():
+            from ..pipeline.budget_applier import BudgetScenarioApplier
+            return BudgetScenarioApplier(
+                self.snapshot_budget_path,
+                store_dir=self.store_dir,
+                deferral_engine=self.cost_forecaster.deferral_engine
+            )
+        return self._component('budget_applier', build)
+
+    @property
+    def cost_forecaster(self) -> 'CostForecaster':
+        def build():
+            from ..pipeline.cost_forecaster import CostForecaster
+            return CostForecaster(
+                self.timeseries_budget_path,
+                store_dir=self.store_dir,
+                max_workers=self.forecast_workers,
+                model_store_path=self.model_store_path,
+                backend=self.forecast_backend
+            )
+        return self._component('cost_forecaster', build)
+
+    @property
+    def insight_generator(self) -> 'InsightGenerator':
+        def build():
+            from ..agents.insight_generator import InsightGenerator
+            return InsightGenerator(llm_cache=self.llm_cache, metrics=self.metrics)
+        return self._component('insight_generator', build)
 
-    def process_scenario(self, scenario_id: str) -> NarrativeSummary:
-        """Process a single scenario and generate a narrative summary."""
+    @property
+    def offset_advisor(self) -> 'OffsetAdvisor':
+        def build():
+            from ..agents.offset_advisor import OffsetAdvisor
+            return OffsetAdvisor(
+                self.scenario_loader.funding_constraints,
+                llm_cache=self.llm_cache,
+                metrics=self.metrics
+            )
+        return self._component('offset_advisor', build)
+
+    @property
+    def tradeoff_evaluator(self) -> 'TradeOffEvaluator':
+        def build():
+            from ..agents.tradeoff_evaluator import TradeOffEvaluator
+            return TradeOffEvaluator(llm_cache=self.llm_cache, metrics=self.metrics)
+        return self._component('tradeoff_evaluator', build)
+
+    @property
+    def narrative_generator(self) -> 'NarrativeGenerator':
+        def build():
+            from ..agents.narrative_generator import NarrativeGenerator
+            return NarrativeGenerator(llm_cache=self.llm_cache, metrics=self.metrics)
+        return self._component('narrative_generator', build)
+
+    @property
+    def budget_digest(self) -> str:
+        """Digest of the full baseline budget, used in result cache keys."""
+        return self._component(
+            'budget_digest',
+            lambda: ScenarioResultCache.digest_rows(self.budget_applier.current_budget.to_dict('records'))
+        )
+
+    def process_scenario(self,
+                         scenario_id: str,
+                         concurrent_stages: Optional[bool] = None) -> NarrativeSummary:
+        """Process a single scenario and generate a narrative summary.
+        
+        Args:
+            scenario_id: The scenario to process
+            concurrent_stages: Overrides the constructor's setting for this run
+        """
+        metrics = self.metrics
+        if concurrent_stages is None:
+            concurrent_stages = self.concurrent_stages
         try:
             print(f"\nProcessing scenario: {scenario_id}")
             print("=" * 80)
             
             # Load and validate scenario
             print("\n1. Loading and validating scenario...")
-            scenario = self.scenario_loader.load_scenario(scenario_id)
-            if not scenario:
-                raise ValueError(f"Failed to load scenario {scenario_id}")
-            print(f"Loaded scenario: {scenario.dict()}")
+            with metrics.stage(scenario_id, 'load_and_validate'):
+                scenario = self.scenario_loader.load_scenario(scenario_id)
+                if not scenario:
+                    raise ValueError(f"Failed to load scenario {scenario_id}")
+                if self.verbose:
+                    print(f"Loaded scenario: {scenario.dict()}")
+                
+                if not self.scenario_loader.validate_scenario(scenario):
+                    raise ValueError(f"Scenario {scenario_id} is invalid")
+                print("Scenario validation passed")
             
-            if not self.scenario_loader.validate_scenario(scenario):
-                raise ValueError(f"Scenario {scenario_id} is invalid")
-            print("Scenario validation passed")
+            cache_key = None
+            if self.result_cache:
+                with metrics.stage(scenario_id, 'result_cache_lookup'):
+                    cache_key = self._result_cache_key(scenario)
+                    cached = self.result_cache.get(cache_key)
+                if cached:
+                    print("Inputs unchanged since the last run, using cached narrative")
+                    return cached
             
-            # Take budget snapshot
-            print("\n2. Taking budget snapshot...")
-            self.budget_snapshot = self.budget_applier.take_snapshot()
-            print(f"Budget snapshot: {self.budget_snapshot.dict()}")
+            # Each scenario works on its own view of the baseline budget, so
+            # concurrent scenarios never see each other's changes
+            print("\n2. Creating isolated budget view...")
+            with metrics.stage(scenario_id, 'budget_view'):
+                budget_applier = self.budget_applier.fork()
+            print(f"Budget view created with {len(budget_applier.current_budget)} categories")
             
             # Apply budget changes
             print("\n3. Applying budget changes...")
-            budget_deltas = self.budget_applier.apply_changes(scenario)
-            print(f"Budget deltas: {[delta.dict() for delta in budget_deltas]}")
+            with metrics.stage(scenario_id, 'apply_changes'):
+                budget_deltas = budget_applier.apply_changes(scenario)
+            if self.verbose:
+                print(f"Budget deltas: {[delta.dict() for delta in budget_deltas]}")
             
             # Generate forecast
             print("\n4. Generating forecast...")
-            forecast_dicts = self.cost_forecaster.generate_forecasts(budget_deltas)
-            forecast_results = {
-                category: ForecastResult(**forecast)
-                for category, forecast in forecast_dicts.items()
-            }
-            print(f"Forecast results: {[result.dict() for result in forecast_results.values()]}")
-            
-            # Generate insights
-            print("\n5. Generating insights...")
-            insights = self.insight_generator.generate_insights(
-                forecast_results,
-                budget_deltas,
-                self.strategic_goals
-            )
-            print(f"Generated insights: {[insight.dict() for insight in insights]}")
+            with metrics.stage(scenario_id, 'forecast'):
+                forecast_dicts = self.cost_forecaster.generate_forecasts(budget_deltas)
+                forecast_results = {
+                    category: ForecastResult(**forecast)
+                    for category, forecast in forecast_dicts.items()
+                }
+            if self.verbose:
+                print(f"Forecast results: {[result.dict() for result in forecast_results.values()]}")
             
-            # Get offset recommendations
-            print("\n6. Getting offset recommendations...")
-            offset_recommendations = self.offset_advisor.get_offset_recommendations(
-                budget_deltas,
-                self.strategic_goals
-            )
-            print(f"Offset recommendations: {offset_recommendations}")
-            
-            # Evaluate trade-offs
-            print("\n7. Evaluating trade-offs...")
-            trade_offs = self.tradeoff_evaluator.evaluate_tradeoffs(
-                budget_deltas,
-                self.strategic_goals,
-                self.budget_applier.get_current_budget()
-            )
-            print(f"Trade-off analysis: {trade_offs}")
+            # Stages that fall back to a default record why here, so a
+            # degraded narrative is flagged and never cached
+            stage_errors: List[str] = []
+
+            # Insights, offsets and trade-offs only depend on the deltas and
+            # forecasts above, so their LLM round trips can overlap
+            if concurrent_stages:
+                print("\n5-7. Generating insights, offset recommendations and trade-offs concurrently...")
+                with ThreadPoolExecutor(max_workers=3) as stage_executor:
+                    insights_future = stage_executor.submit(
+                        metrics.timed, scenario_id, 'insights',
+                        self.insight_generator.generate_insights,
+                        forecast_results,
+                        budget_deltas,
+                        self.strategic_goals,
+                        stage_errors
+                    )
+                    offsets_future = stage_executor.submit(
+                        metrics.timed, scenario_id, 'offsets',
+                        self.offset_advisor.get_offset_recommendations,
+                        budget_deltas,
+                        self.strategic_goals,
+                        stage_errors
+                    )
+                    trade_offs_future = stage_executor.submit(
+                        metrics.timed, scenario_id, 'tradeoffs',
+                        self.tradeoff_evaluator.evaluate_tradeoffs,
+                        budget_deltas,
+                        self.strategic_goals,
+                        budget_applier.get_current_budget(),
+                        stage_errors
+                    )
+                    insights = insights_future.result()
+                    offset_recommendations = offsets_future.result()
+                    trade_offs = trade_offs_future.result()
+                if self.verbose:
+                    print(f"Generated insights: {[insight.dict() for insight in insights]}")
+                    print(f"Offset recommendations: {offset_recommendations}")
+                    print(f"Trade-off analysis: {trade_offs}")
+            else:
+                # Generate insights
+                print("\n5. Generating insights...")
+                with metrics.stage(scenario_id, 'insights'):
+                    insights = self.insight_generator.generate_insights(
+                        forecast_results,
+                        budget_deltas,
+                        self.strategic_goals,
+                        stage_errors
+                    )
+                if self.verbose:
+                    print(f"Generated insights: {[insight.dict() for insight in insights]}")
+                
+                # Get offset recommendations
+                print("\n6. Getting offset recommendations...")
+                with metrics.stage(scenario_id, 'offsets'):
+                    offset_recommendations = self.offset_advisor.get_offset_recommendations(
+                        budget_deltas,
+                        self.strategic_goals,
+                        stage_errors
+                    )
+                if self.verbose:
+                    print(f"Offset recommendations: {offset_recommendations}")
+                
+                # Evaluate trade-offs
+                print("\n7. Evaluating trade-offs...")
+                with metrics.stage(scenario_id, 'tradeoffs'):
+                    trade_offs = self.tradeoff_evaluator.evaluate_tradeoffs(
+                        budget_deltas,
+                        self.strategic_goals,
+                        budget_applier.get_current_budget(),
+                        stage_errors
+                    )
+                if self.verbose:
+                    print(f"Trade-off analysis: {trade_offs}")
             
             # Generate narrative
             print("\n8. Generating narrative...")
-            narrative = self.narrative_generator.generate_narrative(
-                scenario,
-                insights,
-                offset_recommendations,
-                trade_offs,
-                self.strategic_goals
-            )
-            print(f"Generated narrative: {narrative.dict()}")
+            with metrics.stage(scenario_id, 'narrative'):
+                narrative = self.narrative_generator.generate_narrative(
+                    scenario,
+                    insights,
+                    offset_recommendations,
+                    trade_offs,
+                    self.strategic_goals
+                )
+            if stage_errors:
+                print(f"Narrative built on degraded stages: {stage_errors}")
+                narrative.degraded = True
+            if self.verbose:
+                print(f"Generated narrative: {narrative.dict()}")
+            
+            # The baseline budget was never modified, so there is nothing to reset
+            print("\n9. Discarding scenario budget view...")
+            with metrics.stage(scenario_id, 'release_budget_view'):
+                del budget_applier
+            print("Budget view discarded")
             
-            # Reset budget to snapshot
-            print("\n9. Resetting budget to snapshot...")
-            self.budget_applier.reset_to_snapshot(self.budget_snapshot)
-            print("Budget reset complete")
+            if cache_key and not narrative.degraded:
+                with metrics.stage(scenario_id, 'store_result'):
+                    self.result_cache.set(cache_key, narrative)
             
             return narrative
             
         except Exception as e:
             print(f"\nError processing scenario {scenario_id}: {str(e)}")
-            print("Resetting budget to snapshot state...")
-            if hasattr(self, 'budget_snapshot'):
-                self.budget_applier.reset_to_snapshot(self.budget_snapshot)
-            
-            # Return a default narrative with error information
-            return NarrativeSummary(
-                scenario_id=scenario_id,
-                executive_summary=f"Error processing scenario: {str(e)}",
-                key_findings=["Analysis could not be completed due to errors"],
-                recommendations=["Please review the scenario manually"],
-                strategic_implications=["Error in analysis pipeline"],
-                narrative=f"The analysis pipeline encountered an error: {str(e)}"
-            )
+            return self._error_narrative(scenario_id, e)
 
-    def process_all_scenarios(self) -> Dict[str, NarrativeSummary]:
-        """Process all scenarios and return a dictionary of narrative summaries."""
+    def profile_scenario(self,
+                         scenario_id: str,
+                         top_n: int = 25,
+                         profile_path: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Process one scenario under cProfile and tracemalloc.
+        
+        cProfile only sees the calling thread, so the agent stages run
+        sequentially here even when they are concurrent otherwise.
+        
+        Args:
+            scenario_id: The scenario to process
+            top_n: Number of functions and allocation sites to report
+            profile_path: Optional path for the raw cProfile stats
+            
+        Returns:
+            Report with the narrative, the profile, the top allocation sites
+            and the per-stage timings recorded for this run
+        """
+        started = datetime.utcnow()
+        narrative, report = profile_call(
+            self.process_scenario,
+            scenario_id,
+            top_n=top_n,
+            profile_path=profile_path,
+            concurrent_stages=False
+        )
+        report['narrative'] = narrative
+        report['stage_timings'] = [
+            timing.dict() for timing in list(self.metrics.stage_timings)
+            if timing.scenario_id == scenario_id and timing.started_at >= started
+        ]
+        return report
+
+    def process_all_scenarios(self, max_workers: Optional[int] = None) -> Dict[str, NarrativeSummary]:
+        """Process all scenarios and return a dictionary of narrative summaries.
+        
+        Args:
+            max_workers: Number of scenarios to process concurrently. Defaults
+                to the value given to the constructor; 1 runs sequentially.
+        """
         results = {}
         scenario_ids = self.scenario_loader.get_scenario_ids()
+        workers = max(1, int(max_workers if max_workers is not None else self.max_workers))
         
         print(f"\nFound {len(scenario_ids)} scenarios to process")
         print("=" * 80)
         
+        # Validate the whole set upfront so invalid scenarios never reach the agents
+        validation = self.scenario_loader.validate_scenarios(
+            budget_categories=self.budget_applier.current_budget['subcategory'].tolist()
+        )
+        pending = []
         for scenario_id in scenario_ids:
-            try:
-                print(f"\nProcessing scenario {scenario_id}...")
-                narrative = self.process_scenario(scenario_id)
-                results[scenario_id] = narrative
-                
-                # Print detailed analysis
-                print("\n" + "=" * 80)
-                print(f"Scenario {scenario_id} Analysis")
-                print("=" * 80)
-                print("\nExecutive Summary:")
-                print("-" * 40)
-                print(narrative.executive_summary)
-                
-                print("\nKey Findings:")
-                print("-" * 40)
-                for finding in narrative.key_findings:
-                    print(f"• {finding}")
-                
-                print("\nRecommendations:")
-                print("-" * 40)
-                for rec in narrative.recommendations:
-                    print(f"• {rec}")
-                
-                print("\nStrategic Implications:")
-                print("-" * 40)
-                for impl in narrative.strategic_implications:
-                    print(f"• {impl}")
-                
-                print("\nDetailed Analysis:")
-                print("-" * 40)
-                print(narrative.narrative)
-                print("\n" + "=" * 80)
-                
-            except Exception as e:
-                print(f"Error processing scenario {scenario_id}: {str(e)}")
-                results[scenario_id] = NarrativeSummary(
-                    scenario_id=scenario_id,
-                    executive_summary=f"Error processing scenario: {str(e)}",
-                    key_findings=["Analysis could not be completed due to errors"],
-                    recommendations=["Please review the scenario manually"],
-                    strategic_implications=["Error in analysis pipeline"],
-                    narrative=f"The analysis pipeline encountered an error: {str(e)}"
+            result = validation.get(scenario_id)
+            if result is None or result.is_valid:
+                pending.append(scenario_id)
+            else:
+                print(f"Skipping invalid scenario {scenario_id}: {'; '.join(result.errors)}")
+                results[scenario_id] = self._error_narrative(
+                    scenario_id,
+                    ValueError(f"Scenario {scenario_id} is invalid: {'; '.join(result.errors)}")
                 )
+            for warning in (result.warnings if result else []):
+                print(f"Warning: {warning}")
+        
+        if workers == 1 or len(pending) <= 1:
+            for scenario_id in pending:
+                try:
+                    print(f"\nProcessing scenario {scenario_id}...")
+                    results[scenario_id] = self.process_scenario(scenario_id)
+                    self._print_scenario_analysis(scenario_id, results[scenario_id])
+                except Exception as e:
+                    print(f"Error processing scenario {scenario_id}: {str(e)}")
+                    results[scenario_id] = self._error_narrative(scenario_id, e)
+            return {scenario_id: results[scenario_id] for scenario_id in scenario_ids}
+        
+        print(f"Processing scenarios with {workers} workers")
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = {
+                executor.submit(self.process_scenario, scenario_id): scenario_id
+                for scenario_id in pending
+            }
+            for future in as_completed(futures):
+                scenario_id = futures[future]
+                try:
+                    results[scenario_id] = future.result()
+                    self._print_scenario_analysis(scenario_id, results[scenario_id])
+                except Exception as e:
+                    print(f"Error processing scenario {scenario_id}: {str(e)}")
+                    results[scenario_id] = self._error_narrative(scenario_id, e)
+        
+        # Keep the results in scenario file order regardless of completion order
+        return {scenario_id: results[scenario_id] for scenario_id in scenario_ids}
+
+    def explore_portfolios(self,
+                           cost_cap: Optional[float] = None,
+                           scenario_ids: Optional[List[str]] = None) -> List[PortfolioOption]:
+        """
+        Find the scenario combinations that best trade net cost against goal coverage.
+        
+        Args:
+            cost_cap: Maximum net cost of a combination; None for no cap
+            scenario_ids: Candidate scenarios. Defaults to every valid scenario.
+            
+        Returns:
+            The Pareto frontier, ordered by net cost
+        """
+        from ..pipeline.portfolio_explorer import PortfolioExplorer
+        
+        if scenario_ids is None:
+            scenario_ids = self.scenario_loader.get_scenario_ids()
+        validation = self.scenario_loader.validate_scenarios(
+            budget_categories=self.budget_applier.current_budget['subcategory'].tolist()
+        )
+        candidates = []
+        for scenario_id in scenario_ids:
+            result = validation.get(scenario_id)
+            if result is not None and not result.is_valid:
+                print(f"Skipping invalid scenario {scenario_id}: {'; '.join(result.errors)}")
+                continue
+            scenario = self.scenario_loader.load_scenario(scenario_id)
+            if scenario:
+                candidates.append(scenario)
+        
+        explorer = PortfolioExplorer(
+            self.budget_applier.state,
+            self.strategic_goals,
+            deferral_engine=self.cost_forecaster.deferral_engine
+        )
+        return explorer.explore(candidates, cost_cap=cost_cap)
+
+    def deferral_impact(self,
+                        scenario_ids: Optional[List[str]] = None,
+                        start: Optional[str] = None) -> DeferralImpact:
+        """
+        Shift the monthly cash flows of every deferral scenario and report the impact.
+        
+        Args:
+            scenario_ids: Scenarios to consider; defaults to all of them.
+                Scenarios that are not deferrals are ignored.
+            start: Optional YYYY-MM-DD date; only flows from that month on are deferred
+            
+        Returns:
+            Monthly and fiscal-year cash-flow deltas
+        """
+        deferrals: Dict[str, int] = {}
+        for scenario_id in scenario_ids if scenario_ids is not None else self.scenario_loader.get_scenario_ids():
+            scenario = self.scenario_loader.load_scenario(scenario_id)
+            if scenario and scenario.defer_months is not None:
+                deferrals[scenario.target_category] = deferrals.get(scenario.target_category, 0) + scenario.defer_months
+        return self.cost_forecaster.deferral_engine.defer(deferrals, start=start)
+
+    def simulate_risk(self,
+                      scenario_id: Optional[str] = None,
+                      n_paths: int = 10000,
+                      periods: int = 12,
+                      seed: Optional[int] = None) -> RiskSimulation:
+        """
+        Simulate the spending distribution under a scenario, or the current budget.
+        
+        Spending follows each category's historical path and is measured
+        against the scenario's changed annual budgets (prorated to the
+        horizon), so a cut raises the probability of overrunning the budget.
+        Shifting the spending by the same change as well would cancel it out.
+        
+        Args:
+            scenario_id: Scenario to apply first; None for the current budget
+            n_paths: Number of simulated paths
+            periods: Number of months to simulate
+            seed: Seed of the random generator, for reproducible results
+            
+        Returns:
+            Percentile bands and overrun probabilities
+        """
+        from ..pipeline.risk_simulator import RiskSimulator
+        
+        budget_applier = self.budget_applier.fork()
+        if scenario_id is not None:
+            scenario = self.scenario_loader.load_scenario(scenario_id)
+            if not scenario:
+                raise ValueError(f"Scenario {scenario_id} not found")
+            budget_applier.apply_changes(scenario)
+        
+        state = budget_applier.state
+        budgets: Dict[str, float] = {}
+        for subcategory, amount in zip(state.subcategories.tolist(), state.amounts.tolist()):
+            budgets[subcategory] = budgets.get(subcategory, 0.0) + amount * periods / 12
+        
+        simulator = RiskSimulator(self.cost_forecaster.fast_forecaster)
+        return simulator.simulate(
+            periods=periods,
+            n_paths=n_paths,
+            budgets=budgets,
+            seed=seed
+        )
+
+    def refresh_timeseries(self, refit: bool = True) -> List[str]:
+        """
+        Ingest rows appended to the timeseries CSV, e.g. at the monthly close.
+        
+        Only the categories with new rows are refreshed; the budget applier
+        is pointed at the deferral engine rebuilt from the new data.
+        
+        Args:
+            refit: Refit the changed categories' forecasting models right away
+            
+        Returns:
+            Categories that got new rows
+        """
+        changed = self.cost_forecaster.ingest_appended_rows(refit=refit)
+        applier = self._components.get('budget_applier')
+        if changed and applier is not None:
+            applier.deferral_engine = self.cost_forecaster.deferral_engine
+        return changed
+
+    def _result_cache_key(self, scenario: Scenario) -> str:
+        """Hash the scenario together with every input its narrative depends on."""
+        # Both lookups go through per-category indexes, so building a key
+        # does not scan the budget or the timeseries
+        state = self.budget_applier.state
+        rows = self.budget_applier.find_rows(scenario.target_category)
+        budget_rows = [
+            {'subcategory': scenario.target_category, 'amount': amount, 'year': year, 'amount_type': amount_type}
+            for amount, year, amount_type in zip(
+                state.amounts_at(rows).tolist(), state.years[rows].tolist(), state.amount_types[rows].tolist()
+            )
+        ]
+        category_stats = self.cost_forecaster.category_stats
+        timeseries_stats = {}
+        if scenario.target_category in category_stats.index:
+            timeseries_stats = category_stats.loc[scenario.target_category].to_dict()
+        return ScenarioResultCache.make_key(
+            scenario,
+            budget_rows,
+            timeseries_stats,
+            [goal.to_dict() for goal in self.strategic_goals],
+            self._funding_constraints_data,
+            # The trade-off stage reads the whole budget, not just the target rows
+            budget_digest=self.budget_digest,
+            forecast_backend=self.forecast_backend
+        )
+
+    def _error_narrative(self, scenario_id: str, error: Exception) -> NarrativeSummary:
+        """Build a default narrative carrying error information."""
+        return NarrativeSummary(
+            scenario_id=scenario_id,
+            executive_summary=f"Error processing scenario: {str(error)}",
+            key_findings=["Analysis could not be completed due to errors"],
+            recommendations=["Please review the scenario manually"],
+            strategic_implications=["Error in analysis pipeline"],
+            narrative=f"The analysis pipeline encountered an error: {str(error)}",
+            degraded=True
+        )
+
+    def _print_scenario_analysis(self, scenario_id: str, narrative: NarrativeSummary):
+        """Print the detailed analysis of a single scenario."""
+        print("\n" + "=" * 80)
+        print(f"Scenario {scenario_id} Analysis")
+        print("=" * 80)
+        print("\nExecutive Summary:")
+        print("-" * 40)
+        print(narrative.executive_summary)
+        
+        print("\nKey Findings:")
+        print("-" * 40)
+        for finding in narrative.key_findings:
+            print(f"• {finding}")
+        
+        print("\nRecommendations:")
+        print("-" * 40)
+        for rec in narrative.recommendations:
+            print(f"• {rec}")
+        
+        print("\nStrategic Implications:")
+        print("-" * 40)
+        for impl in narrative.strategic_implications:
+            print(f"• {impl}")
         
-        return results
+        print("\nDetailed Analysis:")
+        print("-" * 40)
+        print(narrative.narrative)
+        print("\n" + "=" * 80)
 
     def print_results(self, results: Dict[str, NarrativeSummary]):
         """Print results in a user-friendly format."""
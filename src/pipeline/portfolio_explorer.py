@@ -0,0 +1,210 @@
+import numpy as np
+from typing import Dict, List, Optional, Tuple, TYPE_CHECKING
+from ..models.data_models import Scenario, StrategicGoal, PortfolioOption
+from .batch_engine import BatchScenarioEngine
+from .budget_state import BudgetState
+
+if TYPE_CHECKING:
+    from .deferral_engine import DeferralEngine
+
+PRIORITY_WEIGHTS = {'high': 3.0, 'medium': 2.0, 'low': 1.0}
+
+# Coverage states are enumerated as bitmasks over the goals
+MAX_GOALS = 24
+
+class PortfolioExplorer:
+    """Finds scenario combinations that trade net cost against goal coverage.
+
+    A scenario supports a strategic goal when it increases spending on the
+    goal's category and undermines it when it cuts that spending. The
+    explorer runs a dynamic program over goal-coverage bitmasks that keeps
+    the cheapest combination reaching each coverage set, so its cost grows
+    with ``scenarios * 2**goals`` rather than ``2**scenarios``. Net costs are
+    summed from each scenario's standalone delta against the baseline.
+    Scenarios on the same category compound instead of adding up, so
+    combinations holding several of them are re-applied exactly before the
+    cost cap and the frontier are applied; the frontier is then exact over
+    the combinations the program kept, though a cheaper compounding
+    combination it discarded can be missed.
+
+    ``goal_score`` only counts the weight of covered goals. Goals a
+    combination cuts are listed in ``goals_undermined`` rather than
+    subtracted, so that the score stays a function of the coverage state
+    the program optimizes over.
+    """
+
+    def __init__(self,
+                 budget_state: BudgetState,
+                 strategic_goals: List[StrategicGoal],
+                 convention: str = 'changes',
+                 deferral_engine: Optional['DeferralEngine'] = None):
+        """
+        Initialize with the baseline budget and goals.
+
+        Args:
+            budget_state: Baseline budget the scenarios are applied to
+            strategic_goals: Goals to cover
+            convention: How scenario values are read, see BatchScenarioEngine
+            deferral_engine: Optional source of monthly spending profiles for deferrals
+        """
+        if len(strategic_goals) > MAX_GOALS:
+            raise ValueError(f"At most {MAX_GOALS} strategic goals are supported, got {len(strategic_goals)}")
+        self.budget_state = budget_state
+        self.strategic_goals = strategic_goals
+        self.convention = convention
+        self.deferral_engine = deferral_engine
+        self.goal_weights = np.array([
+            PRIORITY_WEIGHTS.get(goal.priority.lower(), 1.0) for goal in strategic_goals
+        ])
+
+    def scenario_costs(self, scenarios: List[Scenario]) -> np.ndarray:
+        """
+        Get each scenario's standalone net cost against the baseline.
+
+        Returns:
+            Net cost per scenario; NaN for scenarios whose category is not in the budget
+        """
+        state = self.budget_state
+        index = state.row_index
+        batch = BatchScenarioEngine.compile(scenarios, self.convention, self.deferral_engine)
+        codes = index.encode(batch.categories)
+
+        # Per-category totals and row counts turn every affine change into
+        # one multiply-add: sum(x * f + a - x) = total * (f - 1) + a * rows
+        row_codes = np.empty(len(state), dtype=np.int64)
+        row_codes[index.rows] = np.repeat(np.arange(len(index)), np.diff(index.offsets))
+        totals = np.bincount(row_codes, weights=state.amounts, minlength=len(index))
+        counts = np.diff(index.offsets)
+
+        known = codes >= 0
+        costs = np.full(len(scenarios), np.nan)
+        costs[known] = (
+            totals[codes[known]] * (batch.factors[known] - 1)
+            + batch.addends[known] * counts[codes[known]]
+        )
+        return costs
+
+    def goal_masks(self, scenarios: List[Scenario], costs: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Get the bitmasks of goals each scenario supports and undermines."""
+        goal_bits: Dict[str, int] = {}
+        for bit, goal in enumerate(self.strategic_goals):
+            goal_bits[goal.category] = goal_bits.get(goal.category, 0) | (1 << bit)
+        category_masks = np.array([goal_bits.get(scenario.target_category, 0) for scenario in scenarios], dtype=np.int64)
+        supports = np.where(costs > 0, category_masks, 0)
+        undermines = np.where(costs < 0, category_masks, 0)
+        return supports, undermines
+
+    def explore(self, scenarios: List[Scenario], cost_cap: Optional[float] = None) -> List[PortfolioOption]:
+        """
+        Compute the Pareto frontier of scenario combinations.
+
+        Args:
+            scenarios: Candidate scenarios
+            cost_cap: Maximum net cost of a combination; None for no cap
+
+        Returns:
+            Frontier combinations ordered by net cost, each covering strictly
+            more goal weight than every cheaper one
+        """
+        costs = self.scenario_costs(scenarios)
+        known = ~np.isnan(costs)
+        for position in np.flatnonzero(~known):
+            print(f"Skipping scenario {scenarios[position].id}: target category not in budget")
+        supports, undermines = self.goal_masks(scenarios, costs)
+        cap = np.inf if cost_cap is None else float(cost_cap)
+
+        # Savings first: once they are placed, the bound below gets tight
+        order = [position for position in np.argsort(costs, kind='stable') if known[position]]
+        savings = np.minimum(costs[order], 0)
+        remaining_savings = np.concatenate((np.cumsum(savings[::-1])[::-1], [0.0]))
+
+        state_count = 1 << len(self.strategic_goals)
+        best_cost = np.full(state_count, np.inf)
+        best_cost[0] = 0.0
+        # Chosen scenarios per coverage state as Python-int bitsets, so any
+        # number of candidates fits
+        chosen = np.zeros(state_count, dtype=object)
+
+        for step, position in enumerate(order):
+            sources = np.flatnonzero(np.isfinite(best_cost))
+            candidates = best_cost[sources] + costs[position]
+            targets = sources | supports[position]
+
+            updated = best_cost.copy()
+            np.minimum.at(updated, targets, candidates)
+            improved = updated[targets] < best_cost[targets]
+            winners = improved & (candidates == updated[targets])
+            winner_targets, first = np.unique(targets[winners], return_index=True)
+            winner_sources = sources[winners][first]
+            chosen[winner_targets] = chosen[winner_sources] | (1 << int(position))
+            best_cost = updated
+
+            # Bound: states that stay above the cap even after taking every
+            # remaining saving can never become feasible
+            hopeless = best_cost + remaining_savings[step + 1] > cap
+            best_cost[hopeless] = np.inf
+
+        feasible = np.flatnonzero(np.isfinite(best_cost) & (best_cost <= cap))
+        net_costs = best_cost[feasible]
+        compounding = self._compounding_groups(scenarios, known)
+        if compounding:
+            for state_position, mask in enumerate(feasible):
+                if any(bin(chosen[mask] & group).count('1') > 1 for group in compounding):
+                    net_costs[state_position] = self._exact_cost(scenarios, chosen[mask])
+            within_cap = net_costs <= cap
+            feasible = feasible[within_cap]
+            net_costs = net_costs[within_cap]
+
+        scores = ((feasible[:, None] >> np.arange(len(self.strategic_goals))) & 1) @ self.goal_weights
+        frontier = []
+        top_score = -np.inf
+        for mask_position in np.lexsort((-scores, net_costs)):
+            if scores[mask_position] > top_score:
+                top_score = scores[mask_position]
+                frontier.append(int(feasible[mask_position]))
+
+        return [self._build_option(scenarios, chosen[mask], supports, undermines) for mask in frontier]
+
+    @staticmethod
+    def _compounding_groups(scenarios: List[Scenario], known: np.ndarray) -> List[int]:
+        """Get bitsets of the scenarios sharing a category, for categories with several."""
+        groups: Dict[str, int] = {}
+        for position in np.flatnonzero(known):
+            category = scenarios[position].target_category
+            groups[category] = groups.get(category, 0) | (1 << int(position))
+        return [group for group in groups.values() if group & (group - 1)]
+
+    def _exact_cost(self, scenarios: List[Scenario], chosen: int) -> float:
+        """Re-apply a combination to the baseline and get its net cost."""
+        selected = [scenarios[position] for position in range(len(scenarios)) if chosen >> position & 1]
+        if not selected:
+            return 0.0
+        result = BatchScenarioEngine.apply(
+            self.budget_state.amounts,
+            self.budget_state.row_index,
+            BatchScenarioEngine.compile(selected, self.convention, self.deferral_engine)
+        )
+        return float(result.deltas.sum())
+
+    def _build_option(self,
+                      scenarios: List[Scenario],
+                      chosen: int,
+                      supports: np.ndarray,
+                      undermines: np.ndarray) -> PortfolioOption:
+        """Describe one combination, re-applying it exactly to get its net cost."""
+        positions = [position for position in range(len(scenarios)) if chosen >> position & 1]
+        selected = [scenarios[position] for position in positions]
+        net_cost = self._exact_cost(scenarios, chosen)
+
+        supported = np.bitwise_or.reduce(supports[positions]) if positions else 0
+        undermined = np.bitwise_or.reduce(undermines[positions]) if positions else 0
+        goal_labels = [f"{goal.category}: {goal.objective}" for goal in self.strategic_goals]
+        return PortfolioOption(
+            scenario_ids=[scenario.id for scenario in selected],
+            net_cost=net_cost,
+            goal_score=float(sum(
+                weight for bit, weight in enumerate(self.goal_weights) if supported >> bit & 1
+            )),
+            goals_covered=[label for bit, label in enumerate(goal_labels) if supported >> bit & 1],
+            goals_undermined=[label for bit, label in enumerate(goal_labels) if undermined >> bit & 1]
+        )
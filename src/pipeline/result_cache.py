@@ -0,0 +1,84 @@
+import hashlib
+import json
+from typing import Dict, List, Optional
+from ..cache.sqlite_cache import SQLiteCache
+from ..models.data_models import NarrativeSummary, Scenario
+
+# Bump whenever a pipeline change makes previously cached narratives stale
+RESULT_CACHE_VERSION = 2
+
+class ScenarioResultCache:
+    """Persistent cache of NarrativeSummary results keyed on every pipeline input."""
+
+    def __init__(self, path: str, max_bytes: int = 256 * 1024 * 1024):
+        """Open the cache at ``path``, keeping at most ``max_bytes`` of results."""
+        self.store = SQLiteCache(path, max_bytes=max_bytes)
+
+    @staticmethod
+    def make_key(scenario: Scenario,
+                 budget_rows: List[Dict],
+                 timeseries_stats: Dict,
+                 strategic_goals: List[Dict],
+                 funding_constraints: Dict,
+                 budget_digest: Optional[str] = None,
+                 forecast_backend: Optional[str] = None) -> str:
+        """
+        Build a content hash of everything that can change a scenario's narrative.
+
+        Args:
+            scenario: The scenario definition
+            budget_rows: Budget rows the pipeline reads for this scenario
+            timeseries_stats: Count, mean, std, last amount and trend of the
+                target category's history, which change with any new row
+            strategic_goals: Strategic goals as dictionaries
+            funding_constraints: Raw funding constraints
+            budget_digest: Digest of the full budget, for stages that read all of it
+            forecast_backend: Backend the forecasts were made with
+
+        Returns:
+            Hex digest identifying the inputs
+        """
+        payload = {
+            'version': RESULT_CACHE_VERSION,
+            'scenario': scenario.dict(),
+            'budget_rows': budget_rows,
+            'timeseries_stats': timeseries_stats,
+            'strategic_goals': strategic_goals,
+            'funding_constraints': funding_constraints,
+            'budget_digest': budget_digest,
+            'forecast_backend': forecast_backend
+        }
+        encoded = json.dumps(payload, sort_keys=True, default=str).encode('utf-8')
+        return hashlib.sha256(encoded).hexdigest()
+
+    @staticmethod
+    def digest_rows(rows: List[Dict]) -> str:
+        """Hash a list of rows so large inputs can be keyed once and reused."""
+        encoded = json.dumps(rows, sort_keys=True, default=str).encode('utf-8')
+        return hashlib.sha256(encoded).hexdigest()
+
+    def get(self, key: str) -> Optional[NarrativeSummary]:
+        """Get a cached narrative, or None if the inputs have not been seen."""
+        value = self.store.get(key)
+        if value is None:
+            return None
+        try:
+            return NarrativeSummary(**json.loads(value))
+        except Exception as e:
+            print(f"Error reading cached result {key}: {str(e)}")
+            self.store.delete(key)
+            return None
+
+    def set(self, key: str, narrative: NarrativeSummary):
+        """Cache a narrative under ``key``."""
+        self.store.set(key, json.dumps(narrative.dict()).encode('utf-8'), tag=narrative.scenario_id)
+
+    def invalidate(self, scenario_id: Optional[str] = None) -> int:
+        """Drop cached results for one scenario, or for all scenarios when no ID is given."""
+        if scenario_id is None:
+            return self.store.clear()
+        return self.store.invalidate_tag(scenario_id)
+
+    def stats(self) -> Dict[str, float]:
+        """Get hit/miss counters and the current size of the cache."""
+        return self.store.stats()
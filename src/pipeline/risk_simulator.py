@@ -0,0 +1,132 @@
+import numpy as np
+from typing import Dict, List, Optional, Sequence
+from ..models.data_models import RiskSimulation
+from .fast_forecaster import FastForecaster
+
+DEFAULT_PERCENTILES = (5.0, 50.0, 95.0)
+
+class RiskSimulator:
+    """Draws correlated monthly cost paths for every category at once.
+
+    Each category's expected path is the fast forecaster's trend plus
+    seasonality forecast. Monthly shocks are normal with the category's
+    residual standard deviation, and are correlated across categories with
+    the correlation of the historical residuals. That correlation is shrunk
+    towards the identity, because with a few years of months and many
+    categories the sample matrix is singular.
+    """
+
+    def __init__(self, forecaster: FastForecaster, shrinkage: float = 0.1):
+        """
+        Estimate the shock correlation from a fitted forecaster.
+
+        Args:
+            forecaster: Fitted fast forecaster over the historical timeseries
+            shrinkage: Weight of the identity in the correlation matrix, in (0, 1]
+        """
+        if not 0 < shrinkage <= 1:
+            raise ValueError("Shrinkage must be in (0, 1]")
+        self.forecaster = forecaster
+        self.shrinkage = shrinkage
+
+        # Residual means are ~0 (the fit has an intercept), so correlations
+        # are the cosine similarities of the residual rows
+        residuals = forecaster.residuals
+        norms = np.linalg.norm(residuals, axis=1)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            correlation = (residuals @ residuals.T) / np.outer(norms, norms)
+        correlation = np.nan_to_num(correlation, nan=0.0)
+        np.fill_diagonal(correlation, 1.0)
+        self.correlation = (1 - shrinkage) * correlation + shrinkage * np.eye(len(norms))
+
+    def simulate(self,
+                 periods: int = 12,
+                 n_paths: int = 10000,
+                 categories: Optional[List[str]] = None,
+                 adjustments: Optional[Dict[str, float]] = None,
+                 budgets: Optional[Dict[str, float]] = None,
+                 percentiles: Sequence[float] = DEFAULT_PERCENTILES,
+                 seed: Optional[int] = None,
+                 chunk_size: int = 1000) -> RiskSimulation:
+        """
+        Simulate spending paths and summarize their distribution.
+
+        Args:
+            periods: Number of months to simulate
+            n_paths: Number of simulated paths
+            categories: Categories to simulate; defaults to every category with history.
+                Categories without history are skipped.
+            adjustments: Monthly amount added to a category's expected path,
+                e.g. a scenario's budget change spread over the year
+            budgets: Budget per category over the horizon, for overrun probabilities
+            percentiles: Percentiles of the reported bands
+            seed: Seed of the random generator, for reproducible results
+            chunk_size: Paths simulated per batch, which bounds memory use
+
+        Returns:
+            Percentile bands and overrun probabilities per category and for the district
+        """
+        known = self.forecaster.codes
+        categories = [
+            category for category in (self.forecaster.categories if categories is None else categories)
+            if category in known
+        ]
+        adjustments = adjustments or {}
+        budgets = budgets or {}
+        codes = np.array([known[category] for category in categories], dtype=np.int64)
+        labels = [f"p{percentile:g}" for percentile in percentiles]
+
+        if len(codes) == 0 or periods < 1 or n_paths < 1:
+            return RiskSimulation(
+                n_paths=n_paths, periods=periods, seed=seed, percentiles=list(percentiles),
+                categories=categories, expected_totals={}, total_bands={}, overrun_probability={},
+                district_monthly_bands={}, district_total_bands={}
+            )
+
+        mean, _, _ = self.forecaster.forecast_paths(periods, categories)
+        mean = mean + np.array([adjustments.get(category, 0.0) for category in categories])[:, None]
+        scale = self.forecaster.sigma[codes]
+        # Shocks of the selected categories: z @ L.T has correlation L @ L.T
+        factor = np.linalg.cholesky(self.correlation[np.ix_(codes, codes)]).T * scale[None, :]
+
+        rng = np.random.default_rng(seed)
+        totals = np.empty((n_paths, len(codes)))
+        district = np.empty((n_paths, periods))
+        for start in range(0, n_paths, chunk_size):
+            count = min(chunk_size, n_paths - start)
+            shocks = rng.standard_normal((count * periods, len(codes))) @ factor
+            # Spending cannot go below zero
+            paths = np.maximum(mean.T[None, :, :] + shocks.reshape(count, periods, len(codes)), 0.0)
+            totals[start:start + count] = paths.sum(axis=1)
+            district[start:start + count] = paths.sum(axis=2)
+
+        total_quantiles = np.percentile(totals, percentiles, axis=0)
+        monthly_quantiles = np.percentile(district, percentiles, axis=0)
+        district_quantiles = np.percentile(district.sum(axis=1), percentiles)
+
+        budgeted = [position for position, category in enumerate(categories) if category in budgets]
+        limits = np.array([budgets[categories[position]] for position in budgeted], dtype=float)
+        overruns = (totals[:, budgeted] > limits[None, :]).mean(axis=0) if budgeted else np.empty(0)
+        district_overrun = None
+        if budgeted:
+            district_overrun = float((totals[:, budgeted].sum(axis=1) > limits.sum()).mean())
+
+        return RiskSimulation(
+            n_paths=n_paths,
+            periods=periods,
+            seed=seed,
+            percentiles=list(percentiles),
+            categories=categories,
+            expected_totals=dict(zip(categories, totals.mean(axis=0).tolist())),
+            total_bands={
+                category: dict(zip(labels, total_quantiles[:, position].tolist()))
+                for position, category in enumerate(categories)
+            },
+            overrun_probability={
+                categories[position]: probability
+                for position, probability in zip(budgeted, overruns.tolist())
+            },
+            district_monthly_bands=dict(zip(labels, monthly_quantiles.tolist())),
+            district_total_bands=dict(zip(labels, district_quantiles.tolist())),
+            district_overrun_probability=district_overrun
+        )
@@ -1,43 +1,37 @@
 import json
-from typing import List, Dict, Optional
-from ..models.data_models import Scenario, ValidationResult, FundingConstraint
+import os
+import threading
+from typing import List, Dict, Optional, Tuple, Union
+from ..models.data_models import Scenario, ValidationResult, FundingConstraint, ScenarioValidationResult
+from .constraint_index import FundingConstraintIndex
 
 class ScenarioLoader:
     def __init__(self, funding_constraints_path: str, scenarios_path: str = None):
         """Initialize with paths to funding constraints and scenarios."""
-        self.funding_constraints = self._load_funding_constraints(funding_constraints_path)
+        # Per-fund rules with hashed category sets; the flattened
+        # FundingConstraint is kept for the agents that consume it
+        self.constraint_index = self._load_funding_constraints(funding_constraints_path)
+        self.funding_constraints = self.constraint_index.to_funding_constraint()
         self.scenarios_path = scenarios_path
+        
+        # Parsed scenarios keyed by ID, rebuilt when the file's mtime changes
+        self._scenario_index: Dict[str, Optional[Scenario]] = {}
+        self._scenario_errors: Dict[str, str] = {}
+        self._scenario_ids: List[str] = []
+        self._scenario_records: List[Dict] = []
+        self._index_signature: Optional[Tuple[int, int]] = None
+        self._index_lock = threading.Lock()
+        self._batch_validator = None
 
-    def _load_funding_constraints(self, path: str) -> FundingConstraint:
+    def _load_funding_constraints(self, path: str) -> FundingConstraintIndex:
         """Load funding constraints from JSON file."""
         try:
             with open(path, 'r') as f:
                 data = json.load(f)
-                
-            # Combine all categories and determine if any are locked
-            all_categories = []
-            locked_categories = set()
-            notes = []
-            
-            for grant, details in data.items():
-                categories = details.get('categories', [])
-                all_categories.extend(categories)
-                
-                # If the grant is locked, all its categories are locked
-                if details.get('locked', False):
-                    locked_categories.update(categories)
-                
-                if details.get('note'):
-                    notes.append(f"{grant}: {details['note']}")
-            
-            return FundingConstraint(
-                categories=list(set(all_categories)),  # Remove duplicates
-                locked_categories=list(locked_categories),
-                note="; ".join(notes)
-            )
+            return FundingConstraintIndex.from_dict(data)
         except Exception as e:
             print(f"Error loading funding constraints: {str(e)}")
-            return FundingConstraint(categories=[], locked_categories=[], note="Error loading constraints")
+            return FundingConstraintIndex({})
 
     def _convert_scenario_format(self, scenario_data: Dict) -> Dict:
         """Convert old scenario format to new format."""
@@ -57,7 +51,7 @@ class ScenarioLoader:
                 new_format['value'] = scenario_data['fixed_delta']
             elif 'defer_months' in scenario_data and scenario_data['defer_months'] is not None:
                 new_format['type'] = 'deferral'
-                new_format['value'] = scenario_data['defer_months'] * 10  # Convert months to percentage
+                new_format['value'] = scenario_data['defer_months']  # Deferrals are expressed in months everywhere
             else:
                 raise ValueError(f"Invalid scenario format: {scenario_data}")
 
@@ -102,16 +96,31 @@ class ScenarioLoader:
     def validate_scenario(self, scenario: Scenario) -> bool:
         """Validate a scenario against funding constraints."""
         try:
+            index = self.constraint_index
+            
             # Check if the target category exists in funding constraints
-            if scenario.target_category not in self.funding_constraints.categories:
+            if scenario.target_category not in index.categories:
                 print(f"Target category '{scenario.target_category}' not found in funding constraints")
                 return False
             
             # Check if the category is locked
-            if scenario.target_category in self.funding_constraints.locked_categories:
+            if scenario.target_category in index.locked_categories:
                 print(f"Category '{scenario.target_category}' is locked")
                 return False
             
+            # Check that the source fund exists, owns the category and allows changes
+            if scenario.source_fund not in index.funds:
+                print(f"Source fund '{scenario.source_fund}' not found in funding constraints")
+                return False
+            
+            if not index.fund_owns(scenario.source_fund, scenario.target_category):
+                print(f"Fund '{scenario.source_fund}' cannot be spent on '{scenario.target_category}'")
+                return False
+            
+            if not index.is_editable(scenario.target_category, scenario.source_fund):
+                print(f"Fund '{scenario.source_fund}' does not allow changes to '{scenario.target_category}'")
+                return False
+            
             # Validate the scenario type and value
             if scenario.type not in ['percentage', 'fixed', 'deferral']:
                 print(f"Invalid scenario type: {scenario.type}")
@@ -127,22 +136,86 @@ class ScenarioLoader:
             print(f"Error validating scenario: {str(e)}")
             return False
 
+    def validate_scenarios(self,
+                           scenarios: Optional[List[Union[Scenario, Dict]]] = None,
+                           budget_categories: Optional[List[str]] = None) -> Dict[str, ScenarioValidationResult]:
+        """
+        Validate a whole scenario set in one vectorized pass.
+        
+        Args:
+            scenarios: Scenarios or raw scenario dictionaries. Defaults to
+                every scenario in the scenarios file.
+            budget_categories: Optional budget subcategories; targets missing
+                from the budget produce a warning
+            
+        Returns:
+            Errors and warnings per scenario ID
+        """
+        # Imported here so plain loading does not pay for pandas
+        from .batch_validator import BatchScenarioValidator
+        
+        if scenarios is None:
+            if not self._ensure_scenario_index():
+                return {}
+            scenarios = self._scenario_records
+        
+        if self._batch_validator is None or self._batch_validator.constraint_index is not self.constraint_index:
+            self._batch_validator = BatchScenarioValidator(self.constraint_index)
+        return self._batch_validator.validate(scenarios, budget_categories=budget_categories)
+
+    def _ensure_scenario_index(self) -> bool:
+        """Build (or rebuild) the scenario index if the scenarios file changed."""
+        if not self.scenarios_path:
+            print("No scenarios path set")
+            return False
+        
+        stat = os.stat(self.scenarios_path)
+        signature = (stat.st_mtime_ns, stat.st_size)
+        if signature == self._index_signature:
+            return True
+        
+        with self._index_lock:
+            if signature == self._index_signature:
+                return True
+            
+            with open(self.scenarios_path, 'r') as f:
+                scenarios = json.load(f)
+            
+            index: Dict[str, Optional[Scenario]] = {}
+            errors: Dict[str, str] = {}
+            scenario_ids: List[str] = []
+            for scenario_data in scenarios:
+                scenario_id = scenario_data.get('id')
+                if not scenario_id or scenario_id in index:
+                    continue
+                scenario_ids.append(scenario_id)
+                try:
+                    index[scenario_id] = Scenario(**scenario_data)
+                except Exception as e:
+                    index[scenario_id] = None
+                    errors[scenario_id] = str(e)
+            
+            self._scenario_index = index
+            self._scenario_errors = errors
+            self._scenario_ids = scenario_ids
+            self._scenario_records = scenarios
+            self._index_signature = signature
+            return True
+
     def load_scenario(self, scenario_id: str) -> Optional[Scenario]:
         """Load a scenario by ID."""
         try:
-            if not self.scenarios_path:
-                print("No scenarios path set")
+            if not self._ensure_scenario_index():
                 return None
             
-            with open(self.scenarios_path, 'r') as f:
-                scenarios = json.load(f)
-                
-            for scenario_data in scenarios:
-                if scenario_data.get('id') == scenario_id:
-                    return Scenario(**scenario_data)
-                
-            print(f"Scenario {scenario_id} not found")
-            return None
+            if scenario_id not in self._scenario_index:
+                print(f"Scenario {scenario_id} not found")
+                return None
+            
+            scenario = self._scenario_index[scenario_id]
+            if scenario is None:
+                print(f"Error loading scenario {scenario_id}: {self._scenario_errors[scenario_id]}")
+            return scenario
         
         except Exception as e:
             print(f"Error loading scenario {scenario_id}: {str(e)}")
@@ -151,14 +224,10 @@ class ScenarioLoader:
     def get_scenario_ids(self) -> List[str]:
         """Get list of all scenario IDs."""
         try:
-            if not self.scenarios_path:
-                print("No scenarios path set")
+            if not self._ensure_scenario_index():
                 return []
-            
-            with open(self.scenarios_path, 'r') as f:
-                scenarios = json.load(f)
-                return [s.get('id') for s in scenarios if s.get('id')]
+            return list(self._scenario_ids)
             
         except Exception as e:
             print(f"Error getting scenario IDs: {str(e)}")
-            return [] 
\ No newline at end of file
+            return []
\ No newline at end of file
@@ -0,0 +1,39 @@
+import numpy as np
+import pandas as pd
+from src.pipeline.backtest import ForecastBacktester, synthetic_panel
+
+def test_origins_do_not_overlap_and_every_forecast_is_scored():
+    panel = synthetic_panel(n_categories=4, n_months=36, seed=5)
+    backtester = ForecastBacktester(panel, horizon=3, n_origins=4, min_train_months=12)
+
+    origins = np.array(backtester.origins)
+    assert len(origins) == 4
+    # Test windows step back from the last month by whole horizons
+    assert (np.diff(origins) == np.timedelta64(3, 'M')).all()
+    assert origins[-1] + 3 - 1 == np.datetime64('2022-12', 'M')
+
+    result = backtester.run(backend='fast', trace_memory=False)
+    assert result.categories == 4
+    assert result.forecasts == 4 * len(origins) * 3
+    assert len(result.mape_by_step) == 3
+    assert result.fit_errors == 0
+
+def test_origins_need_enough_history():
+    panel = synthetic_panel(n_categories=2, n_months=18, seed=6)
+    backtester = ForecastBacktester(panel, horizon=3, n_origins=5, min_train_months=12)
+
+    # Only origins with at least 12 months before them are kept
+    assert [str(origin) for origin in backtester.origins] == ['2021-01', '2021-04']
+
+def test_mape_is_zero_on_an_exactly_linear_series():
+    months = pd.date_range('2020-01-01', periods=36, freq='MS')
+    panel = pd.DataFrame({
+        'StartDate': np.tile(months.strftime('%Y-%m-%d'), 2),
+        'Subcategory': np.repeat(['Linear A', 'Linear B'], len(months)),
+        'Amount': np.concatenate([1000 + 25.0 * np.arange(36), 500 - 5.0 * np.arange(36)])
+    })
+    result = ForecastBacktester(panel, horizon=3, n_origins=2).run(backend='fast', trace_memory=False)
+
+    assert result.forecasts == 2 * 2 * 3
+    assert result.mape < 1e-6
+    assert all(step_mape < 1e-6 for step_mape in result.mape_by_step)
@@ -0,0 +1,71 @@
+import numpy as np
+import pandas as pd
+import pytest
+from src.models.data_models import Scenario
+from src.pipeline.backtest import synthetic_panel
+from src.pipeline.budget_applier import BudgetScenarioApplier
+from src.pipeline.deferral_engine import DeferralEngine
+
+CATEGORIES = ['Category 0000', 'Category 0001', 'Category 0002', 'Category 0003']
+
+def _scenario(scenario_id, category, **change):
+    return Scenario(
+        id=scenario_id,
+        target_category=category,
+        source_fund='general_fund',
+        is_mandated=False,
+        is_reversible=True,
+        reason_for_change='test',
+        **change
+    )
+
+def _applier(tmp_path, deferral_engine=None):
+    path = tmp_path / 'snapshot.csv'
+    pd.DataFrame({
+        'Subcategory': CATEGORIES,
+        'Amount': [100000.0, 52000.0, 7500.0, 30000.0],
+        'Year': [2024] * len(CATEGORIES),
+        'AmountType': ['Annual'] * len(CATEGORIES)
+    }).to_csv(path, index=False)
+    return BudgetScenarioApplier(str(path), deferral_engine=deferral_engine)
+
+# Several scenarios share a target, so their changes compound in order
+SCENARIOS = [
+    _scenario('raise_a', 'Category 0000', percentage=0.1),
+    _scenario('add_a', 'Category 0000', fixed_delta=2500.0),
+    _scenario('defer_b', 'Category 0001', defer_months=3),
+    _scenario('cut_a', 'Category 0000', percentage=-0.2),
+    _scenario('defer_b_again', 'Category 0001', defer_months=2),
+    _scenario('add_c', 'Category 0002', fixed_delta=-500.0)
+]
+
+@pytest.mark.parametrize('with_profiles', [False, True])
+def test_batch_matches_applying_changes_one_at_a_time(tmp_path, with_profiles):
+    deferral_engine = None
+    if with_profiles:
+        deferral_engine = DeferralEngine(synthetic_panel(n_categories=len(CATEGORIES), n_months=24, seed=3))
+    sequential = _applier(tmp_path, deferral_engine)
+    batched = sequential.fork()
+
+    expected = [delta for scenario in SCENARIOS for delta in sequential.apply_changes(scenario)]
+    result = batched.apply_scenarios_batch(SCENARIOS, convention='changes')
+
+    np.testing.assert_allclose(batched.state.amounts, sequential.state.amounts)
+    actual = result.to_deltas()
+    assert [delta.category for delta in actual] == [delta.category for delta in expected]
+    np.testing.assert_allclose(
+        [[delta.old_amount, delta.new_amount, delta.delta] for delta in actual],
+        [[delta.old_amount, delta.new_amount, delta.delta] for delta in expected]
+    )
+
+def test_unknown_targets_are_skipped(tmp_path):
+    applier = _applier(tmp_path)
+    before = applier.state.amounts.copy()
+    result = applier.apply_scenarios_batch(
+        [_scenario('unknown', 'Not A Category', fixed_delta=1.0), SCENARIOS[0]],
+        convention='changes'
+    )
+
+    assert result.skipped_categories == ['Not A Category']
+    assert result.applied.tolist() == [False, True]
+    np.testing.assert_allclose(applier.state.amounts, before * [1.1, 1, 1, 1])
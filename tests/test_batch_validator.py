@@ -0,0 +1,67 @@
+from pathlib import Path
+from src.models.data_models import Scenario
+from src.pipeline.scenario_loader import ScenarioLoader
+
+DATA_DIR = Path(__file__).resolve().parent.parent / 'data'
+
+def _loader():
+    return ScenarioLoader(
+        funding_constraints_path=str(DATA_DIR / 'funding_constraints.json'),
+        scenarios_path=str(DATA_DIR / 'scenario_list.json')
+    )
+
+def _scenario(scenario_id, category, fund, **change):
+    return Scenario(
+        id=scenario_id,
+        target_category=category,
+        source_fund=fund,
+        is_mandated=False,
+        is_reversible=True,
+        reason_for_change='test',
+        **change
+    )
+
+def test_valid_scenario_passes():
+    loader = _loader()
+    scenario = _scenario('raise_math', 'Math Teachers', 'union_salaries', percentage=0.05)
+
+    result = loader.validate_scenarios([scenario], budget_categories=['Math Teachers'])['raise_math']
+
+    assert result.is_valid
+    assert result.errors == [] and result.warnings == []
+    assert loader.validate_scenario(scenario)
+
+def test_unknown_subcategory():
+    loader = _loader()
+    unknown = _scenario('unknown', 'Underwater Basketweaving', 'general_fund', fixed_delta=1000.0)
+    not_budgeted = _scenario('not_budgeted', 'Smartboards', 'tech_grant_2023', fixed_delta=-1000.0)
+
+    results = loader.validate_scenarios([unknown, not_budgeted], budget_categories=['Math Teachers'])
+
+    assert not results['unknown'].is_valid
+    assert results['unknown'].errors == ["Target category 'Underwater Basketweaving' not found in funding constraints"]
+    # Targets missing from the budget only warn
+    assert results['not_budgeted'].is_valid
+    assert results['not_budgeted'].warnings == ["Target category 'Smartboards' is not in the budget snapshot"]
+    assert not loader.validate_scenario(unknown)
+
+def test_bad_source_fund():
+    loader = _loader()
+    unknown_fund = _scenario('unknown_fund', 'Math Teachers', 'lottery_winnings', percentage=0.05)
+    wrong_fund = _scenario('wrong_fund', 'Math Teachers', 'tech_grant_2023', percentage=0.05)
+
+    results = loader.validate_scenarios([unknown_fund, wrong_fund])
+
+    assert results['unknown_fund'].errors == ["Source fund 'lottery_winnings' not found in funding constraints"]
+    assert results['wrong_fund'].errors == ["Fund 'tech_grant_2023' cannot be spent on 'Math Teachers'"]
+    for scenario in (unknown_fund, wrong_fund):
+        assert not results[scenario.id].is_valid
+        assert not loader.validate_scenario(scenario)
+
+def test_scenario_file_results_agree_with_single_validation():
+    loader = _loader()
+    results = loader.validate_scenarios()
+
+    assert results
+    for scenario_id, result in results.items():
+        assert result.is_valid == loader.validate_scenario(loader.load_scenario(scenario_id))
@@ -0,0 +1,79 @@
+import json
+import os
+import numpy as np
+import pandas as pd
+from src.pipeline.backtest import synthetic_panel
+from src.pipeline.budget_applier import BudgetScenarioApplier
+from src.pipeline.columnar_store import ColumnarStore, MANIFEST_NAME
+from src.pipeline.cost_forecaster import CostForecaster
+
+def _write_timeseries(path, n_months=12):
+    synthetic_panel(n_categories=3, n_months=n_months, seed=4).to_csv(path, index=False)
+
+def _assert_same_timeseries(frame, csv_path):
+    expected = pd.read_csv(csv_path, parse_dates=['StartDate'])
+    assert len(frame) == len(expected)
+    np.testing.assert_array_equal(frame['StartDate'].to_numpy(dtype='datetime64[ns]'), expected['StartDate'].to_numpy(dtype='datetime64[ns]'))
+    assert frame['Subcategory'].astype(str).tolist() == expected['Subcategory'].tolist()
+    np.testing.assert_array_equal(frame['Amount'].to_numpy(dtype=float), expected['Amount'].to_numpy(dtype=float))
+
+def test_round_trip_gives_the_csv_frame(tmp_path):
+    csv_path = tmp_path / 'timeseries.csv'
+    _write_timeseries(csv_path)
+    store = ColumnarStore(str(tmp_path / 'store'))
+
+    table = store.load_csv('timeseries', str(csv_path), date_columns=['StartDate'], float_columns=['Amount'])
+
+    assert isinstance(table.columns['Amount'], np.memmap)
+    _assert_same_timeseries(table.to_frame(), csv_path)
+
+def test_stale_or_mismatched_manifest_is_reingested(tmp_path):
+    csv_path = tmp_path / 'timeseries.csv'
+    _write_timeseries(csv_path)
+    store = ColumnarStore(str(tmp_path / 'store'))
+    options = {'date_columns': ['StartDate'], 'float_columns': ['Amount']}
+    store.ensure_csv('timeseries', str(csv_path), **options)
+    assert store.is_fresh('timeseries', str(csv_path), **options)
+
+    # The CSV changed after ingestion
+    _write_timeseries(csv_path, n_months=15)
+    assert not store.is_fresh('timeseries', str(csv_path), **options)
+    _assert_same_timeseries(store.load_csv('timeseries', str(csv_path), **options).to_frame(), csv_path)
+
+    # Different ingestion options or another store version
+    assert not store.is_fresh('timeseries', str(csv_path), date_columns=['StartDate'])
+    manifest_path = store.table_dir('timeseries') / MANIFEST_NAME
+    manifest = json.loads(manifest_path.read_text())
+    manifest['version'] = 0
+    manifest_path.write_text(json.dumps(manifest))
+    assert not store.is_fresh('timeseries', str(csv_path), **options)
+    store.ensure_csv('timeseries', str(csv_path), **options)
+    assert store.read_manifest('timeseries')['version'] != 0
+
+def test_loaders_fall_back_to_csv_when_the_store_is_broken(tmp_path):
+    csv_path = tmp_path / 'timeseries.csv'
+    _write_timeseries(csv_path)
+    budget_path = tmp_path / 'snapshot.csv'
+    pd.DataFrame({
+        'Subcategory': ['Math Teachers', 'Smartboards'],
+        'Amount': [480000.0, 60000.0],
+        'Year': [2024, 2024],
+        'AmountType': ['Annual', 'Annual']
+    }).to_csv(budget_path, index=False)
+    store_dir = tmp_path / 'store'
+    store = ColumnarStore(str(store_dir))
+    store.ensure_csv('timeseries', str(csv_path), ['StartDate'], ['Amount'])
+    store.ensure_csv('snapshot', str(budget_path), float_columns=['Amount'])
+
+    # The manifests still match their CSVs but point at column files that are gone
+    for name in ('timeseries', 'snapshot'):
+        for column_file in store.table_dir(name).glob('*.npy'):
+            os.remove(column_file)
+
+    forecaster = CostForecaster(str(csv_path), store_dir=str(store_dir), backend='fast')
+    _assert_same_timeseries(forecaster.timeseries_data.assign(StartDate=pd.to_datetime(forecaster.timeseries_data['StartDate'])), csv_path)
+    assert forecaster._source_offset == os.path.getsize(csv_path)
+
+    applier = BudgetScenarioApplier(str(budget_path), store_dir=str(store_dir))
+    assert applier.state.subcategories.tolist() == ['Math Teachers', 'Smartboards']
+    np.testing.assert_array_equal(applier.state.amounts, [480000.0, 60000.0])
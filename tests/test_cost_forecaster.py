@@ -0,0 +1,47 @@
+import pandas as pd
+from src.pipeline import cost_forecaster
+from src.pipeline.backtest import synthetic_panel
+from src.pipeline.cost_forecaster import CostForecaster
+
+def test_appending_rows_on_fast_backend_does_not_fit_prophet(tmp_path, monkeypatch):
+    panel = synthetic_panel(n_categories=3, n_months=24, seed=1)
+    path = tmp_path / 'timeseries.csv'
+    panel.to_csv(path, index=False)
+
+    def fail(*args, **kwargs):
+        raise AssertionError("Prophet was fit on the fast backend")
+    monkeypatch.setattr(cost_forecaster, '_fit_prophet', fail)
+    monkeypatch.setattr(CostForecaster, 'train_models', fail)
+
+    forecaster = CostForecaster(str(path), backend='fast')
+    before = forecaster.fast_forecaster
+    forecaster.forecast_paths(3)
+
+    category = panel['Subcategory'].iloc[0]
+    new_rows = pd.DataFrame({'StartDate': ['2022-01-01'], 'Subcategory': [category], 'Amount': [12345.0]})
+    with open(path, 'a') as f:
+        new_rows.to_csv(f, header=False, index=False)
+
+    assert forecaster.ingest_appended_rows(refit=True) == [category]
+    assert forecaster.append_observations(
+        pd.DataFrame({'StartDate': ['2022-02-01'], 'Subcategory': [category], 'Amount': [12400.0]}),
+        refit=True
+    ) == [category]
+    assert not forecaster.models
+    assert category not in forecaster._paths
+    assert forecaster.fast_forecaster is not before
+    assert forecaster.forecast_paths(3)[category].shape[1] == 3
+
+def test_deferral_keeps_forecasted_amount_monthly(tmp_path):
+    path = tmp_path / 'timeseries.csv'
+    synthetic_panel(n_categories=2, n_months=24, seed=2).to_csv(path, index=False)
+    forecaster = CostForecaster(str(path), backend='fast')
+    category = 'Category 0000'
+
+    deferral = forecaster.apply_deferral(category, defer_months=3, periods=12)
+    monthly = forecaster.forecast_paths(12, [category])[category]
+
+    assert deferral['forecasted_amount'] == monthly[0, 2]
+    assert deferral['confidence_interval'] == {'lower': monthly[1, 2], 'upper': monthly[2, 2]}
+    assert abs(deferral['window_total'] + deferral['deferred_amount'] - monthly[0].sum()) < 1e-6
+    assert deferral['window_total'] < monthly[0].sum()
@@ -0,0 +1,80 @@
+import numpy as np
+import pandas as pd
+from src.models.data_models import Scenario
+from src.pipeline.budget_applier import BudgetScenarioApplier
+from src.pipeline.delta_journal import DeltaJournal
+
+def _scenario(scenario_id, category, **change):
+    return Scenario(
+        id=scenario_id,
+        target_category=category,
+        source_fund='general_fund',
+        is_mandated=False,
+        is_reversible=True,
+        reason_for_change='test',
+        **change
+    )
+
+def _recompute(frame, scenario):
+    """Apply a scenario to a plain budget frame, independently of the journal."""
+    frame = frame.copy()
+    target = frame['Subcategory'] == scenario.target_category
+    if scenario.percentage is not None:
+        frame.loc[target, 'Amount'] *= 1 + scenario.percentage
+    else:
+        frame.loc[target, 'Amount'] += scenario.fixed_delta
+    return frame
+
+def test_undo_redo_and_state_at_across_checkpoints(tmp_path):
+    budget = pd.DataFrame({
+        'Subcategory': ['Math Teachers', 'Smartboards', 'Counseling Services'],
+        'Amount': [480000.0, 60000.0, 90000.0],
+        'Year': [2024, 2024, 2024],
+        'AmountType': ['Annual', 'Annual', 'Annual']
+    })
+    path = tmp_path / 'snapshot.csv'
+    budget.to_csv(path, index=False)
+    applier = BudgetScenarioApplier(str(path))
+    # A short interval puts checkpoints at steps 3 and 6
+    applier.journal = DeltaJournal(applier.state, checkpoint_interval=3)
+
+    categories = ['Math Teachers', 'Smartboards', 'Counseling Services']
+    scenarios = [
+        _scenario(f"change_{step}", categories[step % 3], **({'percentage': 0.05} if step % 2 else {'fixed_delta': -1000.0 * step}))
+        for step in range(8)
+    ]
+    expected = [budget]
+    for scenario in scenarios:
+        applier.apply_changes(scenario)
+        expected.append(_recompute(expected[-1], scenario))
+    assert sorted(applier.journal.checkpoints) == [0, 3, 6]
+
+    def assert_step(state, step):
+        np.testing.assert_allclose(state.amounts, expected[step]['Amount'].to_numpy())
+
+    for step in range(len(scenarios) + 1):
+        assert_step(applier.state_at(step), step)
+
+    # Undo back over the checkpoint at step 6, to step 4
+    for _ in range(4):
+        assert applier.undo()
+    assert_step(applier.state, 4)
+    for step in range(len(scenarios) + 1):
+        assert_step(applier.state_at(step), step)
+
+    assert applier.redo()
+    assert applier.redo()
+    assert_step(applier.state, 6)
+
+    # A new change at step 6 drops the redo history after it
+    extra = _scenario('extra', 'Smartboards', percentage=-0.5)
+    applier.apply_changes(extra)
+    expected = expected[:7] + [_recompute(expected[6], extra)]
+    assert len(applier.journal) == 7
+    assert not applier.redo()
+    for step in range(8):
+        assert_step(applier.state_at(step), step)
+
+    while applier.undo():
+        pass
+    assert_step(applier.state, 0)
@@ -0,0 +1,29 @@
+import threading
+import tracemalloc
+from src.pipeline.instrumentation import PipelineMetrics
+
+def test_overlapping_stages_do_not_report_memory():
+    metrics = PipelineMetrics()
+    both_started = threading.Barrier(2)
+
+    def run(stage):
+        with metrics.stage('scenario', stage):
+            both_started.wait()
+            _ = [0] * 10000
+
+    tracemalloc.start()
+    try:
+        with metrics.stage('scenario', 'sequential'):
+            _ = [0] * 10000
+        threads = [threading.Thread(target=run, args=(stage,)) for stage in ('insights', 'offsets')]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    finally:
+        tracemalloc.stop()
+
+    timings = {timing.stage: timing for timing in metrics.stage_timings}
+    assert timings['sequential'].peak_bytes > 0
+    assert timings['insights'].peak_bytes is None
+    assert timings['offsets'].peak_bytes is None
@@ -0,0 +1,27 @@
+from types import SimpleNamespace
+from src.agents.llm_cache import LLMResponseCache, kickoff_crew, store_response
+
+class _Crew:
+    def __init__(self, output):
+        self.output = output
+        self.kickoffs = 0
+
+    def kickoff(self):
+        self.kickoffs += 1
+        return self.output
+
+def test_responses_are_cached_only_once_stored(tmp_path):
+    cache = LLMResponseCache(str(tmp_path / 'llm.db'))
+    agent = SimpleNamespace(role='Analyst', goal='goal', backstory='backstory', llm=None)
+    task = SimpleNamespace(description='prompt', expected_output='text')
+    crew = _Crew('not parseable')
+
+    output, key = kickoff_crew(crew, task, agent, cache)
+    assert (output, key is not None) == ('not parseable', True)
+    # The caller failed to parse it and did not store it, so it is asked again
+    output, key = kickoff_crew(crew, task, agent, cache)
+    assert crew.kickoffs == 2
+
+    store_response(cache, key, output)
+    assert kickoff_crew(crew, task, agent, cache) == ('not parseable', None)
+    assert crew.kickoffs == 2
@@ -0,0 +1,62 @@
+import pandas as pd
+from src.models.data_models import Scenario, StrategicGoal
+from src.pipeline.budget_state import BudgetState
+from src.pipeline.portfolio_explorer import PortfolioExplorer
+
+def _scenario(scenario_id, category, **change):
+    return Scenario(
+        id=scenario_id,
+        target_category=category,
+        source_fund='General Fund',
+        is_mandated=False,
+        is_reversible=True,
+        reason_for_change='test',
+        **change
+    )
+
+def _goal(category, priority):
+    return StrategicGoal(
+        category=category,
+        objective=f"Fund {category}",
+        priority=priority,
+        goal_type='performance',
+        horizon='short-term'
+    )
+
+def _explorer():
+    budget = pd.DataFrame({
+        'subcategory': ['Math Teachers', 'Smartboards'],
+        'year': [2024, 2024],
+        'amount_type': ['Annual', 'Annual'],
+        'amount': [100000.0, 16000.0]
+    })
+    goals = [_goal('Math Teachers', 'high'), _goal('Smartboards', 'low')]
+    return PortfolioExplorer(BudgetState.from_frame(budget), goals)
+
+def test_compounding_cuts_stay_within_cost_cap():
+    # Two -50% cuts of one category save 75%, not the 100% their standalone
+    # costs add up to
+    scenarios = [
+        _scenario('raise_math_teachers', 'Math Teachers', fixed_delta=6000.0),
+        _scenario('cut_smartboards_a', 'Smartboards', percentage=-0.5),
+        _scenario('cut_smartboards_b', 'Smartboards', percentage=-0.5)
+    ]
+    options = _explorer().explore(scenarios, cost_cap=-10000)
+
+    assert options
+    for option in options:
+        assert option.net_cost <= -10000
+    assert 'raise_math_teachers' not in {scenario_id for option in options for scenario_id in option.scenario_ids}
+
+def test_goal_score_counts_covered_goals_only():
+    scenarios = [
+        _scenario('raise_math_teachers', 'Math Teachers', fixed_delta=6000.0),
+        _scenario('cut_smartboards', 'Smartboards', percentage=-0.5)
+    ]
+    options = _explorer().explore(scenarios, cost_cap=0)
+
+    best = options[-1]
+    assert best.scenario_ids == ['raise_math_teachers', 'cut_smartboards']
+    assert best.net_cost == -2000
+    assert best.goal_score == 3.0
+    assert best.goals_undermined == ['Smartboards: Fund Smartboards']
@@ -0,0 +1,51 @@
+import json
+import numpy as np
+import pandas as pd
+from src.pipeline.orchestrator import PipelineOrchestrator
+
+def _orchestrator(tmp_path):
+    rng = np.random.default_rng(0)
+    months = pd.date_range('2021-01-01', periods=36, freq='MS')
+    pd.DataFrame({
+        'StartDate': months.strftime('%Y-%m-%d'),
+        'Subcategory': 'Smartboards',
+        'Amount': np.round(1000 + rng.normal(0, 50, len(months)), 2)
+    }).to_csv(tmp_path / 'timeseries.csv', index=False)
+    pd.DataFrame({
+        'Subcategory': ['Smartboards'],
+        'Amount': [12000],
+        'Year': [2024],
+        'AmountType': ['Annual']
+    }).to_csv(tmp_path / 'snapshot.csv', index=False)
+    (tmp_path / 'scenarios.json').write_text(json.dumps([{
+        'id': 'cut_smartboards',
+        'target_category': 'Smartboards',
+        'percentage': -0.3,
+        'source_fund': 'tech_grant',
+        'is_mandated': False,
+        'is_reversible': True,
+        'reason_for_change': 'test'
+    }]))
+    (tmp_path / 'constraints.json').write_text(json.dumps({
+        'tech_grant': {'categories': ['Smartboards'], 'locked': False, 'note': 'test'}
+    }))
+    (tmp_path / 'goals.json').write_text(json.dumps({'goals': []}))
+    return PipelineOrchestrator(
+        funding_constraints_path=str(tmp_path / 'constraints.json'),
+        scenarios_path=str(tmp_path / 'scenarios.json'),
+        snapshot_budget_path=str(tmp_path / 'snapshot.csv'),
+        timeseries_budget_path=str(tmp_path / 'timeseries.csv'),
+        strategic_goals_path=str(tmp_path / 'goals.json'),
+        forecast_backend='fast'
+    )
+
+def test_budget_cut_raises_overrun_probability(tmp_path):
+    orchestrator = _orchestrator(tmp_path)
+    baseline = orchestrator.simulate_risk(n_paths=2000, seed=0)
+    cut = orchestrator.simulate_risk('cut_smartboards', n_paths=2000, seed=0)
+
+    # Historical spending runs at about the baseline budget, so a 30% cut leaves
+    # nearly every path over the new one
+    assert baseline.overrun_probability['Smartboards'] < 0.5
+    assert cut.overrun_probability['Smartboards'] > 0.95
+    assert cut.district_overrun_probability > baseline.district_overrun_probability